@@ -0,0 +1,90 @@
+"""
+Local Calendar Event Cache for Omtobe MVP v0.1
+
+Per-user cache of high-stakes Google Calendar events driven by incremental
+sync tokens. The first sync pages through the full event list; later syncs
+only fetch the delta since the stored token. A 410 Gone (expired token)
+invalidates the entry and forces a fresh full sync.
+
+Users with a push-notification channel are only re-synced after a change
+notification marks their entry dirty; everyone else is polled per check.
+
+Recurring events are expanded into instances, so a full sync is bounded by a
+horizon (SYNC_HORIZON ahead). Once less than SYNC_HORIZON_MIN_AHEAD of it is
+left, the entry is re-synced in full with a new horizon.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import pytz
+
+from calendar_index import HighStakesEventIndex
+
+SYNC_HORIZON = timedelta(days=14)  # timeMax of a full sync, from now
+SYNC_HORIZON_MIN_AHEAD = timedelta(days=7)  # Re-sync in full when less is left
+
+
+@dataclass
+class CalendarSyncState:
+    """Cached events and sync bookkeeping for one user."""
+    events: Dict[str, object] = field(default_factory=dict)  # event_id -> CalendarEvent (high-stakes only)
+    sync_token: Optional[str] = None
+    index: HighStakesEventIndex = field(default_factory=lambda: HighStakesEventIndex([]))
+    synced_at: Optional[datetime] = None
+    dirty: bool = True  # Changes announced (or never synced) but not fetched yet
+    push_enabled: bool = False  # A change-notification channel is watching this calendar
+    horizon: Optional[datetime] = None  # timeMax of the full sync the token belongs to
+
+    def horizon_expiring(self, now: Optional[datetime] = None) -> bool:
+        """True if the synced window no longer reaches far enough ahead."""
+        if self.horizon is None:
+            return True
+        return self.horizon - (now or datetime.now(pytz.UTC)) < SYNC_HORIZON_MIN_AHEAD
+
+
+class CalendarEventCache:
+    """In-process calendar sync state keyed by user ID."""
+
+    def __init__(self):
+        """Initialize empty cache."""
+        self._states: Dict[str, CalendarSyncState] = {}
+
+    def get(self, user_id: str) -> CalendarSyncState:
+        """
+        Get (or create) a user's sync state.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            CalendarSyncState: Cached events, token and index
+        """
+        state = self._states.get(user_id)
+        if state is None:
+            state = CalendarSyncState()
+            self._states[user_id] = state
+        return state
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's events and sync token (next sync is a full sync)."""
+        state = self._states.pop(user_id, None)
+        if state is not None and state.push_enabled:
+            self.get(user_id).push_enabled = True
+
+    def mark_dirty(self, user_id: str) -> None:
+        """Record that the user's calendar changed upstream."""
+        self.get(user_id).dirty = True
+
+    def needs_sync(self, user_id: str) -> bool:
+        """
+        True unless a push channel guarantees the cached events are current.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            bool: Whether a sync request is required before reading the index
+        """
+        state = self.get(user_id)
+        return state.dirty or not state.push_enabled or state.sync_token is None or state.horizon_expiring()
@@ -0,0 +1,266 @@
+"""
+Calendar Push Channels for Omtobe MVP v0.1
+
+Bookkeeping for Google Calendar change-notification channels. Each watched
+calendar gets a channel (ID + shared secret token). Notifications posted to
+the webhook are validated against the registry and mark the user's cached
+events dirty, so quiet calendars are never polled.
+
+Channels expire upstream; channels_due_for_renewal() lists the ones to
+re-create before that happens. LocalCalendarNotifier stands in for Google
+when testing or running without a public webhook URL.
+
+The registry is this process's view of the channels; they are persisted
+(models.CalendarPushChannel) and loaded with add() on startup, when another
+worker's notification arrives, and when another worker records a change.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import secrets
+from typing import Dict, List, Optional
+import uuid
+import httpx
+import pytz
+
+from calendar_cache import CalendarEventCache
+
+
+# Google caps web_hook channels at 7 days; renew a day ahead
+CHANNEL_TTL = timedelta(days=7)
+RENEWAL_MARGIN = timedelta(days=1)
+
+
+@dataclass
+class CalendarChannel:
+    """One push-notification channel watching a user's primary calendar."""
+    channel_id: str
+    user_id: str
+    token: str
+    expiration: datetime
+    resource_id: Optional[str] = None  # Set by Google on watch (None for local channels)
+
+
+class CalendarChannelRegistry:
+    """Active channels keyed by channel ID, wired to the event cache."""
+
+    def __init__(self, event_cache: CalendarEventCache):
+        """
+        Initialize registry.
+
+        Args:
+            event_cache: Calendar cache whose entries notifications mark dirty
+        """
+        self.event_cache = event_cache
+        self._channels: Dict[str, CalendarChannel] = {}
+        self._changes_seen: Dict[str, datetime] = {}  # channel_id -> last applied change
+        self.loaded_until: Optional[datetime] = None  # Stored rows loaded up to this update time
+
+    def register(
+        self,
+        user_id: str,
+        ttl: timedelta = CHANNEL_TTL,
+        now: Optional[datetime] = None
+    ) -> CalendarChannel:
+        """
+        Create a channel for a user and switch their calendar to push mode.
+
+        Args:
+            user_id: User identifier
+            ttl: Requested channel lifetime
+            now: Reference time (defaults to now)
+
+        Returns:
+            CalendarChannel: New channel (pass its ID/token to the watch call)
+        """
+        now = now or datetime.now(pytz.UTC)
+        channel = CalendarChannel(
+            channel_id=str(uuid.uuid4()),
+            user_id=user_id,
+            token=secrets.token_urlsafe(32),
+            expiration=now + ttl
+        )
+        return self.add(channel)
+
+    def add(self, channel: CalendarChannel) -> CalendarChannel:
+        """
+        Track an existing channel (e.g. loaded from the database).
+
+        Args:
+            channel: Channel to track
+
+        Returns:
+            CalendarChannel: The tracked channel (an already known one is kept)
+        """
+        channel = self._channels.setdefault(channel.channel_id, channel)
+        self.event_cache.get(channel.user_id).push_enabled = True
+        return channel
+
+    def get(self, channel_id: str) -> Optional[CalendarChannel]:
+        """Look up a channel by ID."""
+        return self._channels.get(channel_id)
+
+    def channels_for(self, user_id: str) -> List[CalendarChannel]:
+        """All active channels of a user."""
+        return [c for c in self._channels.values() if c.user_id == user_id]
+
+    def remove(self, channel_id: str) -> Optional[CalendarChannel]:
+        """
+        Forget a channel; the user falls back to polling if it was their last.
+
+        Args:
+            channel_id: Channel identifier
+
+        Returns:
+            Optional[CalendarChannel]: Removed channel, if it existed
+        """
+        channel = self._channels.pop(channel_id, None)
+        self._changes_seen.pop(channel_id, None)
+        if channel is not None and not self.channels_for(channel.user_id):
+            self.event_cache.get(channel.user_id).push_enabled = False
+        return channel
+
+    def handle_notification(
+        self,
+        channel_id: str,
+        token: Optional[str],
+        resource_state: str,
+        now: Optional[datetime] = None
+    ) -> Optional[str]:
+        """
+        Validate a notification and mark the user's events dirty.
+
+        Args:
+            channel_id: X-Goog-Channel-ID header
+            token: X-Goog-Channel-Token header
+            resource_state: X-Goog-Resource-State header ("sync", "exists", ...)
+            now: Reference time (defaults to now)
+
+        Returns:
+            Optional[str]: User ID to delta-sync, or None if nothing to do
+
+        Raises:
+            KeyError: Unknown or expired channel
+            PermissionError: Token mismatch
+        """
+        channel = self._channels.get(channel_id)
+        now = now or datetime.now(pytz.UTC)
+        if channel is None or channel.expiration <= now:
+            raise KeyError(channel_id)
+        if token is None or not secrets.compare_digest(token, channel.token):
+            raise PermissionError(channel_id)
+
+        # "sync" only acknowledges channel creation
+        if resource_state == "sync":
+            return None
+
+        self.event_cache.mark_dirty(channel.user_id)
+        return channel.user_id
+
+    def apply_change(self, channel_id: str, changed_at: datetime) -> bool:
+        """
+        Mark a user dirty for a change recorded elsewhere, once per change.
+
+        Args:
+            channel_id: Channel the change notification arrived on
+            changed_at: When it was accepted
+
+        Returns:
+            bool: True if the change was new to this registry
+        """
+        channel = self._channels.get(channel_id)
+        seen = self._changes_seen.get(channel_id)
+        if channel is None or (seen is not None and changed_at <= seen):
+            return False
+        self._changes_seen[channel_id] = changed_at
+        self.event_cache.mark_dirty(channel.user_id)
+        return True
+
+    def channels_due_for_renewal(
+        self,
+        now: Optional[datetime] = None,
+        margin: timedelta = RENEWAL_MARGIN
+    ) -> List[CalendarChannel]:
+        """
+        Channels expiring within the renewal margin (including expired ones).
+
+        Args:
+            now: Reference time (defaults to now)
+            margin: How far ahead of expiration to renew
+
+        Returns:
+            List[CalendarChannel]: Channels to re-create, soonest first
+        """
+        now = now or datetime.now(pytz.UTC)
+        due = [c for c in self._channels.values() if c.expiration - margin <= now]
+        return sorted(due, key=lambda c: c.expiration)
+
+    def renew(
+        self,
+        channel_id: str,
+        ttl: timedelta = CHANNEL_TTL,
+        now: Optional[datetime] = None
+    ) -> Optional[CalendarChannel]:
+        """
+        Replace a channel with a fresh one for the same user.
+
+        The replacement is registered before the old one is removed so the
+        user never drops back to polling in between. The events are marked
+        dirty since changes may have been missed around the switch.
+
+        Args:
+            channel_id: Channel to replace
+            ttl: Lifetime of the new channel
+            now: Reference time (defaults to now)
+
+        Returns:
+            Optional[CalendarChannel]: New channel, or None if the old one is unknown
+        """
+        old = self._channels.get(channel_id)
+        if old is None:
+            return None
+        channel = self.register(old.user_id, ttl=ttl, now=now)
+        self.remove(channel_id)
+        self.event_cache.mark_dirty(old.user_id)
+        return channel
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+
+class LocalCalendarNotifier:
+    """Posts Google-style change notifications to our own webhook."""
+
+    def __init__(self, client: httpx.AsyncClient, path: str = "/api/v1/calendar/notifications"):
+        """
+        Initialize notifier.
+
+        Args:
+            client: Client pointed at the app (e.g. over httpx.ASGITransport)
+            path: Webhook path
+        """
+        self.client = client
+        self.path = path
+        self._message_numbers: Dict[str, int] = {}
+
+    async def notify(self, channel: CalendarChannel, resource_state: str = "exists") -> httpx.Response:
+        """
+        Send one notification for a channel.
+
+        Args:
+            channel: Channel to notify on
+            resource_state: "sync", "exists" or "not_exists"
+
+        Returns:
+            httpx.Response: Webhook response
+        """
+        number = self._message_numbers.get(channel.channel_id, 0) + 1
+        self._message_numbers[channel.channel_id] = number
+        headers = {
+            "X-Goog-Channel-ID": channel.channel_id,
+            "X-Goog-Channel-Token": channel.token,
+            "X-Goog-Resource-State": resource_state,
+            "X-Goog-Resource-ID": channel.resource_id or "local",
+            "X-Goog-Message-Number": str(number)
+        }
+        return await self.client.post(self.path, headers=headers)
@@ -0,0 +1,157 @@
+"""
+High-Stakes Event Interval Index for Omtobe MVP v0.1
+
+Sorted interval index over a user's high-stakes calendar events, built once
+per calendar sync. Answers "which event covers time t" and "when does the
+active set next change" in O(log n) instead of scanning every event.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Union
+import pytz
+
+TimeLike = Union[datetime, float]
+
+
+def _to_epoch(value: TimeLike) -> float:
+    """Convert a datetime or epoch value to epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def event_start_epoch(event) -> float:
+    """Event start in epoch seconds (precomputed when the event carries it)."""
+    epoch = getattr(event, "start_epoch", None)
+    return epoch if epoch is not None else _to_epoch(event.start_time)
+
+
+def event_end_epoch(event) -> float:
+    """Event end in epoch seconds (precomputed when the event carries it)."""
+    epoch = getattr(event, "end_epoch", None)
+    return epoch if epoch is not None else _to_epoch(event.end_time)
+
+
+class HighStakesEventIndex:
+    """
+    Immutable interval index over calendar events.
+
+    Events are sorted by start time. A running maximum of end times lets us
+    binary-search for the earliest-starting event that still covers t, and a
+    separately sorted list of end times gives the next boundary.
+    """
+
+    def __init__(
+        self,
+        events: Iterable,
+        is_high_stakes: Optional[Callable[[object], bool]] = None
+    ):
+        """
+        Build the index.
+
+        Args:
+            events: Objects with `start_time` and `end_time` datetimes
+            is_high_stakes: Optional filter applied once at build time
+        """
+        selected = [
+            event for event in events
+            if is_high_stakes is None or is_high_stakes(event)
+        ]
+        selected.sort(key=event_start_epoch)
+
+        self._events = selected
+        self._starts = array("d", (event_start_epoch(event) for event in selected))
+        ends = [event_end_epoch(event) for event in selected]
+
+        self._max_ends = array("d")
+        running = float("-inf")
+        for end in ends:
+            running = max(running, end)
+            self._max_ends.append(running)
+
+        self._sorted_ends = array("d", sorted(ends))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def events(self) -> List:
+        """Indexed events ordered by start time."""
+        return list(self._events)
+
+    def _first_candidate(self, t: float) -> int:
+        """Index of the earliest-starting event whose end is >= t."""
+        return bisect_left(self._max_ends, t)
+
+    def active_at(self, current_time: TimeLike) -> Optional[object]:
+        """
+        Earliest-starting event with start_time <= t <= end_time.
+
+        Args:
+            current_time: Time to query
+
+        Returns:
+            Optional[object]: Covering event, or None
+        """
+        t = _to_epoch(current_time)
+        started = bisect_right(self._starts, t)
+        candidate = self._first_candidate(t)
+        if candidate < started:
+            return self._events[candidate]
+        return None
+
+    def active_events_at(self, current_time: TimeLike) -> List:
+        """
+        All events covering t, ordered by start time.
+
+        Args:
+            current_time: Time to query
+
+        Returns:
+            List: Covering events
+        """
+        t = _to_epoch(current_time)
+        started = bisect_right(self._starts, t)
+        return [
+            self._events[i]
+            for i in range(self._first_candidate(t), started)
+            if event_end_epoch(self._events[i]) >= t
+        ]
+
+    def next_start(self, current_time: TimeLike) -> Optional[datetime]:
+        """Start of the next event beginning strictly after t, or None."""
+        i = bisect_right(self._starts, _to_epoch(current_time))
+        if i < len(self._starts):
+            return datetime.fromtimestamp(self._starts[i], pytz.UTC)
+        return None
+
+    def next_boundary(self, current_time: TimeLike) -> Optional[datetime]:
+        """
+        Next instant (at or after t) at which the set of active events can change.
+
+        Between now and this instant the result of active_at() is constant, so
+        brake checks can be skipped entirely when no event is active.
+
+        Args:
+            current_time: Time to query
+
+        Returns:
+            Optional[datetime]: Next event start or end, or None if none remain
+        """
+        t = _to_epoch(current_time)
+        candidates = []
+
+        i = bisect_right(self._starts, t)
+        if i < len(self._starts):
+            candidates.append(self._starts[i])
+
+        # Active events stop covering strictly after their end time
+        j = bisect_left(self._sorted_ends, t)
+        if j < len(self._sorted_ends):
+            candidates.append(self._sorted_ends[j])
+
+        if not candidates:
+            return None
+        return datetime.fromtimestamp(min(candidates), pytz.UTC)
@@ -0,0 +1,110 @@
+"""
+Clock Abstraction for Omtobe MVP v0.1
+
+The state machine reads time through a Clock so the same logic runs against
+wall-clock time in the API, simulated time in offline replays and
+accelerated virtual time in demo sessions.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import time
+from typing import Callable, Union
+import pytz
+
+
+class Clock(ABC):
+    """Source of the current time."""
+
+    @abstractmethod
+    def now(self, tz=pytz.UTC) -> datetime:
+        """Current time in `tz` (timezone-aware)."""
+
+    def time(self) -> float:
+        """Current time as epoch seconds."""
+        return self.now().timestamp()
+
+
+class SystemClock(Clock):
+    """Wall-clock time."""
+
+    def now(self, tz=pytz.UTC) -> datetime:
+        return datetime.now(tz)
+
+
+class ManualClock(Clock):
+    """Clock that only moves when told to (replays, tests)."""
+
+    def __init__(self, start: Union[datetime, float]):
+        """
+        Initialize clock.
+
+        Args:
+            start: Initial time (timezone-aware datetime or epoch seconds)
+        """
+        self.set(start)
+
+    def set(self, value: Union[datetime, float]) -> None:
+        """Jump to a point in time."""
+        if isinstance(value, datetime):
+            value = value.timestamp()
+        self._epoch = float(value)
+
+    def advance(self, seconds: Union[float, timedelta]) -> None:
+        """Move forward by a duration."""
+        if isinstance(seconds, timedelta):
+            seconds = seconds.total_seconds()
+        self._epoch += seconds
+
+    def time(self) -> float:
+        return self._epoch
+
+    def now(self, tz=pytz.UTC) -> datetime:
+        return datetime.fromtimestamp(self._epoch, tz)
+
+
+class AcceleratedClock(Clock):
+    """Virtual time running `speed` times faster than wall-clock time (demos)."""
+
+    def __init__(
+        self,
+        start: Union[datetime, float],
+        speed: float = 1.0,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize clock.
+
+        Args:
+            start: Virtual time at creation
+            speed: Virtual seconds per wall-clock second
+            timer: Monotonic wall-clock source
+        """
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        self.speed = speed
+        self._timer = timer
+        self._base = float(start)
+        self._wall = timer()
+
+    def set_speed(self, speed: float) -> None:
+        """Change the speed from now on, without jumping."""
+        self._base = self.time()
+        self._wall = self._timer()
+        self.speed = speed
+
+    def fast_forward(self, seconds: Union[float, timedelta]) -> None:
+        """Jump ahead in virtual time."""
+        if isinstance(seconds, timedelta):
+            seconds = seconds.total_seconds()
+        self._base += seconds
+
+    def time(self) -> float:
+        return self._base + (self._timer() - self._wall) * self.speed
+
+    def now(self, tz=pytz.UTC) -> datetime:
+        return datetime.fromtimestamp(self.time(), tz)
+
+
+# Default clock for production code paths
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,136 @@
+"""
+Cohort Brake Evaluation for Omtobe MVP v0.1
+
+Evaluates the Brake screen decision for many users in a single vectorized
+NumPy pass. Used for server-side sweeps across the whole fleet; the result
+for every user is identical to OmtobeStateMachine.should_display_brake_screen.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Sequence, Union
+import numpy as np
+
+from state_machine import OmtobeStateMachine
+
+
+@dataclass
+class BrakeCohort:
+    """
+    Column-oriented snapshot of the brake inputs for a group of users.
+
+    All arrays have one entry per user. `cooling_period_start` holds epoch
+    seconds, with NaN where no cooling period was started.
+    """
+    user_ids: np.ndarray
+    current_hrv: np.ndarray
+    baseline_mean: np.ndarray
+    current_day: np.ndarray
+    cooling_period_active: np.ndarray
+    cooling_period_start: np.ndarray
+    decision_locked: np.ndarray
+    event_active: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    @classmethod
+    def from_state_machines(
+        cls,
+        machines: Sequence[OmtobeStateMachine],
+        current_hrv: Sequence[float],
+        baseline_mean: Sequence[float],
+        event_active: Sequence[bool]
+    ) -> "BrakeCohort":
+        """
+        Build a cohort from hydrated state machines.
+
+        Args:
+            machines: State machines, one per user
+            current_hrv: Current HRV value per user
+            baseline_mean: 7-day baseline mean per user
+            event_active: Whether a high-stakes event is active per user
+
+        Returns:
+            BrakeCohort: Column arrays for vectorized evaluation
+        """
+        return cls(
+            user_ids=np.array([sm.user_id for sm in machines], dtype=object),
+            current_hrv=np.asarray(current_hrv, dtype=np.float64),
+            baseline_mean=np.asarray(baseline_mean, dtype=np.float64),
+            current_day=np.array([sm.current_day for sm in machines], dtype=np.int8),
+            cooling_period_active=np.array([sm.cooling_period_active for sm in machines], dtype=bool),
+            cooling_period_start=np.array(
+                [
+                    sm.cooling_period_start.timestamp() if sm.cooling_period_start else np.nan
+                    for sm in machines
+                ],
+                dtype=np.float64
+            ),
+            decision_locked=np.array([bool(sm.decision_locked_for_event) for sm in machines], dtype=bool),
+            event_active=np.asarray(event_active, dtype=bool)
+        )
+
+
+@dataclass
+class CohortDecision:
+    """
+    Vectorized brake decision.
+
+    Attributes:
+        should_display: Brake screen decision per user
+        cooling_period_active: Cooling flag after expired periods are cleared
+    """
+    user_ids: np.ndarray
+    should_display: np.ndarray
+    cooling_period_active: np.ndarray
+
+    def display_user_ids(self) -> np.ndarray:
+        """User IDs for which the Brake screen should display."""
+        return self.user_ids[self.should_display]
+
+
+def evaluate_brake_cohort(cohort: BrakeCohort, now: Union[datetime, float]) -> CohortDecision:
+    """
+    Evaluate the Brake screen decision for every user in the cohort.
+
+    Mirrors should_display_brake_screen:
+    - Only Days 3-5 can trigger
+    - An unexpired cooling period suppresses the check (expired ones are cleared)
+    - A locked decision suppresses the check
+    - Otherwise HRV drop (20% below baseline) AND active high-stakes event
+
+    Args:
+        cohort: Column arrays for the users to evaluate
+        now: Evaluation time (datetime or epoch seconds)
+
+    Returns:
+        CohortDecision: Per-user display decision and updated cooling flags
+    """
+    now_epoch = now.timestamp() if isinstance(now, datetime) else float(now)
+
+    in_intervention = (cohort.current_day >= 3) & (cohort.current_day <= 5)
+
+    # Cooling periods without a start never expire, matching _is_cooling_period_expired
+    with np.errstate(invalid="ignore"):
+        cooling_expired = (now_epoch - cohort.cooling_period_start) >= OmtobeStateMachine.COOLING_PERIOD_SECONDS
+    cooling_cleared = in_intervention & cohort.cooling_period_active & cooling_expired
+    cooling_period_active = cohort.cooling_period_active & ~cooling_cleared
+    cooling_blocked = cohort.cooling_period_active & ~cooling_expired
+
+    threshold = cohort.baseline_mean * (1 - OmtobeStateMachine.HRV_THRESHOLD_PERCENT)
+    hrv_drop = (cohort.baseline_mean != 0) & (cohort.current_hrv <= threshold)
+
+    should_display = (
+        in_intervention
+        & ~cooling_blocked
+        & ~cohort.decision_locked
+        & hrv_drop
+        & cohort.event_active
+    )
+
+    return CohortDecision(
+        user_ids=cohort.user_ids,
+        should_display=should_display,
+        cooling_period_active=cooling_period_active
+    )
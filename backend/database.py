@@ -2,9 +2,14 @@
 Database Configuration for Omtobe MVP v0.1
 
 Uses SQLite for MVP development, can be upgraded to PostgreSQL for production.
+
+The API endpoints use the async engine (aiosqlite / asyncpg) so database waits
+don't block the event loop; the sync engine is kept for schema creation and
+scripts.
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 import os
 
@@ -23,3 +28,36 @@ engine = create_engine(
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _to_async_url(url: str) -> str:
+    """
+    Map a sync database URL to its async driver equivalent.
+
+    Args:
+        url: SQLAlchemy database URL
+
+    Returns:
+        str: URL using aiosqlite (SQLite) or asyncpg (PostgreSQL)
+    """
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgres:"):
+        return url.replace("postgres:", "postgresql+asyncpg:", 1)
+    return url
+
+
+# Async database URL (derived from DATABASE_URL unless set explicitly)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _to_async_url(DATABASE_URL))
+
+# Create async engine
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+
+# Create async session factory (objects stay usable after commit)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
@@ -0,0 +1,309 @@
+"""
+Time-Accelerated Demo Sessions for Omtobe MVP v0.1
+
+In-memory demo sessions for investor walkthroughs (see DEMO_MODE_DESIGN.md).
+Each session owns a virtual clock, a synthetic HRV stream and a synthetic
+calendar, and runs the real state machine against them, so a full 7-day
+cycle plays out in about 30 seconds. Nothing is written to the production
+database; sessions expire when idle.
+
+Synthetic calendar: one high-stakes meeting per day (10:00-11:00 UTC,
+virtual) during which HRV drops by DEMO_STRESS_DROP, and one ordinary
+meeting. State transitions (day changes, Brake displays, decisions,
+Day-7 reflection, cycle resets) are pushed to the session's stream.
+
+Configuration (environment):
+- DEMO_SPEED: Virtual seconds per wall-clock second (default 20160, i.e.
+  7 days in 30 seconds)
+- DEMO_MAX_SESSIONS: Concurrent sessions (default 50)
+- DEMO_SESSION_TTL_SECONDS: Idle time before a session is dropped (default 1800)
+- DEMO_TICK_SECONDS: Wall-clock interval between simulation steps (default 0.5)
+"""
+
+import asyncio
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime, timedelta
+import os
+import time
+from typing import Any, Dict, List, Optional
+import uuid
+import pytz
+
+from clock import AcceleratedClock
+from hrv_series import HRVSeries
+from push import PushHub
+from state_machine import CalendarEvent, DecisionType, ReflectionResponse
+from state_replay import SimulatedUser
+from synthetic import SyntheticHRVGenerator
+
+DEMO_SPEED = float(os.getenv("DEMO_SPEED", str(7 * 24 * 60 * 60 / 30)))
+DEMO_MAX_SESSIONS = int(os.getenv("DEMO_MAX_SESSIONS", "50"))
+DEMO_SESSION_TTL_SECONDS = float(os.getenv("DEMO_SESSION_TTL_SECONDS", "1800"))
+DEMO_TICK_SECONDS = float(os.getenv("DEMO_TICK_SECONDS", "0.5"))
+
+DEMO_HORIZON_DAYS = 28  # Synthetic calendar length (four cycles)
+DEMO_STRESS_DROP = 0.3  # HRV drop during high-stakes meetings
+HISTORY_SIZE = 100
+
+HIGH_STAKES_TITLES = ["Board Meeting", "Negotiation", "Quarterly Review", "!Acquisition Decision"]
+
+
+class DemoLimitError(Exception):
+    """Too many concurrent demo sessions."""
+
+
+def demo_events(start: datetime, days: int = DEMO_HORIZON_DAYS) -> List[CalendarEvent]:
+    """
+    Synthetic calendar: a daily high-stakes meeting and a daily ordinary one.
+
+    Args:
+        start: First day (00:00 UTC)
+        days: Number of days
+
+    Returns:
+        List[CalendarEvent]: Events in start order
+    """
+    events = []
+    for day in range(days):
+        midnight = start + timedelta(days=day)
+        title = HIGH_STAKES_TITLES[day % len(HIGH_STAKES_TITLES)]
+        events.append(CalendarEvent(
+            title, midnight + timedelta(hours=10), midnight + timedelta(hours=11), is_high_stakes=True
+        ))
+        events.append(CalendarEvent(
+            "Team Sync", midnight + timedelta(hours=14), midnight + timedelta(hours=15), is_high_stakes=False
+        ))
+    return events
+
+
+class DemoSession:
+    """One accelerated cycle: virtual clock, synthetic inputs and a state machine."""
+
+    def __init__(
+        self,
+        session_id: str,
+        speed: float = DEMO_SPEED,
+        scenario: str = "steady",
+        seed: int = 0,
+        auto_decision: Optional[DecisionType] = DecisionType.DELAY,
+        start: Optional[datetime] = None,
+        timezone: str = "UTC"
+    ):
+        """
+        Initialize session (Day 1 starts at 00:00 UTC of `start`).
+
+        Args:
+            session_id: Session identifier
+            speed: Virtual seconds per wall-clock second
+            scenario: Synthetic HRV scenario (see synthetic.SCENARIOS)
+            seed: Seed for the synthetic HRV
+            auto_decision: Response applied right after each Brake display (None waits for the client)
+            start: Virtual start date (defaults to today)
+            timezone: Simulated user's timezone
+
+        Raises:
+            KeyError: Unknown scenario
+            pytz.UnknownTimeZoneError: Unknown timezone
+        """
+        start = (start or datetime.now(pytz.UTC)).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.session_id = session_id
+        self.auto_decision = auto_decision
+        self.clock = AcceleratedClock(start, speed)
+        self.events = demo_events(start)
+        self._event_starts = [event.start_epoch for event in self.events]
+        self.user = SimulatedUser(f"demo:{session_id}", start, timezone, self.events)
+        self.generator = SyntheticHRVGenerator(scenario, seed, user_id=session_id, anchor=start.timestamp())
+        self.hrv = HRVSeries()
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.position = start.timestamp()  # Simulated up to here
+        self.horizon = (start + timedelta(days=DEMO_HORIZON_DAYS)).timestamp()
+        self._next_sample = self.position
+        self.last_active = time.monotonic()
+
+    @property
+    def finished(self) -> bool:
+        """The synthetic calendar has been played out."""
+        return self.position >= self.horizon
+
+    def _samples(self, end: float) -> HRVSeries:
+        """Synthetic HRV up to `end`, lowered during high-stakes meetings."""
+        interval = self.generator.scenario.interval_seconds
+        series = self.generator.generate(self._next_sample, end)
+        self._next_sample += (int((end - self._next_sample) // interval) + 1) * interval
+        for i, timestamp in enumerate(series.timestamps):
+            if self.user.index.active_at(timestamp) is not None:
+                series.values[i] *= 1.0 - DEMO_STRESS_DROP
+        return series
+
+    def _record(self, transitions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for transition in transitions:
+            transition["at"] = datetime.fromtimestamp(transition["at"], pytz.UTC).isoformat()
+            self.history.append(transition)
+        return transitions
+
+    def advance(self) -> List[Dict[str, Any]]:
+        """
+        Run the simulation up to the virtual clock.
+
+        Each synthetic HRV sample is one brake check, as with a polling client.
+
+        Returns:
+            List[Dict]: Transitions since the previous advance
+        """
+        target = min(self.clock.time(), self.horizon)
+        if target <= self.position:
+            return []
+
+        user, sm = self.user, self.user.sm
+        transitions = []
+        samples = self._samples(target) if self._next_sample <= target else HRVSeries()
+        for timestamp, value in samples:
+            transitions.extend(user.advance(timestamp))
+            self.hrv.append(timestamp, value)
+            should_display, event_title = user.check(self.hrv, len(self.hrv) - 1)
+            if not should_display:
+                continue
+            transitions.append({
+                "type": "brake_display",
+                "at": timestamp,
+                "event": event_title,
+                "hrv": value,
+                "hrv_baseline_mean": sm.hrv_baseline_mean,
+                "current_day": sm.current_day
+            })
+            if self.auto_decision is not None:
+                transitions.append(self._decide(self.auto_decision, timestamp))
+
+        transitions.extend(user.advance(target))
+        self.position = target
+        # The rolling baseline only needs the last 7 days
+        self.hrv.drop_before(target - user.baseline.window_seconds)
+        return self._record(transitions)
+
+    def _decide(self, decision_type: DecisionType, timestamp: float) -> Dict[str, Any]:
+        result = self.user.sm.handle_brake_response(decision_type)
+        return {"type": "decision", "at": timestamp, "decision_type": decision_type, "next_action": result["status"]}
+
+    def fast_forward(self, seconds: float) -> List[Dict[str, Any]]:
+        """Jump the virtual clock ahead and simulate the skipped time."""
+        self.clock.fast_forward(seconds)
+        return self.advance()
+
+    def decide(self, decision_type: DecisionType) -> List[Dict[str, Any]]:
+        """Apply a Brake decision at the current virtual time."""
+        transitions = self.advance()
+        decision = self._decide(decision_type, self.position)
+        return transitions + self._record([decision])
+
+    def reflect(self, response: ReflectionResponse) -> List[Dict[str, Any]]:
+        """Record the Day-7 reflection and start a new cycle."""
+        transitions = self.advance()
+        self.user.reflect(response)
+        reflection = {"type": "reflection", "at": self.position, "response": response}
+        return transitions + self._record([reflection, {"type": "cycle_reset", "at": self.position}])
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state for the demo dashboard."""
+        sm = self.user.sm
+        latest = self.hrv.latest()
+        virtual_now = datetime.fromtimestamp(self.position, pytz.UTC)
+        return {
+            "session_id": self.session_id,
+            "virtual_time": virtual_now.isoformat(),
+            "speed": self.clock.speed,
+            "finished": self.finished,
+            "state": sm.get_state_summary(),
+            "hrv_current": latest[1] if latest else None,
+            "active_events": [event.title for event in self.user.index.active_events_at(virtual_now)],
+            "upcoming_events": [
+                {"title": event.title, "start_time": event.start_time.isoformat(), "is_high_stakes": event.is_high_stakes}
+                for event in self.events[bisect_left(self._event_starts, self.position):][:3]
+            ],
+            "history": list(self.history)[-5:]
+        }
+
+
+class DemoSessionManager:
+    """Live demo sessions, each advanced by its own background task."""
+
+    def __init__(
+        self,
+        max_sessions: int = DEMO_MAX_SESSIONS,
+        ttl_seconds: float = DEMO_SESSION_TTL_SECONDS,
+        tick_seconds: float = DEMO_TICK_SECONDS
+    ):
+        """
+        Initialize manager.
+
+        Args:
+            max_sessions: Concurrent session limit
+            ttl_seconds: Idle time before a session is dropped
+            tick_seconds: Wall-clock interval between simulation steps
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.tick_seconds = tick_seconds
+        self.hub = PushHub(queue_size=256)  # Keyed by session ID
+        self._sessions: Dict[str, DemoSession] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, **options) -> DemoSession:
+        """
+        Start a session (options as for DemoSession).
+
+        Raises:
+            DemoLimitError: Session limit reached
+        """
+        self.prune()
+        if len(self._sessions) >= self.max_sessions:
+            raise DemoLimitError(f"At most {self.max_sessions} demo sessions")
+        session = DemoSession(uuid.uuid4().hex, **options)
+        self._sessions[session.session_id] = session
+        self._tasks[session.session_id] = asyncio.ensure_future(self._run(session))
+        return session
+
+    def get(self, session_id: str) -> Optional[DemoSession]:
+        """Look up a session and mark it active."""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_active = time.monotonic()
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        """Stop and drop a session."""
+        task = self._tasks.pop(session_id, None)
+        if task is not None:
+            task.cancel()
+        return self._sessions.pop(session_id, None) is not None
+
+    def prune(self) -> int:
+        """Drop sessions idle for longer than the TTL."""
+        now = time.monotonic()
+        expired = [
+            session_id for session_id, session in self._sessions.items()
+            if now - session.last_active > self.ttl_seconds and not self.hub.subscriber_count(session_id)
+        ]
+        for session_id in expired:
+            self.remove(session_id)
+        return len(expired)
+
+    def publish(self, session: DemoSession, transitions: List[Dict[str, Any]]) -> None:
+        """Push transitions to the session's stream."""
+        for transition in transitions:
+            self.hub.publish(session.session_id, transition)
+
+    async def _run(self, session: DemoSession) -> None:
+        """Advance a session with its virtual clock until it finishes."""
+        while not session.finished:
+            await asyncio.sleep(self.tick_seconds)
+            self.publish(session, session.advance())
+        self.hub.publish(session.session_id, {"type": "finished", "at": session.snapshot()["virtual_time"]})
+
+    async def aclose(self) -> None:
+        """Stop every session."""
+        for session_id in list(self._sessions):
+            self.remove(session_id)
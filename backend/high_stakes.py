@@ -0,0 +1,87 @@
+"""
+High-Stakes Title Classifier for Omtobe MVP v0.1
+
+Single precompiled matcher shared by the state machine and the calendar
+integration:
+- Title contains "Board", "Negotiation", "Review", "High-Stakes" (case-insensitive)
+- Title starts with "!" prefix
+
+Results are memoized by (event ID, title) so recurring events seen on
+every calendar sync are classified once.
+"""
+
+from collections import OrderedDict
+import re
+from typing import Iterable, List, Optional
+
+TRIGGER_KEYWORDS = frozenset({"board", "negotiation", "review", "high-stakes"})
+
+
+class HighStakesClassifier:
+    """Compiled keyword/prefix matcher with a bounded memo."""
+
+    def __init__(self, keywords: Iterable[str] = TRIGGER_KEYWORDS, memo_size: int = 10000):
+        """
+        Compile the matcher.
+
+        Args:
+            keywords: Lowercase trigger keywords (substring match)
+            memo_size: Maximum number of memoized (event ID, title) results
+        """
+        alternation = "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+        # "!" prefix OR any keyword anywhere in the title
+        self._pattern = re.compile(rf"^!|{alternation}", re.IGNORECASE)
+        self._memo: "OrderedDict[tuple[str, str], bool]" = OrderedDict()
+        self.memo_size = memo_size
+
+    def _match(self, title: str) -> bool:
+        """Run the compiled pattern against a title."""
+        return self._pattern.search(title) is not None
+
+    def is_high_stakes(self, title: str, event_id: Optional[str] = None) -> bool:
+        """
+        Check if an event title matches high-stakes criteria.
+
+        Args:
+            title: Event title
+            event_id: Calendar event ID; enables memoization when given
+
+        Returns:
+            bool: True if event is high-stakes
+        """
+        if event_id is None:
+            return self._match(title)
+
+        key = (event_id, title)
+        result = self._memo.get(key)
+        if result is not None:
+            self._memo.move_to_end(key)
+            return result
+
+        result = self._match(title)
+        self._memo[key] = result
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return result
+
+    def classify(self, titles: Iterable[str], event_ids: Optional[Iterable[str]] = None) -> List[bool]:
+        """
+        Classify a batch of titles.
+
+        Args:
+            titles: Event titles
+            event_ids: Matching event IDs (same order) for memoization
+
+        Returns:
+            List[bool]: High-stakes flag per title
+        """
+        if event_ids is None:
+            return [self._match(title) for title in titles]
+        return [
+            self.is_high_stakes(title, event_id)
+            for title, event_id in zip(titles, event_ids)
+        ]
+
+
+# Process-wide classifier shared by every code path
+high_stakes_classifier = HighStakesClassifier()
@@ -0,0 +1,246 @@
+"""
+Rolling HRV Baseline for Omtobe MVP v0.1
+
+Keeps a running 7-day mean/std dev per user so a brake check only processes
+the HRV samples that arrived since the previous check, instead of walking the
+full 7-day history every time.
+
+The accumulator's window is also the user's local sample store
+(hrv_store.HRVSampleStore reads and appends through it), so each process
+holds one 7-day window per user. The registry is bounded: users idle for
+HRV_WINDOW_IDLE_SECONDS, or least recently used beyond HRV_WINDOW_MAX_USERS,
+are evicted and start over with a full 7-day fetch.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+import os
+import time
+from typing import Optional, Sequence, Tuple, Union
+import pytz
+
+from hrv_series import HRVSeries
+
+# Registry bounds (one window is roughly 2k samples / 32 KB)
+HRV_WINDOW_IDLE_SECONDS = float(os.getenv("HRV_WINDOW_IDLE_SECONDS", "3600"))
+HRV_WINDOW_MAX_USERS = int(os.getenv("HRV_WINDOW_MAX_USERS", "2000"))
+
+
+class RollingHRVBaseline:
+    """
+    Streaming mean/variance accumulator over a sliding time window.
+
+    Uses Welford's algorithm with removal so samples can be expired as they
+    age out of the window without recomputing from scratch.
+    """
+
+    WINDOW_SECONDS = 7 * 24 * 60 * 60  # 7-day rolling baseline
+
+    def __init__(self, window_seconds: int = WINDOW_SECONDS):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            window_seconds: Width of the rolling window in seconds
+        """
+        self.window_seconds = window_seconds
+        self._window = HRVSeries()  # Samples inside the window start at self._head
+        self._head = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.last_timestamp: Optional[float] = None
+        self.last_update: Optional[datetime] = None  # Last update that ingested new samples
+        self.last_fetched_at: Optional[datetime] = None  # Last non-empty 7-day fetch ingested
+
+    @property
+    def count(self) -> int:
+        """Number of samples currently inside the window."""
+        return len(self._window) - self._head
+
+    @property
+    def mean(self) -> float:
+        """Baseline mean (0.0 when empty)."""
+        return self._mean if self.count else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        """Population standard deviation (0.0 when empty)."""
+        if not self.count:
+            return 0.0
+        variance = max(self._m2, 0.0) / self.count
+        return variance ** 0.5
+
+    def _push(self, timestamp: float, value: float) -> None:
+        """Add a sample to the running statistics."""
+        self._window.append(timestamp, value)
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def _pop(self) -> None:
+        """Remove the oldest sample from the running statistics."""
+        value = self._window.values[self._head]
+        self._head += 1
+        remaining = self.count
+        if remaining == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / remaining
+        self._m2 -= delta * (value - self._mean)
+
+    def expire(self, now: datetime) -> None:
+        """
+        Drop samples that have aged out of the window.
+
+        Args:
+            now: Reference time for the end of the window
+        """
+        cutoff = now.timestamp() - self.window_seconds
+        timestamps = self._window.timestamps
+        while self.count and timestamps[self._head] < cutoff:
+            self._pop()
+
+        # Reclaim the expired prefix once it dominates the buffer
+        if self._head and self._head * 2 >= len(self._window):
+            self._window = self._window[self._head:]
+            self._head = 0
+
+    def window(self) -> HRVSeries:
+        """
+        Samples currently inside the window (do not mutate).
+
+        Returns:
+            HRVSeries: Samples oldest first
+        """
+        return self._window[self._head:] if self._head else self._window
+
+    def ingest(self, hrv_samples: Union[HRVSeries, Sequence], now: Optional[datetime] = None) -> int:
+        """
+        Add samples newer than the last ingested timestamp and expire old ones.
+
+        Samples are expected in ascending timestamp order (as returned by the
+        integrations), so the scan stops at the first already-seen sample.
+
+        Args:
+            hrv_samples: HRV series or samples (oldest first)
+            now: Reference time for expiry (defaults to now)
+
+        Returns:
+            int: Number of samples added
+        """
+        now = now or datetime.now(pytz.UTC)
+        ingested = 0
+        if isinstance(hrv_samples, HRVSeries):
+            if self.last_timestamp is not None:
+                hrv_samples = hrv_samples.after(self.last_timestamp)
+            for timestamp, value in hrv_samples:
+                self._push(timestamp, value)
+            ingested = len(hrv_samples)
+            if ingested:
+                self.last_timestamp = hrv_samples.timestamps[-1]
+        else:
+            new_samples = []
+            for sample in reversed(hrv_samples):
+                timestamp = sample.timestamp.timestamp()
+                if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+                    break
+                new_samples.append((timestamp, sample.value))
+
+            for timestamp, value in reversed(new_samples):
+                self._push(timestamp, value)
+            ingested = len(new_samples)
+            if ingested:
+                self.last_timestamp = new_samples[0][0]
+
+        if ingested:
+            self.last_update = now
+        self.expire(now)
+        return ingested
+
+    def update(
+        self,
+        hrv_samples: Union[HRVSeries, Sequence],
+        now: Optional[datetime] = None,
+        fetched: bool = False
+    ) -> Tuple[float, float]:
+        """
+        Ingest new samples, expire old ones and return the current baseline.
+
+        Args:
+            hrv_samples: HRV series or samples (oldest first) covering the recent window
+            now: Reference time for expiry (defaults to now)
+            fetched: The samples are a fresh 7-day fetch (sets last_fetched_at if non-empty)
+
+        Returns:
+            Tuple[float, float]: (mean, std_dev)
+        """
+        now = now or datetime.now(pytz.UTC)
+        if fetched and len(hrv_samples):
+            self.last_fetched_at = now
+
+        self.ingest(hrv_samples, now)
+        return self.mean, self.std_dev
+
+
+class HRVBaselineRegistry:
+    """Per-user rolling baselines, bounded by idle time and user count (LRU)."""
+
+    def __init__(
+        self,
+        window_seconds: int = RollingHRVBaseline.WINDOW_SECONDS,
+        idle_seconds: float = HRV_WINDOW_IDLE_SECONDS,
+        max_users: int = HRV_WINDOW_MAX_USERS
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            window_seconds: Window width for newly created baselines
+            idle_seconds: Seconds since last use after which a baseline is evicted
+            max_users: Maximum number of baselines kept
+        """
+        self.window_seconds = window_seconds
+        self.idle_seconds = idle_seconds
+        self.max_users = max_users
+        self._baselines: "OrderedDict[str, tuple[float, RollingHRVBaseline]]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._baselines)
+
+    def get(self, user_id: str) -> RollingHRVBaseline:
+        """
+        Get or create the rolling baseline for a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            RollingHRVBaseline: The user's accumulator
+        """
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        entry = self._baselines.pop(user_id, None)
+        baseline = entry[1] if entry else RollingHRVBaseline(self.window_seconds)
+        self._baselines[user_id] = (now, baseline)
+
+        while len(self._baselines) > self.max_users:
+            self._baselines.popitem(last=False)
+            self.evictions += 1
+        return baseline
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop baselines unused for idle_seconds (least recently used first)."""
+        while self._baselines:
+            last_used, _ = next(iter(self._baselines.values()))
+            if now - last_used < self.idle_seconds:
+                break
+            self._baselines.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, user_id: str) -> None:
+        """Forget a user's baseline (e.g. on account deletion)."""
+        self._baselines.pop(user_id, None)
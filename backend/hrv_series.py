@@ -0,0 +1,139 @@
+"""
+Columnar HRV Time Series for Omtobe MVP v0.1
+
+Stores HRV measurements as two contiguous float buffers (epoch seconds and
+values) instead of a list of per-sample dataclasses, so a 7-day baseline is
+a couple of compact arrays rather than thousands of datetime/float objects.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Tuple, Union
+import pytz
+
+TimeLike = Union[datetime, float]
+
+
+def _to_epoch(value: TimeLike) -> float:
+    """Convert a datetime or epoch value to epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class HRVSeries:
+    """
+    Array-backed HRV series ordered by timestamp (oldest first).
+
+    Attributes:
+        timestamps: array('d') of epoch seconds
+        values: array('d') of HRV values in milliseconds
+    """
+
+    __slots__ = ("timestamps", "values")
+
+    def __init__(self, timestamps: Optional[array] = None, values: Optional[array] = None):
+        """
+        Initialize series from existing buffers (or empty).
+
+        Args:
+            timestamps: Epoch-second buffer, ascending
+            values: HRV value buffer, same length as timestamps
+        """
+        self.timestamps = timestamps if timestamps is not None else array("d")
+        self.values = values if values is not None else array("d")
+        if len(self.timestamps) != len(self.values):
+            raise ValueError("timestamps and values must have the same length")
+
+    @classmethod
+    def from_samples(cls, samples: Iterable) -> "HRVSeries":
+        """
+        Build a series from HRVSample-like objects.
+
+        Args:
+            samples: Objects with `timestamp` (datetime) and `value` attributes
+
+        Returns:
+            HRVSeries: Columnar copy of the samples
+        """
+        series = cls()
+        for sample in samples:
+            series.append(sample.timestamp, sample.value)
+        return series
+
+    def append(self, timestamp: TimeLike, value: float) -> None:
+        """Append one measurement (must not be older than the last one)."""
+        self.timestamps.append(_to_epoch(timestamp))
+        self.values.append(float(value))
+
+    def extend(self, other: "HRVSeries") -> None:
+        """Append all measurements from another series."""
+        self.timestamps.extend(other.timestamps)
+        self.values.extend(other.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        """Iterate (epoch seconds, value) pairs."""
+        return zip(self.timestamps, self.values)
+
+    def __getitem__(self, index: slice) -> "HRVSeries":
+        """Positional slice of the series."""
+        if not isinstance(index, slice):
+            raise TypeError("HRVSeries only supports slicing; use latest() or iterate")
+        return HRVSeries(self.timestamps[index], self.values[index])
+
+    def window(self, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None) -> "HRVSeries":
+        """
+        Measurements with start <= timestamp <= end.
+
+        Args:
+            start: Window start (inclusive), open if None
+            end: Window end (inclusive), open if None
+
+        Returns:
+            HRVSeries: Copy of the matching range
+        """
+        lo = 0 if start is None else bisect_left(self.timestamps, _to_epoch(start))
+        hi = len(self) if end is None else bisect_right(self.timestamps, _to_epoch(end))
+        return self[lo:hi]
+
+    def after(self, timestamp: TimeLike) -> "HRVSeries":
+        """Measurements strictly newer than `timestamp`."""
+        lo = bisect_right(self.timestamps, _to_epoch(timestamp))
+        return self[lo:]
+
+    def drop_before(self, timestamp: TimeLike) -> None:
+        """Discard measurements older than `timestamp` in place."""
+        cut = bisect_left(self.timestamps, _to_epoch(timestamp))
+        if cut:
+            del self.timestamps[:cut]
+            del self.values[:cut]
+
+    def first(self) -> Optional[Tuple[datetime, float]]:
+        """Oldest measurement as (timestamp, value), or None."""
+        if not self.values:
+            return None
+        return datetime.fromtimestamp(self.timestamps[0], pytz.UTC), self.values[0]
+
+    def latest(self) -> Optional[Tuple[datetime, float]]:
+        """Most recent measurement as (timestamp, value), or None."""
+        if not self.values:
+            return None
+        return datetime.fromtimestamp(self.timestamps[-1], pytz.UTC), self.values[-1]
+
+    def mean_std(self) -> Tuple[float, float]:
+        """
+        Population mean and standard deviation of the values.
+
+        Returns:
+            Tuple[float, float]: (mean, std_dev), (0.0, 0.0) when empty
+        """
+        if not self.values:
+            return 0.0, 0.0
+        values = self.values
+        mean = sum(values) / len(values)
+        variance = sum((x - mean) ** 2 for x in values) / len(values)
+        return mean, variance ** 0.5
@@ -0,0 +1,87 @@
+"""
+Local HRV Sample Store for Omtobe MVP v0.1
+
+Per-user rolling 7-day window of HRV samples plus a sync watermark (timestamp
+of the newest sample seen). HealthKit baseline fetches only ask for samples
+newer than the watermark and append them here, instead of re-downloading the
+full 7 days on every brake check.
+
+The windows are the users' rolling baselines (hrv_baseline), so samples are
+held once per user and evicted with the baseline registry.
+"""
+
+from datetime import datetime
+from typing import Optional
+import pytz
+
+from hrv_baseline import HRVBaselineRegistry
+from hrv_series import HRVSeries
+
+
+class HRVSampleStore:
+    """Rolling sample windows keyed by user ID, backed by a baseline registry."""
+
+    def __init__(self, baselines: Optional[HRVBaselineRegistry] = None):
+        """
+        Initialize store.
+
+        Args:
+            baselines: Registry holding the windows (share it with the brake
+                check's baselines to keep one window per user)
+        """
+        self.baselines = baselines if baselines is not None else HRVBaselineRegistry()
+
+    def watermark(self, user_id: str) -> Optional[datetime]:
+        """
+        Timestamp of the newest stored sample for a user.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Optional[datetime]: Watermark, or None before the first sync
+        """
+        baseline = self.baselines.get(user_id)
+        if not baseline.count:
+            return None
+        return datetime.fromtimestamp(baseline.last_timestamp, pytz.UTC)
+
+    def ingest(self, user_id: str, samples: HRVSeries, now: Optional[datetime] = None) -> int:
+        """
+        Append samples newer than the watermark and evict expired ones.
+
+        Args:
+            user_id: User identifier
+            samples: Freshly fetched samples (oldest first)
+            now: Reference time for eviction (defaults to now)
+
+        Returns:
+            int: Number of samples added
+        """
+        return self.baselines.get(user_id).ingest(samples, now)
+
+    def evict(self, user_id: str, now: Optional[datetime] = None) -> None:
+        """
+        Drop a user's samples that have aged out of the window.
+
+        Args:
+            user_id: User identifier
+            now: Reference time (defaults to now)
+        """
+        self.baselines.get(user_id).expire(now or datetime.now(pytz.UTC))
+
+    def window(self, user_id: str) -> HRVSeries:
+        """
+        The user's stored window (live view; do not mutate).
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            HRVSeries: Samples from the past window, oldest first
+        """
+        return self.baselines.get(user_id).window()
+
+    def discard(self, user_id: str) -> None:
+        """Forget a user's samples and watermark."""
+        self.baselines.discard(user_id)
@@ -0,0 +1,124 @@
+"""
+Streaming HealthKit Response Parser for Omtobe MVP v0.1
+
+Decodes a HealthKit samples response ({"samples": [{"timestamp": ...,
+"value": ...}, ...]}) incrementally as body chunks arrive, appending each
+sample straight into an HRVSeries. Only the current unparsed tail of the
+body is held in memory, so peak usage no longer grows with the number of
+samples (no full dict tree, no intermediate list of objects).
+
+Only the "samples" array is interpreted; everything after it is ignored.
+"""
+
+import codecs
+import json
+import re
+from typing import AsyncIterator
+
+from hrv_series import HRVSeries
+from timestamps import parse_epochs
+
+# Opening of the samples array: "samples" : [
+_SAMPLES_START = re.compile(r'"samples"\s*:\s*\[')
+_SKIP = re.compile(r"[\s,]*")
+
+# Bytes of unmatched prefix kept while looking for the samples array
+_SEARCH_TAIL = 64
+
+
+class HRVStreamParser:
+    """Push parser turning response body chunks into an HRVSeries."""
+
+    def __init__(self):
+        """Initialize parser with an empty series."""
+        self.series = HRVSeries()
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._in_array = False
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Consume one body chunk.
+
+        Args:
+            chunk: Raw response bytes
+
+        Raises:
+            ValueError: Malformed sample entry
+        """
+        if self.done:
+            return
+        self._buffer += self._text.decode(chunk)
+
+        if not self._in_array:
+            match = _SAMPLES_START.search(self._buffer)
+            if match is None:
+                self._buffer = self._buffer[-_SEARCH_TAIL:]
+                return
+            self._buffer = self._buffer[match.end():]
+            self._in_array = True
+
+        self._parse_items()
+
+    def _parse_items(self) -> None:
+        """Decode every complete sample object in the buffer."""
+        buffer = self._buffer
+        position = 0
+        timestamps = []
+        values = []
+
+        while True:
+            position = _SKIP.match(buffer, position).end()
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]":
+                self.done = True
+                position += 1
+                break
+            try:
+                item, position = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Incomplete object: wait for more data
+                break
+            timestamps.append(item["timestamp"])
+            values.append(float(item["value"]))
+
+        # Timestamps are decoded in bulk, straight to epoch seconds
+        self.series.timestamps.extend(parse_epochs(timestamps))
+        self.series.values.extend(values)
+        self._buffer = buffer[position:]
+
+    def close(self) -> HRVSeries:
+        """
+        Finish parsing.
+
+        Returns:
+            HRVSeries: All decoded samples (empty if the body has no samples key)
+
+        Raises:
+            ValueError: Body ended inside the samples array
+        """
+        self.feed(self._text.decode(b"", final=True).encode("utf-8"))
+        if self._in_array and not self.done:
+            raise ValueError("HealthKit response truncated inside samples array")
+        return self.series
+
+
+async def parse_hrv_stream(chunks: AsyncIterator[bytes]) -> HRVSeries:
+    """
+    Parse a streamed HealthKit samples response.
+
+    Args:
+        chunks: Response body chunks (e.g. httpx.Response.aiter_bytes())
+
+    Returns:
+        HRVSeries: Samples in response order
+    """
+    parser = HRVStreamParser()
+    async for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    return parser.close()
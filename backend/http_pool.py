@@ -0,0 +1,128 @@
+"""
+Shared HTTP Client Pool for Omtobe MVP v0.1
+
+One application-scoped httpx.AsyncClient (keep-alive, optional HTTP/2,
+bounded connection pool) shared by every integration instance, created on
+FastAPI startup and closed on shutdown. Per-host timeouts let a slow
+provider be cut off sooner than the others.
+
+Configuration (environment):
+- HTTP_MAX_CONNECTIONS: Total open connections (default 100)
+- HTTP_MAX_KEEPALIVE_CONNECTIONS: Idle connections kept warm (default 20)
+- HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default 30)
+- HTTP2_ENABLED: "1" to negotiate HTTP/2 (default "1")
+- HTTP_DEFAULT_TIMEOUT: Seconds for hosts without an override (default 10)
+- HTTP_HOST_TIMEOUTS: Per-host overrides, e.g. "api.healthkit.apple.com=5,www.googleapis.com=8"
+"""
+
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+
+
+def _parse_host_timeouts(value: str) -> Dict[str, float]:
+    """Parse "host=seconds,host=seconds" into a dict."""
+    timeouts = {}
+    for item in value.split(","):
+        if "=" in item:
+            host, seconds = item.split("=", 1)
+            timeouts[host.strip()] = float(seconds)
+    return timeouts
+
+
+class HTTPClientPool:
+    """Lifecycle owner of the shared upstream HTTP client."""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        default_timeout: float = 10.0,
+        host_timeouts: Optional[Dict[str, float]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Configure the pool (the client itself is created by start()).
+
+        Args:
+            max_connections: Maximum concurrent connections
+            max_keepalive_connections: Maximum idle keep-alive connections
+            keepalive_expiry: Idle connection lifetime in seconds
+            http2: Negotiate HTTP/2 where the upstream supports it
+            default_timeout: Timeout in seconds for hosts without an override
+            host_timeouts: Timeout in seconds per hostname
+            transport: Custom transport (e.g. recorded responses in tests)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2
+        self.default_timeout = httpx.Timeout(default_timeout)
+        self.host_timeouts = {
+            host: httpx.Timeout(seconds)
+            for host, seconds in (host_timeouts or {}).items()
+        }
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_env(cls) -> "HTTPClientPool":
+        """Build a pool from environment variables."""
+        return cls(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("HTTP2_ENABLED", "1") == "1",
+            default_timeout=float(os.getenv("HTTP_DEFAULT_TIMEOUT", "10")),
+            host_timeouts=_parse_host_timeouts(os.getenv("HTTP_HOST_TIMEOUTS", ""))
+        )
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Build the shared client from the pool configuration."""
+        return httpx.AsyncClient(
+            limits=self.limits,
+            http2=self.http2,
+            timeout=self.default_timeout,
+            transport=self.transport
+        )
+
+    async def start(self) -> None:
+        """Create the shared client (idempotent)."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+
+    async def aclose(self) -> None:
+        """Close the shared client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        The shared client.
+
+        Created lazily if start() has not run yet (e.g. scripts and tests
+        that don't go through the FastAPI lifespan).
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def timeout_for(self, url: str) -> httpx.Timeout:
+        """
+        Timeout for requests to the given URL's host.
+
+        Args:
+            url: Request or base URL
+
+        Returns:
+            httpx.Timeout: Host override, or the default timeout
+        """
+        host = urlsplit(url).hostname or ""
+        return self.host_timeouts.get(host, self.default_timeout)
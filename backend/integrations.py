@@ -5,13 +5,29 @@ External API Integrations for Omtobe MVP v0.1
 - Google Calendar: High-stakes event detection
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from datetime import datetime, timedelta, tzinfo
+from typing import AsyncIterator, List, Optional, Dict
 import httpx
 import json
+import logging
 from dataclasses import dataclass
 import pytz
 
+from calendar_cache import SYNC_HORIZON, CalendarEventCache
+from calendar_index import HighStakesEventIndex
+from high_stakes import TRIGGER_KEYWORDS as HIGH_STAKES_KEYWORDS, high_stakes_classifier
+from hrv_series import HRVSeries
+from hrv_store import HRVSampleStore
+from hrv_stream import parse_hrv_stream
+from timestamps import parse_epochs
+from tokens import TokenSource
+from http_pool import HTTPClientPool
+from resilience import Resilience, UpstreamUnavailable, upstream
+from singleflight import SingleFlight
+from synthetic import LatencyModel, SyntheticHRVGenerator
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class HRVSample:
@@ -27,6 +43,54 @@ class CalendarEvent:
     title: str
     start_time: datetime
     end_time: datetime
+    start_epoch: Optional[float] = None  # Epoch seconds (derived from start_time if omitted)
+    end_epoch: Optional[float] = None
+    
+    def __post_init__(self):
+        if self.start_epoch is None:
+            self.start_epoch = self.start_time.timestamp()
+        if self.end_epoch is None:
+            self.end_epoch = self.end_time.timestamp()
+
+
+# Concurrent syncs of the same user's HRV window / calendar share one upstream call
+baseline_sync_flights = SingleFlight()
+calendar_sync_flights = SingleFlight()
+
+
+async def _sync_7day_window(integration, sample_store: HRVSampleStore, user_id: str) -> HRVSeries:
+    """Coalesced _fetch_7day_window (one upstream fetch per user at a time)."""
+    return await baseline_sync_flights.do(
+        user_id, lambda: _fetch_7day_window(integration, sample_store, user_id)
+    )
+
+
+async def _fetch_7day_window(integration, sample_store: HRVSampleStore, user_id: str) -> HRVSeries:
+    """
+    Fetch only samples newer than the user's watermark into the local store.
+    
+    Samples backfilled upstream with timestamps older than the watermark are
+    not picked up until they age out; the store starts over with a full 7-day
+    fetch once it is empty.
+    
+    Args:
+        integration: Object providing get_hrv_samples()
+        sample_store: Local rolling sample store
+        user_id: User identifier
+        
+    Returns:
+        HRVSeries: The user's stored 7-day window
+    """
+    now = datetime.now(pytz.UTC)
+    seven_days_ago = now - timedelta(days=7)
+    
+    watermark = sample_store.watermark(user_id)
+    start = max(watermark, seven_days_ago) if watermark else seven_days_ago
+    
+    new_samples = await integration.get_hrv_samples(start, now, limit=10000)
+    sample_store.ingest(user_id, new_samples, now)
+    
+    return sample_store.window(user_id)
 
 
 class HealthKitIntegration:
@@ -37,23 +101,49 @@ class HealthKitIntegration:
     For MVP, we simulate with mock data or use a proxy service.
     """
     
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: str,
+        http_pool: Optional[HTTPClientPool] = None,
+        user_id: Optional[str] = None,
+        sample_store: Optional[HRVSampleStore] = None,
+        resilience: Optional[Resilience] = None,
+        token_source: Optional[TokenSource] = None
+    ):
         """
         Initialize HealthKit integration.
         
         Args:
             access_token: OAuth token from Apple HealthKit
+            http_pool: Shared application client pool (a private client is
+                created when omitted)
+            user_id: User the token belongs to (keys the sample store)
+            sample_store: Local sample store enabling incremental baseline sync
+            resilience: Rate limit / retry / circuit policy (shared "healthkit"
+                policy when omitted)
+            token_source: Managed (auto-refreshed) token replacing access_token
         """
         self.access_token = access_token
+        self.user_id = user_id
+        self.sample_store = sample_store
         self.base_url = "https://api.healthkit.apple.com"  # Placeholder
-        self.client = httpx.AsyncClient()
+        self.resilience = resilience or upstream("healthkit")
+        self.token_source = token_source
+        self.client = http_pool.client if http_pool else httpx.AsyncClient()
+        self.timeout = http_pool.timeout_for(self.base_url) if http_pool else 10.0
+    
+    async def _access_token(self) -> str:
+        """Token for the next request (managed token when available)."""
+        if self.token_source is not None:
+            return await self.token_source.get() or self.access_token
+        return self.access_token
     
     async def get_hrv_samples(
         self,
         start_date: datetime,
         end_date: datetime,
         limit: int = 1000
-    ) -> List[HRVSample]:
+    ) -> HRVSeries:
         """
         Fetch HRV samples from HealthKit for a date range.
         
@@ -63,10 +153,10 @@ class HealthKitIntegration:
             limit: Maximum number of samples to return
             
         Returns:
-            List[HRVSample]: HRV measurements
+            HRVSeries: HRV measurements (oldest first)
         """
         headers = {
-            "Authorization": f"Bearer {self.access_token}",
+            "Authorization": f"Bearer {await self._access_token()}",
             "Content-Type": "application/json"
         }
         
@@ -77,30 +167,29 @@ class HealthKitIntegration:
             "data_type": "HKQuantityTypeIdentifierHeartRateVariabilitySDNN"
         }
         
+        request = self.client.build_request(
+            "GET",
+            f"{self.base_url}/v1/samples",
+            headers=headers,
+            params=params,
+            timeout=self.timeout
+        )
+        
         try:
-            response = await self.client.get(
-                f"{self.base_url}/v1/samples",
-                headers=headers,
-                params=params,
-                timeout=10.0
+            # Stream the body: samples are decoded chunk by chunk into the series
+            response = await self.resilience.call(
+                lambda: self.client.send(request, stream=True),
+                timeout=self.timeout
             )
-            response.raise_for_status()
-            
-            data = response.json()
-            samples = []
-            
-            for item in data.get("samples", []):
-                sample = HRVSample(
-                    timestamp=datetime.fromisoformat(item["timestamp"]),
-                    value=float(item["value"])
-                )
-                samples.append(sample)
-            
-            return samples
-        
-        except httpx.HTTPError as e:
-            print(f"HealthKit API error: {e}")
-            return []
+            try:
+                response.raise_for_status()
+                return await parse_hrv_stream(response.aiter_bytes())
+            finally:
+                await response.aclose()
+        
+        except (httpx.HTTPError, UpstreamUnavailable, ValueError, KeyError) as e:
+            logger.warning(f"HealthKit API error: {e}")
+            return HRVSeries()
     
     async def get_latest_hrv(self) -> Optional[HRVSample]:
         """
@@ -113,15 +202,22 @@ class HealthKitIntegration:
         one_hour_ago = now - timedelta(hours=1)
         
         samples = await self.get_hrv_samples(one_hour_ago, now, limit=1)
-        return samples[0] if samples else None
+        first = samples.first()
+        return HRVSample(timestamp=first[0], value=first[1]) if first else None
     
-    async def get_7day_baseline(self) -> List[HRVSample]:
+    async def get_7day_baseline(self) -> HRVSeries:
         """
         Fetch 7-day HRV data for baseline calculation.
         
+        With a sample store, only samples newer than the last sync are
+        downloaded and merged into the local 7-day window.
+        
         Returns:
-            List[HRVSample]: HRV samples from past 7 days
+            HRVSeries: HRV samples from past 7 days
         """
+        if self.sample_store is not None and self.user_id:
+            return await _sync_7day_window(self, self.sample_store, self.user_id)
+        
         now = datetime.now(pytz.UTC)
         seven_days_ago = now - timedelta(days=7)
         
@@ -135,40 +231,120 @@ class GoogleCalendarIntegration:
     Filters events by keywords: "Board", "Negotiation", "Review", "High-Stakes", or "!" prefix.
     """
     
-    TRIGGER_KEYWORDS = {"board", "negotiation", "review", "high-stakes"}
+    TRIGGER_KEYWORDS = set(HIGH_STAKES_KEYWORDS)
+    
+    PAGE_SIZE = 250  # Google Calendar maximum is 2500; keep pages small
+    SYNC_LOOKBACK = timedelta(days=1)  # Full sync includes events that may still be running
     
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: str,
+        http_pool: Optional[HTTPClientPool] = None,
+        user_id: Optional[str] = None,
+        event_cache: Optional[CalendarEventCache] = None,
+        resilience: Optional[Resilience] = None,
+        token_source: Optional[TokenSource] = None,
+        timezone: str = "UTC"
+    ):
         """
         Initialize Google Calendar integration.
         
         Args:
             access_token: OAuth token from Google Calendar API
+            http_pool: Shared application client pool (a private client is
+                created when omitted)
+            user_id: User the token belongs to (keys the event cache)
+            event_cache: Local event cache enabling incremental sync
+            resilience: Rate limit / retry / circuit policy (shared
+                "google_calendar" policy when omitted)
+            token_source: Managed (auto-refreshed) token replacing access_token
+            timezone: User's timezone (all-day events span its local midnights)
         """
         self.access_token = access_token
+        self.user_id = user_id
+        self.tz = pytz.timezone(timezone)
+        self.event_cache = event_cache
         self.base_url = "https://www.googleapis.com/calendar/v3"
-        self.client = httpx.AsyncClient()
+        self.resilience = resilience or upstream("google_calendar")
+        self.token_source = token_source
+        self.client = http_pool.client if http_pool else httpx.AsyncClient()
+        self.timeout = http_pool.timeout_for(self.base_url) if http_pool else 10.0
+        self.event_index: Optional[HighStakesEventIndex] = None  # Rebuilt on each sync
+    
+    async def _access_token(self) -> str:
+        """Token for the next request (managed token when available)."""
+        if self.token_source is not None:
+            return await self.token_source.get() or self.access_token
+        return self.access_token
     
-    def _is_high_stakes_event(self, event_title: str) -> bool:
+    def _is_high_stakes_event(self, event_title: str, event_id: Optional[str] = None) -> bool:
         """
         Check if event title matches high-stakes criteria.
         
         Args:
             event_title: Event title from Google Calendar
+            event_id: Google Calendar event ID (enables memoization)
             
         Returns:
             bool: True if event is high-stakes
         """
-        title_lower = event_title.lower()
+        return high_stakes_classifier.is_high_stakes(event_title, event_id)
+    
+    @staticmethod
+    def _parse_events(items: List[Dict], tz: tzinfo = pytz.UTC) -> List[CalendarEvent]:
+        """
+        Build CalendarEvents from Google Calendar event resources.
         
-        # Check for trigger keywords
-        if any(keyword in title_lower for keyword in self.TRIGGER_KEYWORDS):
-            return True
+        Start/end times (dateTime, or date for all-day events) are decoded
+        to epoch seconds in bulk; all-day dates are midnight in `tz`.
+        """
+        starts = parse_epochs((item["start"].get("dateTime", item["start"].get("date")) for item in items), tz)
+        ends = parse_epochs((item["end"].get("dateTime", item["end"].get("date")) for item in items), tz)
+        
+        return [
+            CalendarEvent(
+                event_id=item["id"],
+                title=item.get("summary", ""),
+                start_time=datetime.fromtimestamp(start, pytz.UTC),
+                end_time=datetime.fromtimestamp(end, pytz.UTC),
+                start_epoch=start,
+                end_epoch=end
+            )
+            for item, start, end in zip(items, starts, ends)
+        ]
+    
+    async def _list_events(self, params: Dict) -> AsyncIterator[Dict]:
+        """
+        Page through the events list endpoint.
         
-        # Check for "!" prefix
-        if event_title.startswith("!"):
-            return True
+        Args:
+            params: Query parameters for the first page
+            
+        Yields:
+            Dict: One response page; the last page carries nextSyncToken
+        """
+        headers = {
+            "Authorization": f"Bearer {await self._access_token()}",
+            "Content-Type": "application/json"
+        }
+        params = dict(params)
         
-        return False
+        while True:
+            response = await self.resilience.call(lambda: self.client.get(
+                f"{self.base_url}/calendars/primary/events",
+                headers=headers,
+                params=params,
+                timeout=self.timeout
+            ), timeout=self.timeout)
+            response.raise_for_status()
+            
+            page = response.json()
+            yield page
+            
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return
+            params["pageToken"] = page_token
     
     async def get_high_stakes_events(
         self,
@@ -185,92 +361,255 @@ class GoogleCalendarIntegration:
         Returns:
             List[CalendarEvent]: High-stakes events
         """
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-        
         params = {
             "timeMin": start_date.isoformat(),
             "timeMax": end_date.isoformat(),
-            "maxResults": 100,
+            "maxResults": self.PAGE_SIZE,
             "singleEvents": True,
             "orderBy": "startTime"
         }
         
         try:
-            response = await self.client.get(
-                f"{self.base_url}/calendars/primary/events",
-                headers=headers,
-                params=params,
-                timeout=10.0
-            )
-            response.raise_for_status()
-            
-            data = response.json()
             high_stakes_events = []
             
-            for item in data.get("items", []):
-                title = item.get("summary", "")
+            async for page in self._list_events(params):
+                items = page.get("items", [])
+                flags = high_stakes_classifier.classify(
+                    [item.get("summary", "") for item in items],
+                    [item["id"] for item in items]
+                )
                 
                 # Filter for high-stakes events only
-                if self._is_high_stakes_event(title):
-                    event = CalendarEvent(
-                        event_id=item["id"],
-                        title=title,
-                        start_time=datetime.fromisoformat(
-                            item["start"].get("dateTime", item["start"].get("date"))
-                        ),
-                        end_time=datetime.fromisoformat(
-                            item["end"].get("dateTime", item["end"].get("date"))
-                        )
-                    )
-                    high_stakes_events.append(event)
+                high_stakes_events.extend(self._parse_events(
+                    [item for item, is_high_stakes in zip(items, flags) if is_high_stakes], self.tz
+                ))
             
             return high_stakes_events
         
-        except httpx.HTTPError as e:
-            print(f"Google Calendar API error: {e}")
+        except (httpx.HTTPError, UpstreamUnavailable) as e:
+            logger.warning(f"Google Calendar API error: {e}")
             return []
     
-    async def get_active_high_stakes_events(self) -> List[CalendarEvent]:
+    async def sync_events(self) -> HighStakesEventIndex:
         """
-        Fetch currently active high-stakes events.
+        Bring the user's cached events up to date and rebuild the index.
+        
+        Without a sync token this is a full, paginated sync from one day back
+        up to the sync horizon (recurring events expand into instances, so
+        the window must be bounded); with one, only the changes since the
+        last sync are fetched. When the horizon is running out, or the token
+        has expired (410 Gone), the cache is dropped and synced in full.
+        Events beyond the horizon are evicted. On other upstream errors the
+        previous index is kept.
         
         Returns:
-            List[CalendarEvent]: Events that are currently happening
+            HighStakesEventIndex: Index over the cached high-stakes events
         """
+        state = self.event_cache.get(self.user_id)
+        now = datetime.now(pytz.UTC)
+        if state.sync_token and state.horizon_expiring(now):
+            self.event_cache.invalidate(self.user_id)
+            state = self.event_cache.get(self.user_id)
+        
+        # Cleared up front so a notification arriving mid-sync keeps it dirty
+        state.dirty = False
+        
+        params = {"maxResults": self.PAGE_SIZE, "singleEvents": True}
+        if state.sync_token:
+            params["syncToken"] = state.sync_token
+        else:
+            state.horizon = now + SYNC_HORIZON
+            params["timeMin"] = (now - self.SYNC_LOOKBACK).isoformat()
+            params["timeMax"] = state.horizon.isoformat()
+            state.events.clear()
+        
+        try:
+            async for page in self._list_events(params):
+                items = page.get("items", [])
+                live = [item for item in items if item.get("status") != "cancelled"]
+                flags = high_stakes_classifier.classify(
+                    [item.get("summary", "") for item in live],
+                    [item["id"] for item in live]
+                )
+                
+                for item in items:
+                    if item.get("status") == "cancelled":
+                        state.events.pop(item["id"], None)
+                
+                # Events renamed away from a trigger keyword drop out of the cache
+                for item, is_high_stakes in zip(live, flags):
+                    if not is_high_stakes:
+                        state.events.pop(item["id"], None)
+                for event in self._parse_events(
+                    [item for item, is_high_stakes in zip(live, flags) if is_high_stakes], self.tz
+                ):
+                    state.events[event.event_id] = event
+                
+                if page.get("nextSyncToken"):
+                    state.sync_token = page["nextSyncToken"]
+        
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 410 and state.sync_token:
+                self.event_cache.invalidate(self.user_id)
+                return await self.sync_events()
+            logger.warning(f"Google Calendar API error: {e}")
+            state.dirty = True
+            self.event_index = state.index
+            return state.index
+        
+        except (httpx.HTTPError, UpstreamUnavailable) as e:
+            logger.warning(f"Google Calendar API error: {e}")
+            state.dirty = True
+            self.event_index = state.index
+            return state.index
+        
+        # Forget events that ended before the lookback window or start past the horizon
+        cutoff = (now - self.SYNC_LOOKBACK).timestamp()
+        horizon = state.horizon.timestamp()
+        for event_id in [
+            event_id for event_id, event in state.events.items()
+            if event.end_epoch < cutoff or event.start_epoch > horizon
+        ]:
+            del state.events[event_id]
+        
+        state.index = HighStakesEventIndex(state.events.values())
+        state.synced_at = now
+        self.event_index = state.index
+        
+        return state.index
+    
+    async def sync_event_index(self) -> HighStakesEventIndex:
+        """
+        Refresh high-stakes events and rebuild the index.
+        
+        Uses incremental sync when an event cache is attached (and no request
+        at all while a push channel reports the calendar unchanged), otherwise
+        fetches the next 24 hours.
+        
+        Returns:
+            HighStakesEventIndex: Interval index kept on `self.event_index`
+        """
+        if self.event_cache is not None and self.user_id:
+            if not self.event_cache.needs_sync(self.user_id):
+                self.event_index = self.event_cache.get(self.user_id).index
+                return self.event_index
+            self.event_index = await calendar_sync_flights.do(self.user_id, self.sync_events)
+            return self.event_index
+        
         now = datetime.now(pytz.UTC)
         one_day_later = now + timedelta(days=1)
         
         events = await self.get_high_stakes_events(now, one_day_later)
+        self.event_index = HighStakesEventIndex(events)
         
-        # Filter for currently active events
-        active_events = [
-            event for event in events
-            if event.start_time <= now <= event.end_time
-        ]
+        return self.event_index
+    
+    async def get_active_high_stakes_events(self) -> List[CalendarEvent]:
+        """
+        Fetch currently active high-stakes events.
+        
+        Returns:
+            List[CalendarEvent]: Events that are currently happening
+        """
+        index = await self.sync_event_index()
+        return index.active_events_at(datetime.now(pytz.UTC))
+    
+    async def watch(self, channel_id: str, token: str, address: str, expiration: datetime) -> Optional[str]:
+        """
+        Open a push-notification channel for the primary calendar.
+        
+        Args:
+            channel_id: Our channel identifier
+            token: Shared secret echoed back in X-Goog-Channel-Token
+            address: HTTPS webhook URL receiving notifications
+            expiration: Requested channel expiration
+            
+        Returns:
+            Optional[str]: Google resource ID (needed to stop the channel), or None on error
+        """
+        headers = {
+            "Authorization": f"Bearer {await self._access_token()}",
+            "Content-Type": "application/json"
+        }
+        body = {
+            "id": channel_id,
+            "type": "web_hook",
+            "address": address,
+            "token": token,
+            "expiration": int(expiration.timestamp() * 1000)
+        }
         
-        return active_events
+        try:
+            response = await self.resilience.call(lambda: self.client.post(
+                f"{self.base_url}/calendars/primary/events/watch",
+                headers=headers,
+                json=body,
+                timeout=self.timeout
+            ), timeout=self.timeout)
+            response.raise_for_status()
+            return response.json().get("resourceId")
+        
+        except (httpx.HTTPError, UpstreamUnavailable) as e:
+            logger.warning(f"Google Calendar API error: {e}")
+            return None
+    
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        """
+        Stop a push-notification channel.
+        
+        Args:
+            channel_id: Channel identifier
+            resource_id: Google resource ID returned by watch()
+        """
+        headers = {
+            "Authorization": f"Bearer {await self._access_token()}",
+            "Content-Type": "application/json"
+        }
+        
+        try:
+            response = await self.resilience.call(lambda: self.client.post(
+                f"{self.base_url}/channels/stop",
+                headers=headers,
+                json={"id": channel_id, "resourceId": resource_id},
+                timeout=self.timeout
+            ), timeout=self.timeout)
+            response.raise_for_status()
+        
+        except (httpx.HTTPError, UpstreamUnavailable) as e:
+            logger.warning(f"Google Calendar API error: {e}")
 
 
 class MockHealthKitIntegration:
     """
     Mock HealthKit integration for testing and development.
     
-    Generates realistic HRV data patterns.
+    Generates realistic HRV data patterns (seeded, vectorized; see synthetic.py).
     """
     
-    def __init__(self):
-        """Initialize mock integration."""
-        pass
+    def __init__(
+        self,
+        user_id: Optional[str] = None,
+        sample_store: Optional[HRVSampleStore] = None,
+        generator: Optional[SyntheticHRVGenerator] = None
+    ):
+        """
+        Initialize mock integration.
+        
+        Args:
+            user_id: User identifier (keys the sample store and seeds the data)
+            sample_store: Local sample store enabling incremental baseline sync
+            generator: Synthetic data source (scenario from the environment when omitted)
+        """
+        self.user_id = user_id
+        self.sample_store = sample_store
+        self.generator = generator or SyntheticHRVGenerator.from_env(user_id)
     
     async def get_hrv_samples(
         self,
         start_date: datetime,
         end_date: datetime,
         limit: int = 1000
-    ) -> List[HRVSample]:
+    ) -> HRVSeries:
         """
         Generate mock HRV samples.
         
@@ -280,27 +619,9 @@ class MockHealthKitIntegration:
             limit: Maximum number of samples
             
         Returns:
-            List[HRVSample]: Mock HRV measurements
+            HRVSeries: Mock HRV measurements
         """
-        import random
-        
-        samples = []
-        current = start_date
-        
-        # Generate samples every 5 minutes
-        while current <= end_date and len(samples) < limit:
-            # Baseline around 50ms with natural variation
-            base_value = 50 + random.gauss(0, 5)
-            value = max(20, base_value)  # Ensure positive values
-            
-            sample = HRVSample(
-                timestamp=current,
-                value=value
-            )
-            samples.append(sample)
-            current += timedelta(minutes=5)
-        
-        return samples
+        return self.generator.generate(start_date.timestamp(), end_date.timestamp(), limit)
     
     async def get_latest_hrv(self) -> Optional[HRVSample]:
         """Get latest mock HRV sample."""
@@ -308,10 +629,14 @@ class MockHealthKitIntegration:
         one_hour_ago = now - timedelta(hours=1)
         
         samples = await self.get_hrv_samples(one_hour_ago, now, limit=1)
-        return samples[0] if samples else None
+        first = samples.first()
+        return HRVSample(timestamp=first[0], value=first[1]) if first else None
     
-    async def get_7day_baseline(self) -> List[HRVSample]:
+    async def get_7day_baseline(self) -> HRVSeries:
         """Get 7-day mock HRV data."""
+        if self.sample_store is not None and self.user_id:
+            return await _sync_7day_window(self, self.sample_store, self.user_id)
+        
         now = datetime.now(pytz.UTC)
         seven_days_ago = now - timedelta(days=7)
         
@@ -322,12 +647,19 @@ class MockGoogleCalendarIntegration:
     """
     Mock Google Calendar integration for testing and development.
     
-    Generates realistic high-stakes events.
+    Generates realistic high-stakes events, with optional simulated
+    latency and failures.
     """
     
-    def __init__(self):
-        """Initialize mock integration."""
-        pass
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        """
+        Initialize mock integration.
+        
+        Args:
+            latency: Simulated upstream latency/failure model (none when omitted)
+        """
+        self.latency = latency or LatencyModel()
+        self.event_index: Optional[HighStakesEventIndex] = None
     
     async def get_high_stakes_events(
         self,
@@ -342,8 +674,12 @@ class MockGoogleCalendarIntegration:
             end_date: End of date range
             
         Returns:
-            List[CalendarEvent]: Mock high-stakes events
+            List[CalendarEvent]: Mock high-stakes events (empty on a simulated failure)
         """
+        if not await self.latency.wait():
+            logger.warning("Google Calendar API error: simulated mock failure")
+            return []
+        
         events = []
         
         # Generate some mock events
@@ -369,17 +705,17 @@ class MockGoogleCalendarIntegration:
         
         return events
     
-    async def get_active_high_stakes_events(self) -> List[CalendarEvent]:
-        """Get currently active mock events."""
+    async def sync_event_index(self) -> HighStakesEventIndex:
+        """Rebuild the mock event index for the next 24 hours."""
         now = datetime.now(pytz.UTC)
         one_day_later = now + timedelta(days=1)
         
         events = await self.get_high_stakes_events(now, one_day_later)
+        self.event_index = HighStakesEventIndex(events)
         
-        # Filter for currently active events
-        active_events = [
-            event for event in events
-            if event.start_time <= now <= event.end_time
-        ]
-        
-        return active_events
+        return self.event_index
+    
+    async def get_active_high_stakes_events(self) -> List[CalendarEvent]:
+        """Get currently active mock events."""
+        index = await self.sync_event_index()
+        return index.active_events_at(datetime.now(pytz.UTC))
@@ -6,38 +6,126 @@ Core Endpoints:
 - POST /api/v1/decisions - Record user decision (Proceed/Delay)
 - POST /api/v1/reflections - Record reflection response
 - GET /api/v1/state - Get current state machine state
+- PUT /api/v1/oauth/credentials - Store a user's OAuth refresh token for a provider
+- PUT /api/v1/integrations/provider - Pin a user to an integration provider (real / mock / replay)
+- POST /api/v1/calendar/watch - Subscribe to calendar change notifications
+- POST /api/v1/calendar/notifications - Calendar change-notification webhook
+- GET /api/v1/state/stream - Server-Sent Events with pushed brake re-evaluations and Day-7 reflection
+- /api/v1/demo/* - In-memory, time-accelerated demo sessions (no database)
 """
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Header
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import pytz
+import json
 import logging
+import os
+import time
+import uuid
 
-from state_machine import OmtobeStateMachine, DecisionType, ReflectionResponse, HRVSample, CalendarEvent
-from models import User, DecisionLog, ReflectionLog, HRVBaseline, StateMachineState, Base
-from integrations import (
-    HealthKitIntegration,
-    GoogleCalendarIntegration,
-    MockHealthKitIntegration,
-    MockGoogleCalendarIntegration
-)
-from database import engine, SessionLocal
+from state_machine import DecisionType, ReflectionResponse, HRVSample, CalendarEvent
+from models import User, DecisionLog, ReflectionLog, HRVBaseline, OAuthCredential, ScheduledReevaluation, CalendarPushChannel, PushMessage
+from integrations import GoogleCalendarIntegration
+from database import engine, AsyncSessionLocal
+from repository import StateRepository, LoadedState, StaleStateError, dialect_insert
+from schema import upgrade_schema
+from state_cache import StateMachineCache
+from hrv_baseline import HRVBaselineRegistry
+from hrv_store import HRVSampleStore
+from http_pool import HTTPClientPool
+from pipeline import BrakeCheckPipeline
+from singleflight import SingleFlight
+from resilience import upstream_metrics
+from synthetic import LatencyModel
+from providers import IntegrationProviderRegistry, ProviderContext
+from tokens import Credential, OAuthRefresher, TokenManager
+from scheduler import CoolingPeriodScheduler
+from reflection_dispatcher import ReflectionDispatcher
+from push import PushHub, PushRelay, RelayedMessage, sse_stream
+from calendar_cache import CalendarEventCache
+from calendar_channels import CalendarChannel, CalendarChannelRegistry
+from demo import DemoLimitError, DemoSession, DemoSessionManager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create tables, then add columns/indexes missing from existing ones
+upgrade_schema(engine)
+
+# Shared upstream HTTP client pool (HealthKit / Google Calendar)
+http_pool = HTTPClientPool.from_env()
+
+# Calendar push notifications (channels need a public HTTPS webhook URL)
+CALENDAR_WEBHOOK_URL = os.getenv("CALENDAR_WEBHOOK_URL")
+CALENDAR_RENEWAL_INTERVAL_SECONDS = float(os.getenv("CALENDAR_RENEWAL_INTERVAL_SECONDS", "3600"))
+# How often other workers' channels and change notifications are picked up
+CALENDAR_CHANNEL_SYNC_SECONDS = float(os.getenv("CALENDAR_CHANNEL_SYNC_SECONDS", "5"))
+# Rows updated this long before the last load are re-read (clock skew between workers)
+CALENDAR_CHANNEL_SYNC_OVERLAP = timedelta(seconds=60)
+
+# How often expiring OAuth access tokens are swept and refreshed
+TOKEN_REFRESH_INTERVAL_SECONDS = float(os.getenv("TOKEN_REFRESH_INTERVAL_SECONDS", "60"))
+
+# How often stored cooling-period timers are loaded, and how far ahead
+REEVALUATION_SYNC_SECONDS = float(os.getenv("REEVALUATION_SYNC_SECONDS", "10"))
+
+# How long relayed push messages are kept for other workers to pick up
+PUSH_RETENTION = timedelta(minutes=5)
+
+# Distinguishes this worker's relayed pushes and claims from the others'
+WORKER_ID = uuid.uuid4().hex
+
+# Attempts of a state write when another writer got there first
+STATE_WRITE_ATTEMPTS = int(os.getenv("STATE_WRITE_ATTEMPTS", "3"))
+
+# Rows advanced per UPDATE by the Day-8 cycle rollover (runs at 00:00 UTC)
+CYCLE_ROLLOVER_CHUNK_SIZE = int(os.getenv("CYCLE_ROLLOVER_CHUNK_SIZE", "1000"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    await http_pool.start()
+    await sync_calendar_channels()
+    channel_sync_task = asyncio.create_task(calendar_channel_sync_loop())
+    renewal_task = asyncio.create_task(calendar_renewal_loop())
+    token_task = asyncio.create_task(token_refresh_loop())
+    await restore_reevaluations()
+    scheduler_task = asyncio.create_task(cooling_scheduler.run())
+    reevaluation_sync_task = asyncio.create_task(reevaluation_sync_loop())
+    relay_task = asyncio.create_task(push_relay.run())
+    await load_reflection_zones()
+    reflection_task = asyncio.create_task(reflection_dispatcher.run())
+    rollover_task = asyncio.create_task(cycle_rollover_loop())
+    yield
+    channel_sync_task.cancel()
+    renewal_task.cancel()
+    token_task.cancel()
+    scheduler_task.cancel()
+    reevaluation_sync_task.cancel()
+    relay_task.cancel()
+    reflection_task.cancel()
+    rollover_task.cancel()
+    await demo_sessions.aclose()
+    await integration_providers.aclose()
+    await http_pool.aclose()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Omtobe MVP v0.1",
     description="Mirror + Brake Decision Intervention System",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -50,62 +138,558 @@ app.add_middleware(
 )
 
 
+# Per-user rolling HRV baselines (survive across requests, LRU/idle-evicted)
+hrv_baselines = HRVBaselineRegistry()
+
+# Per-user 7-day HRV samples with sync watermarks (incremental HealthKit sync);
+# backed by the baselines so each user's window is held once
+hrv_store = HRVSampleStore(hrv_baselines)
+
+# Hydrated state machines, written through by the state-changing endpoints
+state_cache = StateMachineCache()
+
+# Simulated calendar latency/failures for users on the mock integration
+mock_calendar_latency = LatencyModel.calendar_from_env()
+
+# Per-user calendar events (incremental sync) and their push channels
+calendar_cache = CalendarEventCache()
+calendar_channels = CalendarChannelRegistry(calendar_cache)
+
+
+def _channel_from_row(row: CalendarPushChannel) -> CalendarChannel:
+    return CalendarChannel(
+        channel_id=row.channel_id,
+        user_id=row.user_id,
+        token=row.token,
+        expiration=row.expiration.replace(tzinfo=pytz.UTC),
+        resource_id=row.resource_id
+    )
+
+
+async def persist_calendar_channel(channel: CalendarChannel) -> None:
+    """Store a channel so every worker can validate its notifications."""
+    async with AsyncSessionLocal() as db:
+        db.add(CalendarPushChannel(
+            channel_id=channel.channel_id,
+            user_id=channel.user_id,
+            token=channel.token,
+            resource_id=channel.resource_id,
+            expiration=channel.expiration.astimezone(pytz.UTC).replace(tzinfo=None)
+        ))
+        await db.commit()
+
+
+async def delete_calendar_channel(channel_id: str) -> bool:
+    """Delete a stored channel; True only for the one caller that deleted it."""
+    async with AsyncSessionLocal() as db:
+        deleted = await db.scalar(
+            delete(CalendarPushChannel)
+            .where(CalendarPushChannel.channel_id == channel_id)
+            .returning(CalendarPushChannel.id)
+        )
+        await db.commit()
+    return deleted is not None
+
+
+async def load_calendar_channel(channel_id: str) -> Optional[CalendarChannel]:
+    """Stored channel by ID (e.g. registered by another worker)."""
+    async with AsyncSessionLocal() as db:
+        row = await db.scalar(select(CalendarPushChannel).where(CalendarPushChannel.channel_id == channel_id))
+    return _channel_from_row(row) if row is not None else None
+
+
+async def record_calendar_change(channel: CalendarChannel) -> None:
+    """Note an accepted change notification for the other workers."""
+    changed_at = datetime.utcnow()
+    calendar_channels.apply_change(channel.channel_id, changed_at)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(CalendarPushChannel)
+            .where(CalendarPushChannel.channel_id == channel.channel_id)
+            .values(changed_at=changed_at)
+        )
+        await db.commit()
+
+
+async def sync_calendar_channels() -> int:
+    """
+    Load channels and change notifications recorded by any worker.
+    
+    Only rows updated since the previous load are read. New channels are
+    added to this worker's registry; users whose channel saw a change this
+    worker has not applied yet are marked dirty.
+    
+    Returns:
+        int: Number of users marked dirty
+    """
+    statement = select(CalendarPushChannel).order_by(CalendarPushChannel.updated_at)
+    if calendar_channels.loaded_until is not None:
+        statement = statement.where(
+            CalendarPushChannel.updated_at > calendar_channels.loaded_until - CALENDAR_CHANNEL_SYNC_OVERLAP
+        )
+    async with AsyncSessionLocal() as db:
+        rows = (await db.scalars(statement)).all()
+    
+    dirty = 0
+    for row in rows:
+        channel = calendar_channels.add(_channel_from_row(row))
+        if row.changed_at is not None and calendar_channels.apply_change(channel.channel_id, row.changed_at):
+            dirty += 1
+        calendar_channels.loaded_until = max(calendar_channels.loaded_until or row.updated_at, row.updated_at)
+    return dirty
+
+
+async def calendar_channel_sync_loop() -> None:
+    """Periodically pick up other workers' channels and notifications."""
+    while True:
+        await asyncio.sleep(CALENDAR_CHANNEL_SYNC_SECONDS)
+        try:
+            await sync_calendar_channels()
+        except Exception as e:
+            logger.error(f"Error loading calendar channels: {e}")
+
+
+async def load_oauth_credential(user_id: str, provider: str) -> Optional[Credential]:
+    """Stored OAuth credentials for a user and provider."""
+    async with AsyncSessionLocal() as db:
+        row = await db.scalar(
+            select(OAuthCredential)
+            .where(OAuthCredential.user_id == user_id, OAuthCredential.provider == provider)
+        )
+    if row is None:
+        return None
+    expires_at = row.expires_at.replace(tzinfo=pytz.UTC).timestamp() if row.expires_at else 0.0
+    return Credential(row.refresh_token, row.access_token, expires_at)
+
+
+async def store_oauth_credential(user_id: str, provider: str, credential: Credential) -> None:
+    """Persist a refreshed access token (and the refresh token, if rotated)."""
+    async with AsyncSessionLocal() as db:
+        row = await db.scalar(
+            select(OAuthCredential)
+            .where(OAuthCredential.user_id == user_id, OAuthCredential.provider == provider)
+        )
+        if row is None:
+            return
+        row.refresh_token = credential.refresh_token
+        row.access_token = credential.access_token
+        row.expires_at = datetime.fromtimestamp(credential.expires_at, pytz.UTC).replace(tzinfo=None)
+        await db.commit()
+
+
+async def save_oauth_credential(user_id: str, provider: str, credential: Credential) -> None:
+    """Insert or replace a user's credentials for a provider."""
+    values = {
+        "refresh_token": credential.refresh_token,
+        "access_token": credential.access_token,
+        "expires_at": datetime.fromtimestamp(credential.expires_at, pytz.UTC).replace(tzinfo=None)
+        if credential.expires_at else None,
+        "updated_at": datetime.utcnow(),
+    }
+    async with AsyncSessionLocal() as db:
+        statement = dialect_insert(db, OAuthCredential).values(user_id=user_id, provider=provider, **values)
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[OAuthCredential.user_id, OAuthCredential.provider],
+            set_=values
+        ))
+        await db.commit()
+
+
+async def remove_oauth_credential(user_id: str, provider: str, credential: Credential) -> None:
+    """Delete credentials whose grant was rejected (unless replaced since)."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(OAuthCredential)
+            .where(
+                OAuthCredential.user_id == user_id,
+                OAuthCredential.provider == provider,
+                OAuthCredential.refresh_token == credential.refresh_token
+            )
+        )
+        await db.commit()
+
+
+# OAuth access tokens per (user, provider), refreshed ahead of expiry
+token_manager = TokenManager(
+    OAuthRefresher(http_pool),
+    load=load_oauth_credential,
+    store=store_oauth_credential,
+    remove=remove_oauth_credential
+)
+
+# Real / mock / replay integrations (INTEGRATION_PROVIDER, per-user pins)
+integration_providers = IntegrationProviderRegistry(
+    ProviderContext(http_pool, hrv_store, calendar_cache, mock_calendar_latency, token_manager)
+)
+
+# Concurrent brake checks of the same user share one evaluation
+brake_checks = SingleFlight()
+
+# Connected clients receiving pushed state (SSE)
+push_hub = PushHub()
+
+
+async def store_push_messages(origin: str, messages: List[Tuple[str, dict]]) -> None:
+    """Store pushes for the other workers and prune expired ones."""
+    created_at = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        db.add_all(
+            PushMessage(origin=origin, user_id=user_id, payload=json.dumps(message, default=str), created_at=created_at)
+            for user_id, message in messages
+        )
+        await db.execute(delete(PushMessage).where(PushMessage.created_at < created_at - PUSH_RETENTION))
+        await db.commit()
+
+
+async def load_push_messages(since: datetime) -> List[RelayedMessage]:
+    """Stored pushes created after `since` (naive UTC), oldest first."""
+    async with AsyncSessionLocal() as db:
+        rows = (await db.scalars(
+            select(PushMessage)
+            .where(PushMessage.created_at > since)
+            .order_by(PushMessage.created_at, PushMessage.id)
+        )).all()
+    return [
+        RelayedMessage(row.id, row.origin, row.user_id, json.loads(row.payload), row.created_at)
+        for row in rows
+    ]
+
+
+# Pushes reach clients connected to any worker
+push_relay = PushRelay(push_hub, WORKER_ID, store=store_push_messages, load=load_push_messages)
+
+
+async def persist_reevaluation(user_id: str, due: float) -> None:
+    """Store (or move) a user's pending cooling-period re-evaluation."""
+    due_at = datetime.fromtimestamp(due, pytz.UTC).replace(tzinfo=None)
+    async with AsyncSessionLocal() as db:
+        statement = dialect_insert(db, ScheduledReevaluation).values(
+            user_id=user_id, due_at=due_at, created_at=datetime.utcnow()
+        )
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[ScheduledReevaluation.user_id],
+            set_={"due_at": due_at}
+        ))
+        await db.commit()
+
+
+async def claim_reevaluation(user_id: str) -> bool:
+    """Delete a user's due re-evaluation; True only for the one worker that deleted it."""
+    async with AsyncSessionLocal() as db:
+        claimed = await db.scalar(
+            delete(ScheduledReevaluation)
+            .where(ScheduledReevaluation.user_id == user_id, ScheduledReevaluation.due_at <= datetime.utcnow())
+            .returning(ScheduledReevaluation.id)
+        )
+        await db.commit()
+    return claimed is not None
+
+
+async def remove_reevaluation(user_id: str) -> None:
+    """Delete a user's stored re-evaluation."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(ScheduledReevaluation).where(ScheduledReevaluation.user_id == user_id))
+        await db.commit()
+
+
+async def reevaluate_after_cooling_period(user_id: str) -> None:
+    """Re-run the brake check when a cooling period ends and push the result."""
+    # Own flight key: a client check already in flight may predate the end of
+    # the cooling period and would still report it as active
+    result = await brake_checks.do(("cooling_period_end", user_id), lambda: run_brake_check(user_id))
+    delivered = await push_relay.publish(user_id, {"type": "brake_check", **result})
+    logger.info(f"Cooling period ended for {user_id}: should_display={result.get('should_display')} "
+                f"(pushed to {delivered} local clients)")
+
+
+# Exactly-timed Delay re-triggers (replaces client polling)
+cooling_scheduler = CoolingPeriodScheduler(
+    reevaluate_after_cooling_period,
+    persist=persist_reevaluation,
+    remove=remove_reevaluation,
+    claim=claim_reevaluation
+)
+
+
+async def restore_reevaluations(within: Optional[timedelta] = None) -> None:
+    """
+    Load stored re-evaluations into this worker's scheduler.
+    
+    Every worker loads the timers due soon, including ones scheduled by
+    other workers; the claim lets exactly one of them fire each timer.
+    
+    Args:
+        within: Only timers due within this long (None loads all, e.g. after a restart)
+    """
+    statement = select(ScheduledReevaluation)
+    if within is not None:
+        statement = statement.where(ScheduledReevaluation.due_at <= datetime.utcnow() + within)
+    async with AsyncSessionLocal() as db:
+        rows = (await db.scalars(statement)).all()
+    cooling_scheduler.restore(
+        (row.user_id, row.due_at.replace(tzinfo=pytz.UTC)) for row in rows
+    )
+
+
+async def reevaluation_sync_loop() -> None:
+    """Periodically pick up timers that other workers scheduled."""
+    while True:
+        await asyncio.sleep(REEVALUATION_SYNC_SECONDS)
+        try:
+            await restore_reevaluations(within=timedelta(seconds=2 * REEVALUATION_SYNC_SECONDS))
+        except Exception as e:
+            logger.error(f"Error loading scheduled re-evaluations: {e}")
+
+
+async def mark_reflections_due(timezone: str, fire_at: datetime) -> List[str]:
+    """Flag a timezone's Day-7 users at 09:00 local in one bulk UPDATE."""
+    async with AsyncSessionLocal() as db:
+        # `now` keeps a late (catch-up) dispatch to users still on that Day 7
+        user_ids = await StateRepository(db).mark_reflection_due(timezone, fire_at, now=datetime.now(pytz.UTC))
+        await db.commit()
+    return user_ids
+
+
+async def notify_reflections_due(user_ids: List[str]) -> None:
+    """Drop stale cached state and push the reflection prompt to connected clients."""
+    for user_id in user_ids:
+        state_cache.invalidate(user_id)
+    await push_relay.publish_many([(user_id, {"type": "reflection_due", "current_day": 7}) for user_id in user_ids])
+
+
+# Day-7 reflection at 09:00 local, one wakeup per timezone bucket
+reflection_dispatcher = ReflectionDispatcher(mark_reflections_due, notify=notify_reflections_due)
+
+
+async def load_reflection_zones() -> None:
+    """Track a reflection bucket for every timezone in use, catching up on today's."""
+    async with AsyncSessionLocal() as db:
+        timezones = (await db.scalars(select(User.timezone).distinct())).all()
+    reflection_dispatcher.add_zones(timezones, catch_up=True)
+
+
+# In-memory accelerated demo sessions (never touch the database)
+demo_sessions = DemoSessionManager()
+
+
 # Dependency injection
-def get_db():
-    """Get database session."""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """Get async database session."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-async def get_state_machine(user_id: str, db: Session) -> OmtobeStateMachine:
+async def get_state_machine(user_id: str, repo: StateRepository) -> LoadedState:
     """
-    Get or create state machine for user.
+    Load user and state machine, from the state cache when possible,
+    otherwise in one database round trip.
     
     Args:
         user_id: User identifier
-        db: Database session
+        repo: State repository bound to the request's session
         
     Returns:
-        OmtobeStateMachine: State machine instance
+        LoadedState: User row and hydrated state machine
     """
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    loaded = state_cache.get(user_id)
+    if loaded:
+        # Re-attach: the cached baseline may have been evicted since
+        loaded.state_machine.hrv_baseline = hrv_baselines.get(user_id)
+        return loaded
+    
+    loaded = await repo.load(user_id)
+    if not loaded:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get or create state machine state
-    state = db.query(StateMachineState).filter(
-        StateMachineState.user_id == user_id
-    ).first()
-    
-    if not state:
-        # Create new state
-        state = StateMachineState(
-            user_id=user_id,
-            cycle_start_date=datetime.now(pytz.UTC),
-            current_day=1,
-            cooling_period_active=0
-        )
-        db.add(state)
-        db.commit()
-    
-    # Initialize state machine
-    sm = OmtobeStateMachine(
-        user_id=user_id,
-        cycle_start_date=state.cycle_start_date,
-        timezone=user.timezone
-    )
+    loaded.state_machine.hrv_baseline = hrv_baselines.get(user_id)
+    if not loaded.is_new:
+        state_cache.put(user_id, loaded)
+    
+    return loaded
+
+
+async def with_current_state(user_id: str, db: AsyncSession, operation):
+    """
+    Run a state-changing operation, retrying it on fresh state if it was stale.
+    
+    The operation loads state (possibly a stale cached copy), applies its
+    change and saves. When the versioned save is rejected because another
+    request, worker or bulk UPDATE wrote first, the transaction is rolled
+    back, the cache entry dropped and the operation re-run against the
+    database row.
+    
+    Args:
+        user_id: User identifier
+        db: Async database session
+        operation: Coroutine function running one attempt
+        
+    Returns:
+        The operation's result
+        
+    Raises:
+        HTTPException: 409 if every attempt was stale
+    """
+    for attempt in range(STATE_WRITE_ATTEMPTS):
+        try:
+            return await operation()
+        except StaleStateError as e:
+            await db.rollback()
+            state_cache.invalidate(user_id)
+            logger.info(f"Retrying stale state write for {user_id} (attempt {attempt + 1}): {e}")
+    raise HTTPException(status_code=409, detail="State changed concurrently, please retry")
+
+
+def get_calendar_integration(user: User):
+    """
+    Calendar integration for a user from their integration provider.
+    
+    Args:
+        user: User row (for the OAuth token)
+        
+    Returns:
+        GoogleCalendarIntegration or MockGoogleCalendarIntegration
+    """
+    return integration_providers.resolve(user)[1]
+
+
+async def sync_calendar(user_id: str) -> None:
+    """
+    Delta-sync a user's calendar after a change notification.
+    
+    Args:
+        user_id: User identifier
+    """
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+    
+    if user is None:
+        return
+    
+    integration = get_calendar_integration(user)
+    if not isinstance(integration, GoogleCalendarIntegration):
+        return
+    
+    await integration.sync_event_index()
+    logger.info(f"Calendar delta sync for {user_id}")
+
+
+async def renew_calendar_channels() -> int:
+    """
+    Re-create push channels that are about to expire.
     
-    # Restore state
-    sm.cooling_period_active = bool(state.cooling_period_active)
-    sm.cooling_period_start = state.cooling_period_start
-    sm.decision_locked_for_event = state.decision_locked_for_event
-    sm.last_brake_display_time = state.last_brake_display_time
+    Each stored channel is claimed by deleting its row, so only one worker
+    renews it; the others drop it from their registry.
     
-    return sm
+    Returns:
+        int: Number of channels renewed
+    """
+    renewed = 0
+    for old in calendar_channels.channels_due_for_renewal():
+        if not await delete_calendar_channel(old.channel_id):
+            calendar_channels.remove(old.channel_id)
+            continue
+        channel = calendar_channels.renew(old.channel_id)
+        if channel is None:
+            continue
+        renewed += 1
+        
+        async with AsyncSessionLocal() as db:
+            user = await db.get(User, old.user_id)
+        integration = get_calendar_integration(user) if user is not None else None
+        is_google = isinstance(integration, GoogleCalendarIntegration)
+        
+        # Local channels have no upstream counterpart; only mock calendars keep one
+        if old.resource_id is None:
+            if user is None or is_google:
+                calendar_channels.remove(channel.channel_id)
+            else:
+                await persist_calendar_channel(channel)
+            continue
+        
+        if not is_google or not CALENDAR_WEBHOOK_URL:
+            calendar_channels.remove(channel.channel_id)
+            continue
+        
+        channel.resource_id = await integration.watch(
+            channel.channel_id, channel.token, CALENDAR_WEBHOOK_URL, channel.expiration
+        )
+        if channel.resource_id is None:
+            # Upstream refused: fall back to polling for this user
+            calendar_channels.remove(channel.channel_id)
+        else:
+            await persist_calendar_channel(channel)
+        await integration.stop_channel(old.channel_id, old.resource_id)
+    
+    return renewed
+
+
+async def calendar_renewal_loop() -> None:
+    """Periodically renew expiring calendar channels."""
+    while True:
+        await asyncio.sleep(CALENDAR_RENEWAL_INTERVAL_SECONDS)
+        try:
+            renewed = await renew_calendar_channels()
+            if renewed:
+                logger.info(f"Renewed {renewed} calendar channels")
+        except Exception as e:
+            logger.error(f"Error renewing calendar channels: {e}")
+
+
+async def token_refresh_loop() -> None:
+    """Periodically refresh access tokens nearing expiry."""
+    while True:
+        await asyncio.sleep(TOKEN_REFRESH_INTERVAL_SECONDS)
+        try:
+            refreshed = await token_manager.refresh_due()
+            if refreshed:
+                logger.info(f"Refreshed {refreshed} OAuth access tokens")
+        except Exception as e:
+            logger.error(f"Error refreshing OAuth tokens: {e}")
+
+
+async def roll_over_cycles(now: Optional[datetime] = None) -> int:
+    """
+    Start a new cycle for every user past Day 7, one chunked UPDATE at a time.
+
+    Users who skip reflection are otherwise never reset. Cycles advance by
+    whole 7-day periods, so chunks repeat until no cycle has ended. Each
+    chunk is its own transaction; cached state of rolled-over users is
+    dropped and their pending cooling-period timers cancelled.
+
+    Args:
+        now: Rollover instant (defaults to now)
+
+    Returns:
+        int: Number of users rolled over
+    """
+    now = now or datetime.now(pytz.UTC)
+    rolled = set()
+    while True:
+        async with AsyncSessionLocal() as db:
+            user_ids = await StateRepository(db).roll_over_cycles(now, CYCLE_ROLLOVER_CHUNK_SIZE)
+            if user_ids:
+                await db.execute(delete(ScheduledReevaluation).where(ScheduledReevaluation.user_id.in_(user_ids)))
+            await db.commit()
+        if not user_ids:
+            return len(rolled)
+        for user_id in set(user_ids) - rolled:
+            state_cache.invalidate(user_id)
+            await cooling_scheduler.cancel(user_id, stored=False)
+        rolled.update(user_ids)
+
+
+async def cycle_rollover_loop() -> None:
+    """Roll cycles over on startup and then at every 00:00 UTC."""
+    while True:
+        try:
+            rolled = await roll_over_cycles()
+            if rolled:
+                logger.info(f"Rolled over {rolled} cycles to Day 1")
+        except Exception as e:
+            logger.error(f"Error rolling over cycles: {e}")
+        now = datetime.now(pytz.UTC)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        await asyncio.sleep((midnight - now).total_seconds())
 
 
 # ============================================================================
@@ -118,7 +702,8 @@ async def health_check():
     return {
         "status": "healthy",
         "version": "0.1.0",
-        "timestamp": datetime.now(pytz.UTC).isoformat()
+        "timestamp": datetime.now(pytz.UTC).isoformat(),
+        "upstreams": upstream_metrics()
     }
 
 
@@ -127,7 +712,7 @@ async def create_user(
     user_id: str,
     email: str,
     timezone: str = "UTC",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create new user account.
@@ -136,13 +721,13 @@ async def create_user(
         user_id: Unique user identifier
         email: User email
         timezone: User's timezone (default: UTC)
-        db: Database session
+        db: Async database session
         
     Returns:
         dict: User information
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.id == user_id).first()
+    existing_user = await db.scalar(select(User).where(User.id == user_id))
     if existing_user:
         raise HTTPException(status_code=409, detail="User already exists")
     
@@ -153,7 +738,8 @@ async def create_user(
         timezone=timezone
     )
     db.add(user)
-    db.commit()
+    await db.commit()
+    reflection_dispatcher.add_zones([user.timezone])
     
     logger.info(f"Created user: {user_id}")
     
@@ -166,93 +752,115 @@ async def create_user(
 
 
 @app.post("/api/v1/state/check")
-async def check_brake_screen(
-    user_id: str,
-    db: Session = Depends(get_db)
-):
+async def check_brake_screen(user_id: str):
     """
     Check if Brake screen should be displayed.
     
     This endpoint:
     1. Fetches latest HRV data from HealthKit
     2. Fetches active high-stakes events from Google Calendar
+       (concurrently with 1, skipping fetches that can't change the decision)
     3. Runs state machine logic to determine if intervention needed
     
+    Concurrent checks for the same user (client retries, several devices)
+    share one in-flight evaluation and its response.
+    
     Args:
         user_id: User identifier
-        db: Database session
         
     Returns:
         dict: Brake screen display decision and event info
     """
-    try:
-        # Get state machine
-        sm = await get_state_machine(user_id, db)
-        
-        # Get user for API tokens
-        user = db.query(User).filter(User.id == user_id).first()
-        
-        # Initialize integrations (mock for MVP)
-        hrv_integration = MockHealthKitIntegration()
-        calendar_integration = MockGoogleCalendarIntegration()
-        
-        # Fetch HRV data
-        latest_hrv = await hrv_integration.get_latest_hrv()
-        if not latest_hrv:
-            return {
-                "should_display": False,
-                "reason": "No HRV data available",
-                "current_day": sm.current_day
-            }
-        
-        # Fetch 7-day baseline
-        baseline_samples = await hrv_integration.get_7day_baseline()
-        
-        # Fetch high-stakes events
-        active_events = await calendar_integration.get_active_high_stakes_events()
-        
-        # Check if Brake screen should display
-        should_display, event_id = sm.should_display_brake_screen(
-            current_hrv=latest_hrv.value,
-            calendar_events=active_events,
-            hrv_samples=baseline_samples
-        )
-        
-        # Update state in database
-        state = db.query(StateMachineState).filter(
-            StateMachineState.user_id == user_id
-        ).first()
-        
-        if state:
-            state.current_day = sm.current_day
-            state.cooling_period_active = int(sm.cooling_period_active)
-            state.cooling_period_start = sm.cooling_period_start
-            state.decision_locked_for_event = sm.decision_locked_for_event
-            state.last_brake_display_time = sm.last_brake_display_time
-            db.commit()
-        
-        logger.info(f"Brake check for {user_id}: should_display={should_display}")
+    return await brake_checks.do(user_id, lambda: run_brake_check(user_id))
+
+
+async def run_brake_check(user_id: str) -> dict:
+    """
+    Evaluate one brake check in its own database session.
+    
+    The session is not the request's: the evaluation may outlive the
+    request that started it when that client disconnects.
+    
+    Args:
+        user_id: User identifier
         
-        return {
-            "should_display": should_display,
-            "event_id": event_id,
-            "current_day": sm.current_day,
-            "phase": sm._get_phase_name(),
-            "hrv_current": latest_hrv.value,
-            "hrv_baseline_mean": sm.hrv_baseline_mean,
-            "timestamp": datetime.now(pytz.UTC).isoformat()
-        }
+    Returns:
+        dict: Brake screen display decision and event info
+    """
+    async with AsyncSessionLocal() as db:
+        return await _run_brake_check(user_id, db)
+
+
+async def _run_brake_check(user_id: str, db: AsyncSession) -> dict:
+    """Brake check body (see check_brake_screen)."""
+    try:
+        return await with_current_state(user_id, db, lambda: _evaluate_brake_check(user_id, db))
     
+    except HTTPException:
+        raise
     except Exception as e:
+        state_cache.invalidate(user_id)
         logger.error(f"Error checking brake screen: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _evaluate_brake_check(user_id: str, db: AsyncSession) -> dict:
+    """One brake check attempt (see with_current_state)."""
+    # Get user (for API tokens) and state machine
+    repo = StateRepository(db)
+    loaded = await get_state_machine(user_id, repo)
+    user, sm = loaded.user, loaded.state_machine
+    
+    # Initialize integrations (real, mock or replay per provider settings)
+    hrv_integration, calendar_integration = integration_providers.resolve(user)
+    
+    # Fetch HRV data, baseline and events concurrently
+    inputs = await BrakeCheckPipeline(hrv_integration, calendar_integration).fetch(sm)
+    latest_hrv = inputs.latest_hrv
+    if not latest_hrv:
+        if loaded.is_new:
+            await repo.save(loaded)
+            await db.commit()
+            state_cache.put(user_id, loaded)
+        return {
+            "should_display": False,
+            "reason": "No HRV data available",
+            "current_day": sm.current_day
+        }
+    
+    # Check if Brake screen should display (missing events count as none)
+    event_index = inputs.event_index
+    should_display, event_id = sm.should_display_brake_screen(
+        current_hrv=latest_hrv.value,
+        calendar_events=event_index if event_index is not None else [],
+        hrv_samples=inputs.baseline_samples
+    )
+    next_event_boundary = event_index.next_boundary(datetime.now(pytz.UTC)) if event_index else None
+    
+    # Update state in database (write through to cache)
+    await repo.save(loaded)
+    await db.commit()
+    state_cache.put(user_id, loaded)
+    
+    logger.info(f"Brake check for {user_id}: should_display={should_display}")
+    
+    return {
+        "should_display": should_display,
+        "event_id": event_id,
+        "current_day": sm.current_day,
+        "phase": sm._get_phase_name(),
+        "hrv_current": latest_hrv.value,
+        "hrv_baseline_mean": sm.hrv_baseline_mean,
+        "next_event_boundary": next_event_boundary.isoformat() if next_event_boundary else None,
+        "timestamp": datetime.now(pytz.UTC).isoformat()
+    }
+
+
 @app.post("/api/v1/decisions")
 async def record_decision(
     user_id: str,
     decision_type: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
     """
@@ -261,7 +869,7 @@ async def record_decision(
     Args:
         user_id: User identifier
         decision_type: "Proceed" or "Delay"
-        db: Database session
+        db: Async database session
         background_tasks: Background task queue
         
     Returns:
@@ -272,33 +880,40 @@ async def record_decision(
         if decision_type not in ["Proceed", "Delay"]:
             raise HTTPException(status_code=400, detail="Invalid decision type")
         
-        # Get state machine
-        sm = await get_state_machine(user_id, db)
-        
-        # Handle decision
         decision_enum = DecisionType.PROCEED if decision_type == "Proceed" else DecisionType.DELAY
-        result = sm.handle_brake_response(decision_enum)
-        
-        # Record decision in database
-        decision_log = DecisionLog(
-            user_id=user_id,
-            timestamp=datetime.now(pytz.UTC),
-            decision_type=decision_type,
-            day=sm.current_day
-        )
-        db.add(decision_log)
         
-        # Update state machine state
-        state = db.query(StateMachineState).filter(
-            StateMachineState.user_id == user_id
-        ).first()
+        async def apply_decision():
+            # Get state machine
+            repo = StateRepository(db)
+            loaded = await get_state_machine(user_id, repo)
+            sm = loaded.state_machine
+            
+            # Handle decision
+            result = sm.handle_brake_response(decision_enum)
+            
+            # Record decision in database
+            decision_log = DecisionLog(
+                user_id=user_id,
+                timestamp=datetime.utcnow(),
+                decision_type=decision_type,
+                day=sm.current_day
+            )
+            db.add(decision_log)
+            
+            # Update state machine state (write through to cache)
+            await repo.save(loaded)
+            await db.commit()
+            state_cache.put(user_id, loaded)
+            return sm, result
         
-        if state:
-            state.cooling_period_active = int(sm.cooling_period_active)
-            state.cooling_period_start = sm.cooling_period_start
-            state.decision_locked_for_event = sm.decision_locked_for_event
+        sm, result = await with_current_state(user_id, db, apply_decision)
         
-        db.commit()
+        # Re-evaluate server-side the moment the cooling period ends
+        if decision_enum == DecisionType.DELAY:
+            await cooling_scheduler.schedule(
+                user_id,
+                sm.cooling_period_start + timedelta(seconds=sm.COOLING_PERIOD_SECONDS)
+            )
         
         logger.info(f"Decision recorded for {user_id}: {decision_type}")
         
@@ -310,7 +925,10 @@ async def record_decision(
             "re_trigger_time": result.get("re_trigger_time")
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
+        state_cache.invalidate(user_id)
         logger.error(f"Error recording decision: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -319,7 +937,7 @@ async def record_decision(
 async def record_reflection(
     user_id: str,
     response: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Record user's reflection response on Day 7.
@@ -327,7 +945,7 @@ async def record_reflection(
     Args:
         user_id: User identifier
         response: "Yes", "No", or "Skip"
-        db: Database session
+        db: Async database session
         
     Returns:
         dict: Reflection recorded and cycle reset info
@@ -337,42 +955,40 @@ async def record_reflection(
         if response not in ["Yes", "No", "Skip"]:
             raise HTTPException(status_code=400, detail="Invalid reflection response")
         
-        # Get state machine
-        sm = await get_state_machine(user_id, db)
-        
-        # Check if it's Day 7
-        if sm.current_day != 7:
-            raise HTTPException(status_code=400, detail="Reflection only available on Day 7")
-        
-        # Handle reflection
-        response_enum = ReflectionResponse[response.upper()]
-        result = sm.handle_reflection_response(response_enum)
-        
-        # Record reflection in database
-        reflection_log = ReflectionLog(
-            user_id=user_id,
-            timestamp=datetime.now(pytz.UTC),
-            response=response,
-            cycle_start_date=sm.cycle_start_date
-        )
-        db.add(reflection_log)
-        
-        # Prepare for cycle reset
-        reset_result = sm.reset_cycle()
+        async def apply_reflection():
+            # Get state machine
+            repo = StateRepository(db)
+            loaded = await get_state_machine(user_id, repo)
+            sm = loaded.state_machine
+            
+            # Check if it's Day 7
+            if sm.current_day != 7:
+                raise HTTPException(status_code=400, detail="Reflection only available on Day 7")
+            
+            # Handle reflection
+            response_enum = ReflectionResponse[response.upper()]
+            sm.handle_reflection_response(response_enum)
+            
+            # Record reflection in database
+            reflection_log = ReflectionLog(
+                user_id=user_id,
+                timestamp=datetime.utcnow(),
+                response=response,
+                cycle_start_date=sm.cycle_start_date.astimezone(pytz.UTC).replace(tzinfo=None)
+            )
+            db.add(reflection_log)
+            
+            # Prepare for cycle reset
+            reset_result = sm.reset_cycle()
+            
+            # Update state machine state (write through to cache)
+            await repo.save(loaded)
+            await db.commit()
+            state_cache.put(user_id, loaded)
+            return reset_result
         
-        # Update state machine state
-        state = db.query(StateMachineState).filter(
-            StateMachineState.user_id == user_id
-        ).first()
-        
-        if state:
-            state.cycle_start_date = sm.cycle_start_date
-            state.current_day = sm.current_day
-            state.cooling_period_active = 0
-            state.cooling_period_start = None
-            state.decision_locked_for_event = None
-        
-        db.commit()
+        reset_result = await with_current_state(user_id, db, apply_reflection)
+        await cooling_scheduler.cancel(user_id)
         
         logger.info(f"Reflection recorded for {user_id}: {response}")
         
@@ -383,7 +999,10 @@ async def record_reflection(
             "cycle_reset": reset_result
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
+        state_cache.invalidate(user_id)
         logger.error(f"Error recording reflection: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -391,20 +1010,30 @@ async def record_reflection(
 @app.get("/api/v1/state")
 async def get_state(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get current state machine state for user.
     
     Args:
         user_id: User identifier
-        db: Database session
+        db: Async database session
         
     Returns:
         dict: Complete state information
     """
+    async def read_state():
+        repo = StateRepository(db)
+        loaded = await get_state_machine(user_id, repo)
+        
+        if loaded.is_new:
+            await repo.save(loaded)
+            await db.commit()
+            state_cache.put(user_id, loaded)
+        return loaded.state_machine
+    
     try:
-        sm = await get_state_machine(user_id, db)
+        sm = await with_current_state(user_id, db, read_state)
         
         return {
             "user_id": user_id,
@@ -412,16 +1041,40 @@ async def get_state(
             "timestamp": datetime.now(pytz.UTC).isoformat()
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting state: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/v1/state/stream")
+async def stream_state(user_id: str):
+    """
+    Server-Sent Events stream of pushed state for a user.
+    
+    Emits the brake re-evaluation at the end of each cooling period, so
+    clients don't poll while a Delay is pending, and the Day-7 reflection
+    prompt at 09:00 local time.
+    
+    Args:
+        user_id: User identifier
+        
+    Returns:
+        StreamingResponse: text/event-stream
+    """
+    return StreamingResponse(
+        sse_stream(push_hub.subscribe(user_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @app.get("/api/v1/decisions/history")
 async def get_decision_history(
     user_id: str,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get user's decision history.
@@ -429,15 +1082,18 @@ async def get_decision_history(
     Args:
         user_id: User identifier
         limit: Maximum number of records
-        db: Database session
+        db: Async database session
         
     Returns:
         dict: Decision history
     """
     try:
-        decisions = db.query(DecisionLog).filter(
-            DecisionLog.user_id == user_id
-        ).order_by(DecisionLog.timestamp.desc()).limit(limit).all()
+        decisions = (await db.scalars(
+            select(DecisionLog)
+            .where(DecisionLog.user_id == user_id)
+            .order_by(DecisionLog.timestamp.desc())
+            .limit(limit)
+        )).all()
         
         return {
             "user_id": user_id,
@@ -461,7 +1117,7 @@ async def get_decision_history(
 async def get_reflection_history(
     user_id: str,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get user's reflection history.
@@ -469,15 +1125,18 @@ async def get_reflection_history(
     Args:
         user_id: User identifier
         limit: Maximum number of records
-        db: Database session
+        db: Async database session
         
     Returns:
         dict: Reflection history
     """
     try:
-        reflections = db.query(ReflectionLog).filter(
-            ReflectionLog.user_id == user_id
-        ).order_by(ReflectionLog.timestamp.desc()).limit(limit).all()
+        reflections = (await db.scalars(
+            select(ReflectionLog)
+            .where(ReflectionLog.user_id == user_id)
+            .order_by(ReflectionLog.timestamp.desc())
+            .limit(limit)
+        )).all()
         
         return {
             "user_id": user_id,
@@ -497,6 +1156,357 @@ async def get_reflection_history(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class OAuthCredentialRequest(BaseModel):
+    """OAuth tokens from the client's authorization flow (sent in the body, not the URL)."""
+    refresh_token: str
+    access_token: Optional[str] = None
+    expires_in: Optional[float] = None  # Access-token lifetime in seconds
+
+
+@app.put("/api/v1/oauth/credentials")
+async def put_oauth_credentials(
+    user_id: str,
+    provider: str,
+    request: OAuthCredentialRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Store a user's OAuth credentials for a provider.
+    
+    Replaces any stored credentials; access tokens are then refreshed
+    automatically before they expire.
+    
+    Args:
+        user_id: User identifier
+        provider: "healthkit" or "google_calendar"
+        request: Refresh token and optional current access token
+        db: Async database session
+        
+    Returns:
+        dict: Stored credential metadata (no tokens)
+    """
+    if provider not in OAuthRefresher.TOKEN_URLS:
+        raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
+    if await db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    expires_at = time.time() + request.expires_in if request.access_token and request.expires_in else 0.0
+    credential = Credential(request.refresh_token, request.access_token, expires_at)
+    await save_oauth_credential(user_id, provider, credential)
+    token_manager.register(user_id, provider, credential.refresh_token, credential.access_token, expires_at)
+    
+    logger.info(f"Stored {provider} OAuth credentials for {user_id}")
+    
+    return {
+        "user_id": user_id,
+        "provider": provider,
+        "expires_at": datetime.fromtimestamp(expires_at, pytz.UTC).isoformat() if expires_at else None
+    }
+
+
+@app.put("/api/v1/integrations/provider")
+async def put_integration_provider(
+    user_id: str,
+    provider: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Pin a user to an integration provider.
+    
+    The pin is stored on the user row, so it survives restarts and applies
+    on every worker (on others once their cached state for the user expires).
+    
+    Args:
+        user_id: User identifier
+        provider: "real", "mock" or "replay" (omitted: back to the deployment default)
+        db: Async database session
+        
+    Returns:
+        dict: Provider now in effect
+    """
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    try:
+        integration_providers.set_override(user, provider)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
+    await db.commit()
+    state_cache.invalidate(user_id)
+    
+    logger.info(f"Integration provider for {user_id}: {integration_providers.provider_for(user)}")
+    
+    return {
+        "user_id": user_id,
+        "pinned": user.integration_provider,
+        "provider": integration_providers.provider_for(user)
+    }
+
+
+@app.post("/api/v1/calendar/watch")
+async def watch_calendar(
+    user_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Subscribe to change notifications for a user's calendar.
+    
+    With a Google Calendar token the channel is opened upstream, which
+    needs CALENDAR_WEBHOOK_URL (409 without it: nothing could push to the
+    channel, and the calendar keeps being polled). Mock calendars get a
+    local channel (driven by LocalCalendarNotifier in development).
+    
+    Args:
+        user_id: User identifier
+        db: Async database session
+        
+    Returns:
+        dict: Channel information
+    """
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    integration = get_calendar_integration(user)
+    is_google = isinstance(integration, GoogleCalendarIntegration)
+    if is_google and not CALENDAR_WEBHOOK_URL:
+        raise HTTPException(status_code=409, detail="Calendar push notifications are not configured")
+    
+    channel = calendar_channels.register(user_id)
+    if is_google:
+        channel.resource_id = await integration.watch(
+            channel.channel_id, channel.token, CALENDAR_WEBHOOK_URL, channel.expiration
+        )
+        if channel.resource_id is None:
+            calendar_channels.remove(channel.channel_id)
+            raise HTTPException(status_code=502, detail="Calendar watch request failed")
+    await persist_calendar_channel(channel)
+    
+    logger.info(f"Calendar channel {channel.channel_id} registered for {user_id}")
+    
+    return {
+        "user_id": user_id,
+        "channel_id": channel.channel_id,
+        "resource_id": channel.resource_id,
+        "expiration": channel.expiration.isoformat()
+    }
+
+
+@app.post("/api/v1/calendar/notifications")
+async def calendar_notification(
+    background_tasks: BackgroundTasks,
+    x_goog_channel_id: str = Header(...),
+    x_goog_resource_state: str = Header(...),
+    x_goog_channel_token: Optional[str] = Header(None)
+):
+    """
+    Webhook for Google Calendar change notifications.
+    
+    Marks the user's cached events dirty and schedules a delta sync, so
+    the next brake check reads the index without calling the Calendar API.
+    Channels registered by another worker are looked up in the database;
+    the change is recorded there for the other workers' caches.
+    
+    Args:
+        background_tasks: Background task queue
+        x_goog_channel_id: Channel the notification belongs to
+        x_goog_resource_state: "sync", "exists" or "not_exists"
+        x_goog_channel_token: Shared secret set when the channel was created
+        
+    Returns:
+        dict: Acknowledgement
+    """
+    if calendar_channels.get(x_goog_channel_id) is None:
+        channel = await load_calendar_channel(x_goog_channel_id)
+        if channel is not None:
+            calendar_channels.add(channel)
+    
+    try:
+        user_id = calendar_channels.handle_notification(
+            x_goog_channel_id, x_goog_channel_token, x_goog_resource_state
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown channel")
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Invalid channel token")
+    
+    if user_id:
+        await record_calendar_change(calendar_channels.get(x_goog_channel_id))
+        background_tasks.add_task(sync_calendar, user_id)
+    
+    return {"status": "accepted", "channel_id": x_goog_channel_id}
+
+
+# ============================================================================
+# DEMO SESSIONS
+# ============================================================================
+
+def get_demo_session(session_id: str) -> DemoSession:
+    """Live demo session, or 404."""
+    session = demo_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Demo session not found")
+    return session
+
+
+@app.post("/api/v1/demo/sessions")
+async def create_demo_session(
+    scenario: str = "steady",
+    speed: Optional[float] = None,
+    seed: int = 0,
+    auto_decision: Optional[str] = "Delay",
+    timezone: str = "UTC"
+):
+    """
+    Start an in-memory demo session with its own virtual clock.
+    
+    Args:
+        scenario: Synthetic HRV scenario ("steady", "acute_drop", "noisy", "sparse", "trend")
+        speed: Virtual seconds per real second (default: 7 days in 30 seconds)
+        seed: Seed for the synthetic HRV
+        auto_decision: "Proceed" or "Delay" applied after each Brake display, or empty to decide manually
+        timezone: Simulated user's timezone
+        
+    Returns:
+        dict: Session snapshot
+    """
+    if auto_decision and auto_decision not in ["Proceed", "Delay"]:
+        raise HTTPException(status_code=400, detail="Invalid decision type")
+    if speed is not None and speed <= 0:
+        raise HTTPException(status_code=400, detail="Speed must be positive")
+    
+    options = {"scenario": scenario, "seed": seed, "timezone": timezone}
+    options["auto_decision"] = DecisionType(auto_decision) if auto_decision else None
+    if speed is not None:
+        options["speed"] = speed
+    
+    try:
+        session = demo_sessions.create(**options)
+    except DemoLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except (KeyError, pytz.UnknownTimeZoneError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid demo option: {e}")
+    
+    logger.info(f"Created demo session: {session.session_id}")
+    return session.snapshot()
+
+
+@app.get("/api/v1/demo/state")
+async def get_demo_state(session_id: str):
+    """
+    Current state of a demo session (advanced to its virtual clock).
+    
+    Args:
+        session_id: Demo session identifier
+        
+    Returns:
+        dict: Session snapshot
+    """
+    session = get_demo_session(session_id)
+    demo_sessions.publish(session, session.advance())
+    return session.snapshot()
+
+
+@app.post("/api/v1/demo/fast-forward")
+async def fast_forward_demo(session_id: str, days: float = 0, hours: float = 0):
+    """
+    Jump a demo session's virtual clock ahead.
+    
+    Args:
+        session_id: Demo session identifier
+        days: Days to skip
+        hours: Hours to skip
+        
+    Returns:
+        dict: Transitions in the skipped time and the new snapshot
+    """
+    session = get_demo_session(session_id)
+    seconds = days * 86400 + hours * 3600
+    if seconds <= 0:
+        raise HTTPException(status_code=400, detail="Nothing to fast-forward")
+    
+    transitions = session.fast_forward(seconds)
+    demo_sessions.publish(session, transitions)
+    return {"transitions": transitions, "session": session.snapshot()}
+
+
+@app.post("/api/v1/demo/decisions")
+async def record_demo_decision(session_id: str, decision_type: str):
+    """
+    Respond to a demo Brake screen.
+    
+    Args:
+        session_id: Demo session identifier
+        decision_type: "Proceed" or "Delay"
+        
+    Returns:
+        dict: Transitions and the new snapshot
+    """
+    if decision_type not in ["Proceed", "Delay"]:
+        raise HTTPException(status_code=400, detail="Invalid decision type")
+    session = get_demo_session(session_id)
+    
+    transitions = session.decide(DecisionType(decision_type))
+    demo_sessions.publish(session, transitions)
+    return {"transitions": transitions, "session": session.snapshot()}
+
+
+@app.post("/api/v1/demo/reflections")
+async def record_demo_reflection(session_id: str, response: str):
+    """
+    Answer the demo Day-7 reflection and start a new cycle.
+    
+    Args:
+        session_id: Demo session identifier
+        response: "Yes", "No", or "Skip"
+        
+    Returns:
+        dict: Transitions and the new snapshot
+    """
+    if response not in ["Yes", "No", "Skip"]:
+        raise HTTPException(status_code=400, detail="Invalid reflection response")
+    session = get_demo_session(session_id)
+    
+    transitions = session.reflect(ReflectionResponse(response))
+    demo_sessions.publish(session, transitions)
+    return {"transitions": transitions, "session": session.snapshot()}
+
+
+@app.get("/api/v1/demo/stream")
+async def stream_demo(session_id: str):
+    """
+    Server-Sent Events stream of a demo session's state transitions.
+    
+    Args:
+        session_id: Demo session identifier
+        
+    Returns:
+        StreamingResponse: text/event-stream
+    """
+    get_demo_session(session_id)
+    return StreamingResponse(
+        sse_stream(demo_sessions.hub.subscribe(session_id), event="transition"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@app.delete("/api/v1/demo/sessions")
+async def delete_demo_session(session_id: str):
+    """
+    End a demo session.
+    
+    Args:
+        session_id: Demo session identifier
+        
+    Returns:
+        dict: Confirmation
+    """
+    if not demo_sessions.remove(session_id):
+        raise HTTPException(status_code=404, detail="Demo session not found")
+    return {"status": "deleted", "session_id": session_id}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -8,7 +8,7 @@ Principles:
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Enum, Integer, Float, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, Enum, Integer, Float, ForeignKey, Index, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import enum
@@ -25,6 +25,7 @@ class User(Base):
     timezone = Column(String(50), default="UTC")
     healthkit_token = Column(String(500), nullable=True)  # OAuth token for HealthKit
     calendar_token = Column(String(500), nullable=True)  # OAuth token for Google Calendar
+    integration_provider = Column(String(20), nullable=True)  # Pinned provider (None: deployment default)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -144,12 +145,109 @@ class StateMachineState(Base):
     cooling_period_start = Column(DateTime, nullable=True)
     decision_locked_for_event = Column(String(500), nullable=True)
     last_brake_display_time = Column(DateTime, nullable=True)
+    reflection_pending = Column(Integer, default=0)  # 0 or 1, set by the Day-7 dispatcher at 09:00 local
+    version = Column(Integer, nullable=False, default=0)  # Bumped by every write; saves are conditional on it
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Index for the Day-8 rollover scan
+    __table_args__ = (
+        Index("ix_state_cycle_start", "cycle_start_date"),
+    )
+    
     def __repr__(self):
         return f"<StateMachineState {self.user_id} day={self.current_day}>"
 
 
+class ScheduledReevaluation(Base):
+    """
+    Pending cooling-period re-evaluation (at most one per user).
+    
+    Written when a Delay starts a cooling period and deleted once the
+    re-evaluation has fired, so timers survive restarts.
+    """
+    __tablename__ = "scheduled_reevaluations"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String(255), ForeignKey("users.id"), nullable=False, unique=True)
+    due_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<ScheduledReevaluation {self.user_id} due={self.due_at}>"
+
+
+class PushMessage(Base):
+    """
+    Server push relayed between workers.
+    
+    A worker publishing a push (e.g. a cooling-period re-evaluation) stores
+    it here; the other workers poll for new rows and deliver them to the
+    clients connected to them. Rows are pruned after a short retention.
+    """
+    __tablename__ = "push_messages"
+    
+    id = Column(Integer, primary_key=True)
+    origin = Column(String(32), nullable=False)  # Publishing worker
+    user_id = Column(String(255), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f"<PushMessage {self.id} {self.user_id}>"
+
+
+class CalendarPushChannel(Base):
+    """
+    Google Calendar change-notification channel.
+    
+    Shared by all workers: any of them can validate a notification, and
+    changed_at tells the others that the user's cached events are stale.
+    Renewal deletes the row first, so only one worker renews a channel.
+    """
+    __tablename__ = "calendar_push_channels"
+    
+    id = Column(Integer, primary_key=True)
+    channel_id = Column(String(64), nullable=False, unique=True)
+    user_id = Column(String(255), ForeignKey("users.id"), nullable=False)
+    token = Column(String(100), nullable=False)  # Shared secret echoed by Google
+    resource_id = Column(String(255), nullable=True)  # None for local channels
+    expiration = Column(DateTime, nullable=False)
+    changed_at = Column(DateTime, nullable=True)  # Last accepted change notification
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_calendar_channel_updated", "updated_at"),
+    )
+    
+    def __repr__(self):
+        return f"<CalendarPushChannel {self.channel_id} {self.user_id}>"
+
+
+class OAuthCredential(Base):
+    """
+    OAuth credentials per user and provider.
+    
+    The refresh token is long-lived; the access token and its expiry are
+    rewritten by the token manager on every refresh.
+    """
+    __tablename__ = "oauth_credentials"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String(255), ForeignKey("users.id"), nullable=False)
+    provider = Column(String(50), nullable=False)  # "healthkit" or "google_calendar"
+    refresh_token = Column(String(500), nullable=False)
+    access_token = Column(String(2000), nullable=True)
+    expires_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_user_provider", "user_id", "provider", unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<OAuthCredential {self.user_id} {self.provider}>"
+
+
 # Enum definitions for type safety
 class DecisionTypeEnum(str, enum.Enum):
     PROCEED = "Proceed"
@@ -0,0 +1,185 @@
+"""
+Brake Check Pipeline for Omtobe MVP v0.1
+
+Fetches the brake inputs (latest HRV, 7-day baseline, high-stakes events)
+concurrently under one overall deadline, so check latency is roughly the
+slowest single upstream call instead of the sum of all three.
+
+Fetches whose result cannot change the decision are skipped or cancelled:
+- Nothing but the latest HRV is fetched outside the intervention window
+- The baseline is not re-fetched while the rolling baseline is fresh
+- The calendar fetch is cancelled once the HRV drop test has failed
+- Everything else is cancelled when no HRV data is available
+
+A fetch that raises is logged and treated like one that missed the
+deadline: its input is simply missing.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+import os
+from typing import List, Optional
+import pytz
+
+from calendar_index import HighStakesEventIndex
+from hrv_series import HRVSeries
+from state_machine import OmtobeStateMachine
+
+logger = logging.getLogger(__name__)
+
+# Pipeline configuration
+BRAKE_CHECK_DEADLINE_SECONDS = float(os.getenv("BRAKE_CHECK_DEADLINE_SECONDS", "8"))
+BASELINE_MAX_AGE_SECONDS = float(os.getenv("BASELINE_MAX_AGE_SECONDS", "300"))
+
+
+@dataclass
+class BrakeCheckInputs:
+    """Inputs gathered for one brake check."""
+    latest_hrv: Optional[object] = None  # HRVSample
+    baseline_samples: HRVSeries = field(default_factory=HRVSeries)
+    event_index: Optional[HighStakesEventIndex] = None
+    skipped: List[str] = field(default_factory=list)  # Fetches not needed for the decision
+    timed_out: List[str] = field(default_factory=list)  # Fetches cut off by the deadline
+    failed: List[str] = field(default_factory=list)  # Fetches that raised
+
+
+class BrakeCheckPipeline:
+    """Concurrent fetch of brake inputs with deadline and early cancellation."""
+
+    def __init__(
+        self,
+        hrv_integration,
+        calendar_integration,
+        deadline_seconds: float = BRAKE_CHECK_DEADLINE_SECONDS,
+        baseline_max_age_seconds: float = BASELINE_MAX_AGE_SECONDS
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            hrv_integration: HealthKit (or mock) integration
+            calendar_integration: Google Calendar (or mock) integration
+            deadline_seconds: Overall budget for all upstream fetches
+            baseline_max_age_seconds: Age below which the rolling baseline is reused
+        """
+        self.hrv_integration = hrv_integration
+        self.calendar_integration = calendar_integration
+        self.deadline_seconds = deadline_seconds
+        self.baseline_max_age_seconds = baseline_max_age_seconds
+
+    @staticmethod
+    def _needs_evaluation(sm: OmtobeStateMachine) -> bool:
+        """True if the brake decision depends on HRV/calendar inputs right now."""
+        if sm.current_day not in [3, 4, 5]:
+            return False
+        if sm.decision_locked_for_event:
+            return False
+        if sm.cooling_period_active and not sm._is_cooling_period_expired():
+            return False
+        return True
+
+    def _baseline_is_fresh(self, sm: OmtobeStateMachine, now: datetime) -> bool:
+        """True if the attached rolling baseline can be used without a fetch."""
+        baseline = sm.hrv_baseline
+        if baseline is None or not baseline.count or baseline.last_fetched_at is None:
+            return False
+        return (now - baseline.last_fetched_at).total_seconds() < self.baseline_max_age_seconds
+
+    @staticmethod
+    def _baseline_mean(sm: OmtobeStateMachine, samples: HRVSeries, fetched: bool = False) -> float:
+        """Baseline mean the state machine will use for these samples."""
+        if sm.hrv_baseline is not None:
+            return sm.hrv_baseline.update(samples, fetched=fetched)[0]
+        return sm._compute_hrv_baseline(samples)[0]
+
+    async def fetch(self, sm: OmtobeStateMachine) -> BrakeCheckInputs:
+        """
+        Gather the inputs for sm.should_display_brake_screen.
+
+        Args:
+            sm: Hydrated state machine for the user
+
+        Returns:
+            BrakeCheckInputs: Whatever was fetched before the deadline
+        """
+        inputs = BrakeCheckInputs()
+        now = datetime.now(pytz.UTC)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_seconds
+
+        tasks = {"latest_hrv": asyncio.ensure_future(self.hrv_integration.get_latest_hrv())}
+        if self._needs_evaluation(sm):
+            if self._baseline_is_fresh(sm, now):
+                inputs.skipped.append("baseline")
+            else:
+                tasks["baseline"] = asyncio.ensure_future(self.hrv_integration.get_7day_baseline())
+            tasks["events"] = asyncio.ensure_future(self.calendar_integration.sync_event_index())
+        else:
+            inputs.skipped.extend(["baseline", "events"])
+
+        baseline_mean: Optional[float] = (
+            self._baseline_mean(sm, HRVSeries()) if "baseline" in inputs.skipped and sm.hrv_baseline else None
+        )
+        pending = set(tasks.values())
+
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+
+                for name, task in tasks.items():
+                    if task not in done:
+                        continue
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"Brake check fetch {name} failed for {sm.user_id}: {e}")
+                        inputs.failed.append(name)
+                        continue
+                    if name == "latest_hrv":
+                        inputs.latest_hrv = result
+                    elif name == "baseline":
+                        inputs.baseline_samples = result
+                        baseline_mean = self._baseline_mean(sm, result, fetched=True)
+                    elif name == "events":
+                        inputs.event_index = result
+
+                # No HRV data: nothing else matters
+                if tasks["latest_hrv"].done() and inputs.latest_hrv is None:
+                    for name, task in tasks.items():
+                        if task in pending:
+                            inputs.skipped.append(name)
+                    break
+
+                # HRV drop test failed: the calendar cannot change the decision
+                events_task = tasks.get("events")
+                if (
+                    events_task in pending
+                    and inputs.latest_hrv is not None
+                    and baseline_mean is not None
+                    and not sm._is_hrv_drop_detected(inputs.latest_hrv.value, baseline_mean)
+                ):
+                    events_task.cancel()
+                    pending.discard(events_task)
+                    inputs.skipped.append("events")
+
+            # Whatever is still running has missed the deadline
+            for name, task in tasks.items():
+                if task in pending and name not in inputs.skipped:
+                    inputs.timed_out.append(name)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if inputs.timed_out:
+            logger.warning(f"Brake check for {sm.user_id} timed out waiting for: {inputs.timed_out}")
+
+        return inputs
@@ -0,0 +1,192 @@
+"""
+Integration Provider Registry for Omtobe MVP v0.1
+
+Chooses the HealthKit / Google Calendar integrations for a user:
+
+- real: HealthKitIntegration / GoogleCalendarIntegration using the user's
+  OAuth tokens; each falls back to its mock when the token is missing
+- mock: Synthetic data (see synthetic.py)
+- replay: The real integration code against recorded responses served from
+  REPLAY_FIXTURES_DIR (see replay.py), for offline benchmarking
+
+The deployment default comes from INTEGRATION_PROVIDER (default "real");
+individual users can be pinned to another provider with set_override(),
+which records the pin on the user row (users.integration_provider).
+"""
+
+from dataclasses import dataclass
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from calendar_cache import CalendarEventCache
+from hrv_store import HRVSampleStore
+from http_pool import HTTPClientPool
+from integrations import (
+    HealthKitIntegration,
+    GoogleCalendarIntegration,
+    MockHealthKitIntegration,
+    MockGoogleCalendarIntegration
+)
+from replay import ReplayTransport
+from resilience import Resilience
+from synthetic import LatencyModel
+from tokens import TokenManager
+
+REPLAY_TOKEN = "replay"
+
+
+@dataclass
+class ProviderContext:
+    """Shared resources handed to provider factories."""
+    http_pool: HTTPClientPool
+    sample_store: HRVSampleStore
+    event_cache: CalendarEventCache
+    calendar_latency: LatencyModel
+    token_manager: Optional[TokenManager] = None  # Auto-refreshed OAuth tokens
+
+
+# (user, context) -> (HRV integration, calendar integration)
+ProviderFactory = Callable[[Any, ProviderContext], Tuple[Any, Any]]
+
+
+def mock_provider(user, context: ProviderContext) -> Tuple[Any, Any]:
+    """Synthetic integrations."""
+    return (
+        MockHealthKitIntegration(user_id=user.id, sample_store=context.sample_store),
+        MockGoogleCalendarIntegration(latency=context.calendar_latency)
+    )
+
+
+def real_provider(user, context: ProviderContext) -> Tuple[Any, Any]:
+    """Upstream integrations for connected accounts, mocks otherwise."""
+    hrv_mock, calendar_mock = mock_provider(user, context)
+
+    manager = context.token_manager
+
+    hrv_integration = hrv_mock
+    if user.healthkit_token:
+        hrv_integration = HealthKitIntegration(
+            user.healthkit_token,
+            http_pool=context.http_pool,
+            user_id=user.id,
+            sample_store=context.sample_store,
+            token_source=manager.source(user.id, "healthkit", user.healthkit_token) if manager else None
+        )
+
+    calendar_integration = calendar_mock
+    if user.calendar_token:
+        calendar_integration = GoogleCalendarIntegration(
+            user.calendar_token,
+            http_pool=context.http_pool,
+            user_id=user.id,
+            event_cache=context.event_cache,
+            token_source=manager.source(user.id, "google_calendar", user.calendar_token) if manager else None,
+            timezone=user.timezone or "UTC"
+        )
+
+    return hrv_integration, calendar_integration
+
+
+class ReplayProvider:
+    """Real integrations wired to recorded responses on disk."""
+
+    def __init__(self, fixtures_dir: Optional[str] = None):
+        """
+        Initialize provider (the replay pool is created on first use).
+
+        Args:
+            fixtures_dir: Fixture root (defaults to REPLAY_FIXTURES_DIR)
+        """
+        self.fixtures_dir = fixtures_dir or os.getenv("REPLAY_FIXTURES_DIR", "fixtures")
+        self._pool: Optional[HTTPClientPool] = None
+        # Own policies: replayed traffic must not drain the shared rate limits or trip their circuits
+        self.healthkit_resilience = Resilience.from_env("healthkit")
+        self.calendar_resilience = Resilience.from_env("google_calendar")
+
+    @property
+    def pool(self) -> HTTPClientPool:
+        """Client pool whose transport serves the fixtures."""
+        if self._pool is None:
+            self._pool = HTTPClientPool(http2=False, transport=ReplayTransport(self.fixtures_dir))
+        return self._pool
+
+    def __call__(self, user, context: ProviderContext) -> Tuple[Any, Any]:
+        return (
+            HealthKitIntegration(
+                REPLAY_TOKEN, http_pool=self.pool, user_id=user.id, sample_store=context.sample_store,
+                resilience=self.healthkit_resilience
+            ),
+            GoogleCalendarIntegration(
+                REPLAY_TOKEN, http_pool=self.pool, user_id=user.id, event_cache=context.event_cache,
+                resilience=self.calendar_resilience, timezone=user.timezone or "UTC"
+            )
+        )
+
+    async def aclose(self) -> None:
+        """Close the replay pool and unmap fixtures."""
+        if self._pool is not None:
+            await self._pool.aclose()
+            await self._pool.transport.aclose()
+            self._pool = None
+
+
+class IntegrationProviderRegistry:
+    """Named integration providers with a deployment default and per-user pins."""
+
+    def __init__(self, context: ProviderContext, default: Optional[str] = None):
+        """
+        Initialize registry with the built-in providers.
+
+        Args:
+            context: Shared resources for the factories
+            default: Deployment default (defaults to INTEGRATION_PROVIDER or "real")
+        """
+        self.context = context
+        self.default = default or os.getenv("INTEGRATION_PROVIDER", "real")
+        self._factories: Dict[str, ProviderFactory] = {}
+
+        self.register("real", real_provider)
+        self.register("mock", mock_provider)
+        self.register("replay", ReplayProvider())
+
+    def register(self, name: str, factory: ProviderFactory) -> None:
+        """Add or replace a provider."""
+        self._factories[name] = factory
+
+    def set_override(self, user, name: Optional[str]) -> None:
+        """
+        Pin a user to a provider (None removes the pin).
+
+        Sets user.integration_provider; the caller commits the row.
+
+        Raises:
+            KeyError: Unknown provider
+        """
+        if name is not None and name not in self._factories:
+            raise KeyError(name)
+        user.integration_provider = name
+
+    def provider_for(self, user) -> str:
+        """Provider name in effect for a user."""
+        return user.integration_provider or self.default
+
+    def resolve(self, user) -> Tuple[Any, Any]:
+        """
+        Build the integrations for a user.
+
+        Args:
+            user: User row (id, OAuth tokens and provider pin)
+
+        Returns:
+            Tuple: (HRV integration, calendar integration)
+
+        Raises:
+            KeyError: The configured provider is not registered
+        """
+        return self._factories[self.provider_for(user)](user, self.context)
+
+    async def aclose(self) -> None:
+        """Release provider-owned resources."""
+        for factory in self._factories.values():
+            if hasattr(factory, "aclose"):
+                await factory.aclose()
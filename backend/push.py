@@ -0,0 +1,181 @@
+"""
+Push Hub for Omtobe MVP v0.1
+
+Fans server-side results (e.g. the brake re-evaluation at the end of a
+cooling period) out to the user's connected clients. Each subscriber gets a
+bounded queue; a client that stops reading loses the oldest messages rather
+than growing memory.
+
+PushHub only reaches clients connected to the same process. With several
+workers, PushRelay stores each push (e.g. in the push_messages table) and
+every worker polls for the others' pushes and delivers them locally.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 16
+RELAY_POLL_SECONDS = 1.0
+# Messages stored this long before the last poll are re-read (commit order, clock skew)
+RELAY_OVERLAP = timedelta(seconds=30)
+
+
+class PushHub:
+    """Per-user publish/subscribe over asyncio queues."""
+
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        """
+        Initialize hub.
+
+        Args:
+            queue_size: Messages buffered per subscriber
+        """
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscriber_count(self, user_id: str) -> int:
+        """Number of connected clients for a user."""
+        return len(self._subscribers.get(user_id, ()))
+
+    def publish(self, user_id: str, message: dict) -> int:
+        """
+        Deliver a message to every subscriber of a user.
+
+        Args:
+            user_id: User identifier
+            message: JSON-serializable payload
+
+        Returns:
+            int: Number of subscribers reached
+        """
+        queues = self._subscribers.get(user_id, ())
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+        return len(queues)
+
+    async def subscribe(self, user_id: str) -> AsyncIterator[dict]:
+        """
+        Yield messages for a user until the consumer stops.
+
+        Args:
+            user_id: User identifier
+
+        Yields:
+            dict: Published messages
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+
+class RelayedMessage(NamedTuple):
+    """Stored push as loaded by PushRelay."""
+    id: int
+    origin: str
+    user_id: str
+    message: dict
+    created_at: datetime  # Naive UTC
+
+
+class PushRelay:
+    """Delivers pushes to clients connected to any worker."""
+
+    def __init__(
+        self,
+        hub: PushHub,
+        origin: str,
+        store: Callable[[str, List[Tuple[str, dict]]], Awaitable[None]],
+        load: Callable[[datetime], Awaitable[List[RelayedMessage]]],
+        poll_seconds: float = RELAY_POLL_SECONDS
+    ):
+        """
+        Initialize relay.
+
+        Args:
+            hub: This worker's hub
+            origin: This worker's ID
+            store: Stores (user_id, message) pairs published by `origin`
+            load: Stored messages created after a (naive UTC) time, oldest first
+            poll_seconds: Interval between polls for other workers' messages
+        """
+        self.hub = hub
+        self.origin = origin
+        self.store = store
+        self.load = load
+        self.poll_seconds = poll_seconds
+        self.loaded_until: datetime = datetime.utcnow()
+        self._seen: Dict[int, datetime] = {}  # Delivered IDs inside the overlap
+
+    async def publish(self, user_id: str, message: dict) -> int:
+        """Push one message (see publish_many)."""
+        return await self.publish_many([(user_id, message)])
+
+    async def publish_many(self, messages: List[Tuple[str, dict]]) -> int:
+        """
+        Deliver to this worker's clients now and store for the other workers.
+
+        Args:
+            messages: (user_id, message) pairs
+
+        Returns:
+            int: Local subscribers reached
+        """
+        if not messages:
+            return 0
+        delivered = sum(self.hub.publish(user_id, message) for user_id, message in messages)
+        try:
+            await self.store(self.origin, messages)
+        except Exception as e:
+            logger.error(f"Storing {len(messages)} push messages failed: {e}")
+        return delivered
+
+    async def poll(self) -> int:
+        """
+        Deliver messages other workers stored since the previous poll.
+
+        Returns:
+            int: Messages delivered
+        """
+        rows = await self.load(self.loaded_until - RELAY_OVERLAP)
+        delivered = 0
+        for row in rows:
+            self.loaded_until = max(self.loaded_until, row.created_at)
+            if row.id in self._seen:
+                continue
+            self._seen[row.id] = row.created_at
+            if row.origin != self.origin:
+                self.hub.publish(row.user_id, row.message)
+                delivered += 1
+        horizon = self.loaded_until - RELAY_OVERLAP
+        self._seen = {id_: created_at for id_, created_at in self._seen.items() if created_at >= horizon}
+        return delivered
+
+    async def run(self) -> None:
+        """Poll until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Loading relayed push messages failed: {e}")
+
+
+async def sse_stream(messages: AsyncIterator[dict], event: str = "state") -> AsyncIterator[str]:
+    """Format messages as Server-Sent Events."""
+    async for message in messages:
+        yield f"event: {event}\ndata: {json.dumps(message, default=str)}\n\n"
@@ -0,0 +1,191 @@
+"""
+Day-7 Reflection Dispatcher for Omtobe MVP v0.1
+
+Surfaces the Day-7 reflection at 09:00 local time without relying on a
+client poll landing in that hour. Users are bucketed by timezone; each
+bucket's next 09:00 local instant is precomputed and kept in a min-heap, and
+the dispatcher wakes once per bucket to mark every user of that zone who is
+on Day 7 at that instant in one bulk UPDATE.
+
+A few hundred zones means a few hundred wakeups a day, independent of the
+number of users. A worker that starts after a zone's 09:00 catches up on
+that day's instant, so users already on Day 7 are not left unmarked until the
+next cycle.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import heapq
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import pytz
+
+from state_machine import OmtobeStateMachine
+
+logger = logging.getLogger(__name__)
+
+
+def next_reflection_instant(
+    timezone: str,
+    after: datetime,
+    hour: int = OmtobeStateMachine.REFLECTION_HOUR
+) -> datetime:
+    """
+    Next local `hour`:00 strictly after a given instant.
+
+    Args:
+        timezone: IANA timezone name
+        after: Reference instant (timezone-aware)
+        hour: Local hour to fire at
+
+    Returns:
+        datetime: Fire instant in UTC
+
+    Raises:
+        pytz.UnknownTimeZoneError: Invalid timezone name
+    """
+    tz = pytz.timezone(timezone)
+    local_date = after.astimezone(tz).date()
+    while True:
+        naive = datetime(local_date.year, local_date.month, local_date.day, hour)
+        # is_dst=False resolves the (rare) fold or gap at that hour deterministically
+        fire_at = tz.localize(naive, is_dst=False).astimezone(pytz.UTC)
+        if fire_at > after:
+            return fire_at
+        local_date += timedelta(days=1)
+
+
+class ReflectionDispatcher:
+    """Per-timezone 09:00 wakeups marking Day-7 users in bulk."""
+
+    def __init__(
+        self,
+        mark: Callable[[str, datetime], Awaitable[List[str]]],
+        notify: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+        hour: int = OmtobeStateMachine.REFLECTION_HOUR
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            mark: Marks a zone's Day-7 users at a fire instant, returns their IDs
+            notify: Called with the marked user IDs of each bucket
+            hour: Local hour at which reflection is surfaced
+        """
+        self.mark = mark
+        self.notify = notify
+        self.hour = hour
+        self._heap: List[Tuple[float, str]] = []
+        self._fire_at: Dict[str, float] = {}  # timezone -> next fire epoch
+        self._wakeup = asyncio.Event()
+        self.wakeups = 0
+        self.marked = 0
+
+    def __len__(self) -> int:
+        return len(self._fire_at)
+
+    def fire_at(self, timezone: str) -> Optional[float]:
+        """Next fire instant (epoch) of a timezone bucket, if tracked."""
+        return self._fire_at.get(timezone)
+
+    def _push(self, timezone: str, after: datetime) -> None:
+        self._push_at(timezone, next_reflection_instant(timezone, after, self.hour))
+
+    def _push_at(self, timezone: str, fire_time: datetime) -> None:
+        fire_at = fire_time.timestamp()
+        self._fire_at[timezone] = fire_at
+        heapq.heappush(self._heap, (fire_at, timezone))
+        self._wakeup.set()
+
+    def add_zones(
+        self,
+        timezones: Iterable[str],
+        now: Optional[datetime] = None,
+        catch_up: bool = False
+    ) -> int:
+        """
+        Start tracking timezone buckets (already tracked ones are kept).
+
+        Args:
+            timezones: IANA timezone names
+            now: Reference instant (defaults to now)
+            catch_up: Fire the latest instant of the past 24 hours right
+                away (worker startup), instead of waiting for the next one
+
+        Returns:
+            int: Number of new buckets
+        """
+        now = now or datetime.now(pytz.UTC)
+        added = 0
+        for timezone in timezones:
+            if not timezone or timezone in self._fire_at:
+                continue
+            try:
+                last = next_reflection_instant(timezone, now - timedelta(days=1), self.hour)
+                if catch_up and last <= now:
+                    self._push_at(timezone, last)
+                else:
+                    self._push(timezone, now)
+                added += 1
+            except pytz.UnknownTimeZoneError:
+                logger.warning(f"Skipping unknown timezone for reflection dispatch: {timezone}")
+        return added
+
+    def pop_due(self, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Remove and return the buckets whose fire instant has passed.
+
+        Args:
+            now: Reference epoch (defaults to now)
+
+        Returns:
+            List[Tuple[str, float]]: (timezone, fire epoch), earliest first
+        """
+        now = now if now is not None else time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, timezone = heapq.heappop(self._heap)
+            if self._fire_at.get(timezone) == fire_at:
+                due.append((timezone, fire_at))
+        return due
+
+    async def dispatch(self, timezone: str, fire_at: float) -> List[str]:
+        """
+        Mark a bucket's Day-7 users and schedule the bucket's next day.
+
+        Args:
+            timezone: Bucket timezone
+            fire_at: Fire instant (epoch) being dispatched
+
+        Returns:
+            List[str]: Newly marked user IDs
+        """
+        fire_time = datetime.fromtimestamp(fire_at, pytz.UTC)
+        self._push(timezone, fire_time)
+        self.wakeups += 1
+
+        user_ids = await self.mark(timezone, fire_time)
+        self.marked += len(user_ids)
+        if user_ids and self.notify:
+            await self.notify(user_ids)
+        return user_ids
+
+    async def run(self) -> None:
+        """Dispatch buckets as they come due (runs until cancelled)."""
+        while True:
+            self._wakeup.clear()
+            for timezone, fire_at in self.pop_due():
+                try:
+                    user_ids = await self.dispatch(timezone, fire_at)
+                    logger.info(f"Reflection due for {len(user_ids)} users in {timezone}")
+                except Exception as e:
+                    logger.error(f"Reflection dispatch failed for {timezone}: {e}")
+
+            next_fire = self._heap[0][0] if self._heap else None
+            timeout = None if next_fire is None else max(0.0, next_fire - time.time())
+            try:
+                # Woken early when a new timezone bucket is added
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
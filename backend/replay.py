@@ -0,0 +1,130 @@
+"""
+Recorded-Response Replay Transport for Omtobe MVP v0.1
+
+An httpx transport that answers HealthKit / Google Calendar requests from
+response bodies recorded on disk, so the real integration code (streaming
+parse, pagination, sync tokens, pooling, caching) can be benchmarked
+offline at production payload sizes.
+
+Fixture layout (one JSON body per file):
+
+    <root>/<host>/<path>.json              e.g. api.healthkit.apple.com/v1/samples.json
+    <root>/<host>/<path>.<token>.json      served when pageToken / syncToken == <token>
+
+Bodies are memory-mapped and streamed in chunks, so large fixtures are
+not read into memory up front; each request copies one CHUNK_SIZE slice
+of the mapping at a time (httpx byte streams yield bytes).
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+import httpx
+
+# Query parameters that select a token-specific fixture
+_TOKEN_PARAMS = ("pageToken", "syncToken")
+
+CHUNK_SIZE = 64 * 1024
+
+
+def fixture_path(root: Path, url: httpx.URL, token: Optional[str] = None) -> Path:
+    """
+    Path of the fixture for a request URL.
+
+    Args:
+        root: Fixture root directory
+        url: Request URL
+        token: Page/sync token selecting a specific fixture
+
+    Returns:
+        Path: <root>/<host>/<path>[.<token>].json
+    """
+    path = url.path.strip("/") or "index"
+    suffix = f".{token}.json" if token else ".json"
+    return Path(root) / url.host / (path + suffix)
+
+
+def write_fixture(root: Path, url: str, payload, token: Optional[str] = None) -> Path:
+    """
+    Record a response body as a fixture.
+
+    Args:
+        root: Fixture root directory
+        url: Request URL the body answers
+        payload: JSON-serializable body
+        token: Page/sync token the body answers
+
+    Returns:
+        Path: Written fixture
+    """
+    path = fixture_path(root, httpx.URL(url), token)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    return path
+
+
+class _MappedStream(httpx.AsyncByteStream):
+    """Streams a memory-mapped file, copying one chunk at a time."""
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for offset in range(0, len(self._mapped), CHUNK_SIZE):
+            yield self._mapped[offset:offset + CHUNK_SIZE]
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serves recorded responses from a fixture directory."""
+
+    def __init__(self, root: os.PathLike):
+        """
+        Initialize transport.
+
+        Args:
+            root: Fixture root directory
+        """
+        self.root = Path(root)
+        self._maps: Dict[Path, mmap.mmap] = {}
+        self.requests = 0
+
+    def _map(self, path: Path) -> Optional[mmap.mmap]:
+        """Memory-map a fixture once and keep it mapped."""
+        mapped = self._maps.get(path)
+        if mapped is None:
+            if not path.is_file() or path.stat().st_size == 0:
+                return None
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[path] = mapped
+        return mapped
+
+    def _resolve(self, request: httpx.Request) -> Optional[mmap.mmap]:
+        """Token-specific fixture if present, otherwise the plain one."""
+        for name in _TOKEN_PARAMS:
+            token = request.url.params.get(name)
+            if token:
+                mapped = self._map(fixture_path(self.root, request.url, token))
+                if mapped is not None:
+                    return mapped
+        return self._map(fixture_path(self.root, request.url))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        mapped = self._resolve(request)
+        if mapped is None:
+            return httpx.Response(404, json={"error": {"code": 404, "message": "No recorded response"}})
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "application/json", "Content-Length": str(len(mapped))},
+            stream=_MappedStream(mapped)
+        )
+
+    async def aclose(self) -> None:
+        """Unmap all fixtures."""
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
@@ -0,0 +1,264 @@
+"""
+State Repository for Omtobe MVP v0.1
+
+Loads a user together with their state machine state in one joined query and
+persists state changes with a single UPSERT, so each endpoint does at most one
+read and one write round trip for state.
+
+Every write bumps the row's version and the UPSERT only applies when the row
+still has the version that was loaded, so a stale copy (cached, or loaded
+before another worker's write or a bulk UPDATE) can never overwrite newer
+state; save() raises StaleStateError instead.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+import pytz
+from sqlalchemy import String, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from clock import Clock, SYSTEM_CLOCK
+from models import User, StateMachineState
+from state_machine import OmtobeStateMachine
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Attach UTC to naive datetimes read back from the database."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=pytz.UTC)
+    return value
+
+
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC for the DateTime columns (asyncpg rejects aware values)."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(pytz.UTC).replace(tzinfo=None)
+    return value
+
+
+def dialect_insert(db: AsyncSession, model):
+    """Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL / SQLite)."""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+class StaleStateError(Exception):
+    """The state row changed since it was loaded."""
+
+
+@dataclass
+class LoadedState:
+    """User row plus hydrated state machine."""
+    user: User
+    state_machine: OmtobeStateMachine
+    is_new: bool  # True if no state row existed yet (not persisted until save)
+    version: int = 0  # Row version the state machine was loaded at
+
+
+class StateRepository:
+    """Joined load and UPSERT persistence of per-user state machine state."""
+
+    def __init__(self, db: AsyncSession, clock: Clock = SYSTEM_CLOCK):
+        """
+        Initialize repository.
+
+        Args:
+            db: Async database session
+            clock: Time source for loaded state machines
+        """
+        self.db = db
+        self.clock = clock
+
+    async def load(self, user_id: str) -> Optional[LoadedState]:
+        """
+        Load user and state in a single joined SELECT.
+
+        A fresh Day 1 state machine is returned when the user has no state
+        row yet; it is written by the next save().
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Optional[LoadedState]: Loaded state, or None if the user doesn't exist
+        """
+        result = await self.db.execute(
+            select(User, StateMachineState)
+            .outerjoin(StateMachineState, StateMachineState.user_id == User.id)
+            .where(User.id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+
+        user, state = row
+        if state is None:
+            sm = OmtobeStateMachine(
+                user_id=user_id,
+                cycle_start_date=self.clock.now(),
+                timezone=user.timezone,
+                clock=self.clock
+            )
+            return LoadedState(user=user, state_machine=sm, is_new=True)
+
+        sm = OmtobeStateMachine(
+            user_id=user_id,
+            cycle_start_date=_as_utc(state.cycle_start_date),
+            timezone=user.timezone,
+            clock=self.clock
+        )
+        sm.cooling_period_active = bool(state.cooling_period_active)
+        sm.cooling_period_start = _as_utc(state.cooling_period_start)
+        sm.decision_locked_for_event = state.decision_locked_for_event
+        sm.last_brake_display_time = _as_utc(state.last_brake_display_time)
+        sm.reflection_pending = bool(state.reflection_pending)
+        sm.refresh_day()  # A flag left over from a skipped reflection lapses after Day 7
+
+        return LoadedState(user=user, state_machine=sm, is_new=False, version=state.version)
+
+    async def save(self, loaded: LoadedState) -> None:
+        """
+        Persist state machine state with one INSERT ... ON CONFLICT UPDATE.
+
+        The update only applies if the row is still at `loaded.version`;
+        on success `loaded` is advanced to the new version. Does not commit;
+        callers commit together with any log rows.
+
+        Args:
+            loaded: Loaded state whose state machine to persist
+
+        Raises:
+            StaleStateError: The row was written since it was loaded
+        """
+        sm = loaded.state_machine
+        locked = sm.decision_locked_for_event
+        if isinstance(locked, datetime):
+            locked = locked.isoformat()
+
+        values = {
+            "cycle_start_date": _as_naive_utc(sm.cycle_start_date),
+            "current_day": sm.current_day,
+            "cooling_period_active": int(sm.cooling_period_active),
+            "cooling_period_start": _as_naive_utc(sm.cooling_period_start),
+            "decision_locked_for_event": locked,
+            "last_brake_display_time": _as_naive_utc(sm.last_brake_display_time),
+            "reflection_pending": int(sm.reflection_pending),
+            "version": loaded.version + 1,
+            "updated_at": datetime.utcnow(),
+        }
+        statement = dialect_insert(self.db, StateMachineState).values(user_id=sm.user_id, **values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[StateMachineState.user_id],
+            set_=values,
+            where=StateMachineState.version == loaded.version
+        ).returning(StateMachineState.version)
+        version = await self.db.scalar(statement)
+        if version is None:
+            raise StaleStateError(f"State of {sm.user_id} changed since version {loaded.version}")
+        loaded.version = version
+        loaded.is_new = False
+
+    async def mark_reflection_due(
+        self,
+        timezone: str,
+        fire_at: datetime,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Flag every user of a timezone who is on Day 7 at an instant.
+
+        One set-based UPDATE for the whole timezone bucket; users already
+        flagged are left alone. Does not commit.
+
+        Args:
+            timezone: Users' timezone
+            fire_at: Reflection instant (09:00 local)
+            now: When set, only users still on that Day 7 at `now` are
+                flagged (a late, catch-up dispatch of a past instant)
+
+        Returns:
+            List[str]: Newly flagged user IDs
+        """
+        # Day 7 at fire_at <=> 6 <= whole days elapsed < 7
+        fire_at = _as_naive_utc(fire_at)
+        cycle_after = max(fire_at, _as_naive_utc(now) or fire_at) - timedelta(days=7)
+        statement = (
+            update(StateMachineState)
+            .where(
+                StateMachineState.user_id.in_(select(User.id).where(User.timezone == timezone)),
+                StateMachineState.cycle_start_date > cycle_after,
+                StateMachineState.cycle_start_date <= fire_at - timedelta(days=6),
+                StateMachineState.reflection_pending == 0
+            )
+            .values(
+                reflection_pending=1,
+                current_day=7,
+                version=StateMachineState.version + 1,
+                updated_at=datetime.utcnow()
+            )
+            .returning(StateMachineState.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return list((await self.db.scalars(statement)).all())
+
+    def _plus_cycle(self):
+        """cycle_start_date one 7-day period later, as a SQL expression."""
+        column = StateMachineState.cycle_start_date
+        if self.db.bind.dialect.name == "postgresql":
+            return column + timedelta(days=7)
+        # SQLite stores "YYYY-MM-DD HH:MM:SS.ffffff"; datetime() drops the fraction
+        return func.datetime(column, "+7 days", type_=String) + func.substr(column, 20)
+
+    async def roll_over_cycles(self, now: datetime, limit: int) -> List[str]:
+        """
+        Advance up to `limit` ended cycles by one 7-day period.
+
+        One set-based UPDATE over the oldest ended cycles (by the
+        cycle_start_date index). Each new cycle starts exactly where the old
+        one ended, so the day count continues without repeating Day 1;
+        users more than one period behind are picked up again by the next
+        call. Cooling, lock and reflection fields are cleared as in
+        reset_cycle. Safe to run from several workers at once: the ended
+        condition is repeated on the UPDATE itself. Does not commit.
+
+        Args:
+            now: Rollover instant
+            limit: Maximum rows per statement
+
+        Returns:
+            List[str]: Advanced user IDs (empty once no cycle has ended)
+        """
+        now = _as_naive_utc(now)
+        cutoff = now - timedelta(days=7)
+        ended = (
+            select(StateMachineState.id)
+            .where(StateMachineState.cycle_start_date <= cutoff)
+            .order_by(StateMachineState.cycle_start_date)
+            .limit(limit)
+        )
+        statement = (
+            update(StateMachineState)
+            .where(
+                StateMachineState.id.in_(ended.scalar_subquery()),
+                # Re-checked on the locked row (PostgreSQL READ COMMITTED), so a
+                # concurrent worker's rollover of the same rows is not applied twice
+                StateMachineState.cycle_start_date <= cutoff
+            )
+            .values(
+                cycle_start_date=self._plus_cycle(),
+                current_day=1,
+                cooling_period_active=0,
+                cooling_period_start=None,
+                decision_locked_for_event=None,
+                last_brake_display_time=None,
+                reflection_pending=0,
+                version=StateMachineState.version + 1,
+                updated_at=datetime.utcnow()
+            )
+            .returning(StateMachineState.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return list((await self.db.scalars(statement)).all())
@@ -0,0 +1,384 @@
+"""
+Upstream Resilience Layer for Omtobe MVP v0.1
+
+Wraps calls to an upstream provider (HealthKit, Google Calendar) with:
+- Token-bucket rate limiting (per provider, shared by all requests)
+- A circuit breaker that fails fast while the provider is down
+- Bounded retries with full-jitter exponential backoff for transport
+  errors, timeouts, 429 and 5xx responses
+- Optional hedging: a second request is raced against a slow first one
+- A per-attempt timeout covering the whole attempt (including a hedge),
+  taken from the HTTP client pool's per-host timeout of each request
+- Counters for monitoring
+
+Configuration (environment, per provider prefix e.g. UPSTREAM_HEALTHKIT_):
+- RATE: Requests per second (default 20)
+- BURST: Bucket capacity (default 40)
+- ATTEMPTS: Attempts per call including the first (default 3)
+- ATTEMPT_TIMEOUT: Cap in seconds per attempt (default: the request's
+  per-host timeout, see http_pool.HTTP_HOST_TIMEOUTS)
+- FAILURE_THRESHOLD: Consecutive failures that open the circuit (default 5)
+- RESET_TIMEOUT: Seconds the circuit stays open before a probe (default 30)
+- HEDGE_AFTER: Seconds before a hedged request is sent (default off)
+"""
+
+import asyncio
+from dataclasses import dataclass, asdict
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, Union
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class UpstreamUnavailable(Exception):
+    """Raised without calling the provider (circuit open)."""
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    """The provider's circuit is open."""
+
+
+class TokenBucket:
+    """Token-bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize bucket (starts full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> float:
+        """
+        Take a token, waiting for one if necessary.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while not self.try_acquire():
+            delay = (1 - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+
+def _timeout_seconds(timeout: Union[httpx.Timeout, float, None]) -> Optional[float]:
+    """Overall budget of an httpx timeout (its longest configured phase)."""
+    if isinstance(timeout, httpx.Timeout):
+        phases = [value for value in (timeout.connect, timeout.read, timeout.write, timeout.pool) if value is not None]
+        return max(phases) if phases else None
+    return timeout
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize breaker (closed).
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds before an open circuit lets a probe through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """True if a call may be made now."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+
+        if self.state == self.HALF_OPEN:
+            # One probe at a time
+            if self._probing:
+                return False
+            self._probing = True
+
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def release(self) -> None:
+        """End a call without an upstream verdict (e.g. cancelled): free the probe, count nothing."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure; open the circuit at the threshold or on a failed probe."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+
+@dataclass
+class ResilienceMetrics:
+    """Per-provider counters."""
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0  # Calls that failed after all attempts
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0  # Hedged request answered first
+    short_circuits: int = 0  # Calls refused by the open circuit
+    rate_limit_wait_seconds: float = 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        """Counters as a plain dict."""
+        return asdict(self)
+
+
+class Resilience:
+    """Resilience policy for one upstream provider."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = 20.0,
+        burst: float = 40.0,
+        max_attempts: int = 3,
+        attempt_timeout: Optional[float] = None,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        hedge_after: Optional[float] = None
+    ):
+        """
+        Initialize policy.
+
+        Args:
+            name: Provider name (for logs)
+            rate: Requests per second
+            burst: Rate limiter capacity
+            max_attempts: Attempts per call including the first
+            attempt_timeout: Cap in seconds per attempt, including a hedge
+                (None: only the request's own timeout passed to call())
+            base_delay: First backoff ceiling in seconds
+            max_delay: Backoff ceiling in seconds
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open
+            hedge_after: Seconds before a hedged request is sent (None disables)
+        """
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_attempts = max_attempts
+        self.attempt_timeout = attempt_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_after = hedge_after
+        self.metrics = ResilienceMetrics()
+
+    @classmethod
+    def from_env(cls, name: str) -> "Resilience":
+        """Build a policy from UPSTREAM_<NAME>_* environment variables."""
+        prefix = f"UPSTREAM_{name.upper()}_"
+        hedge_after = os.getenv(prefix + "HEDGE_AFTER")
+        attempt_timeout = os.getenv(prefix + "ATTEMPT_TIMEOUT")
+        return cls(
+            name,
+            rate=float(os.getenv(prefix + "RATE", "20")),
+            burst=float(os.getenv(prefix + "BURST", "40")),
+            max_attempts=int(os.getenv(prefix + "ATTEMPTS", "3")),
+            attempt_timeout=float(attempt_timeout) if attempt_timeout else None,
+            failure_threshold=int(os.getenv(prefix + "FAILURE_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv(prefix + "RESET_TIMEOUT", "30")),
+            hedge_after=float(hedge_after) if hedge_after else None
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before the given retry (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def _is_retryable(response: httpx.Response) -> bool:
+        return response.status_code in RETRYABLE_STATUS_CODES
+
+    def _attempt_timeout(self, timeout: Union[httpx.Timeout, float, None]) -> Optional[float]:
+        """Seconds per attempt: the request's timeout, capped by the policy's."""
+        budgets = [value for value in (_timeout_seconds(timeout), self.attempt_timeout) if value is not None]
+        return min(budgets) if budgets else None
+
+    async def _send(self, request: Callable[[], Awaitable[httpx.Response]], timeout: Optional[float]) -> httpx.Response:
+        """One request bounded by the attempt timeout."""
+        try:
+            return await asyncio.wait_for(request(), timeout)
+        except asyncio.TimeoutError:
+            raise httpx.TimeoutException(f"{self.name}: attempt timed out after {timeout}s")
+
+    async def _attempt(
+        self,
+        request: Callable[[], Awaitable[httpx.Response]],
+        timeout: Optional[float]
+    ) -> httpx.Response:
+        """One attempt, hedged when the first request is slow."""
+        first = asyncio.ensure_future(self._send(request, timeout))
+        if self.hedge_after is None:
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+        if done or not self.bucket.try_acquire():
+            return await first
+
+        self.metrics.hedges += 1
+        hedge = asyncio.ensure_future(self._send(request, timeout))
+        winner = None
+        pending = {first, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # Prefer a usable answer; fall back to the last one to finish
+                    if task.exception() is None and not self._is_retryable(task.result()):
+                        if task is hedge:
+                            self.metrics.hedge_wins += 1
+                        winner = task
+                        return task.result()
+                    if not pending:
+                        winner = task
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Release the losing response (streamed bodies hold a connection)
+            for task in (first, hedge):
+                if task is not winner and task.done() and not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+
+    async def call(
+        self,
+        request: Callable[[], Awaitable[httpx.Response]],
+        timeout: Union[httpx.Timeout, float, None] = None
+    ) -> httpx.Response:
+        """
+        Send a request under the policy.
+
+        Args:
+            request: Zero-argument coroutine function issuing the (idempotent) request
+            timeout: The request's timeout (e.g. HTTPClientPool.timeout_for its
+                URL); bounds each attempt, including a hedge
+
+        Returns:
+            httpx.Response: First non-retryable response (may be a 4xx)
+
+        Raises:
+            CircuitOpenError: Provider circuit is open
+            httpx.HTTPError: Transport error, timeout or retryable status after the last attempt
+        """
+        self.metrics.calls += 1
+        attempt_timeout = self._attempt_timeout(timeout)
+
+        for attempt in range(1, self.max_attempts + 1):
+            # Waiting for a token is the caller's time, not the upstream's: outside the breaker
+            self.metrics.rate_limit_wait_seconds += await self.bucket.acquire()
+            if not self.breaker.allow():
+                self.metrics.short_circuits += 1
+                self.metrics.failures += 1
+                raise CircuitOpenError(f"{self.name} circuit open")
+
+            try:
+                response = await self._attempt(request, attempt_timeout)
+                if not self._is_retryable(response):
+                    self.breaker.record_success()
+                    self.metrics.successes += 1
+                    return response
+                error: Exception = httpx.HTTPStatusError(
+                    f"{self.name} returned {response.status_code}",
+                    request=response.request,
+                    response=response
+                )
+                await response.aclose()
+            except httpx.TransportError as e:
+                # Includes attempt timeouts (httpx.TimeoutException)
+                error = e
+            except asyncio.CancelledError:
+                # The caller gave up (cancelled, or its own wait_for expired): not an upstream failure
+                self.breaker.release()
+                raise
+            except BaseException:
+                # Unexpected (e.g. a bug in the request callable): fail the call, not the upstream
+                self.breaker.release()
+                self.metrics.failures += 1
+                raise
+
+            self.breaker.record_failure()
+            if attempt == self.max_attempts:
+                break
+
+            self.metrics.retries += 1
+            delay = self._backoff(attempt)
+            logger.info(f"{self.name} attempt {attempt} failed ({error}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        self.metrics.failures += 1
+        raise error
+
+
+_policies: Dict[str, Resilience] = {}
+
+
+def upstream(name: str) -> Resilience:
+    """
+    Shared policy for a provider (created from the environment on first use).
+
+    Args:
+        name: Provider name, e.g. "healthkit" or "google_calendar"
+
+    Returns:
+        Resilience: Process-wide policy for that provider
+    """
+    policy = _policies.get(name)
+    if policy is None:
+        policy = Resilience.from_env(name)
+        _policies[name] = policy
+    return policy
+
+
+def upstream_metrics() -> Dict[str, Dict[str, float]]:
+    """Metrics of every provider policy created so far."""
+    return {name: {**policy.metrics.snapshot(), "circuit": policy.breaker.state}
+            for name, policy in _policies.items()}
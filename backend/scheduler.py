@@ -0,0 +1,180 @@
+"""
+Cooling-Period Re-Trigger Scheduler for Omtobe MVP v0.1
+
+Server-side timers for the 20-minute Delay re-trigger. Each Delay schedules
+one re-evaluation of the user's brake condition at exactly
+cooling_period_start + COOLING_PERIOD_SECONDS; the result is pushed to the
+client instead of the client polling until the cooling period expires.
+
+Timers live in a min-heap keyed by due time. A user has at most one pending
+timer: rescheduling or cancelling leaves the old heap entry in place and it
+is skipped when popped (lazy deletion). Persistence is delegated to
+callbacks so pending timers survive restarts.
+
+With several workers every worker may hold the same timer (restore() loads
+the stored ones); a claim callback (e.g. DELETE ... RETURNING on the stored
+row) decides which worker fires it, and a timer cancelled or moved elsewhere
+fails the claim and is skipped.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+TimeLike = Union[datetime, float]
+
+
+def _to_epoch(value: TimeLike) -> float:
+    """Convert a datetime or epoch value to epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class CoolingPeriodScheduler:
+    """Min-heap timer queue firing one callback per due user."""
+
+    def __init__(
+        self,
+        fire: Callable[[str], Awaitable[None]],
+        persist: Optional[Callable[[str, float], Awaitable[None]]] = None,
+        remove: Optional[Callable[[str], Awaitable[None]]] = None,
+        claim: Optional[Callable[[str], Awaitable[bool]]] = None
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            fire: Called with the user ID when their timer is due
+            persist: Stores (user_id, due epoch) when a timer is scheduled
+            remove: Deletes a user's stored timer once fired or cancelled
+            claim: Takes a user's stored timer before firing if it is due;
+                returns False if it is gone (fired, moved or cancelled elsewhere)
+        """
+        self.fire = fire
+        self.persist = persist
+        self.remove = remove
+        self.claim = claim
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}  # user_id -> live due time
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._tasks = set()
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def due_at(self, user_id: str) -> Optional[float]:
+        """Pending due time (epoch) for a user, if any."""
+        return self._due.get(user_id)
+
+    def _push(self, user_id: str, due: float) -> None:
+        self._due[user_id] = due
+        heapq.heappush(self._heap, (due, next(self._sequence), user_id))
+        self._wakeup.set()
+
+    def restore(self, timers: Iterable[Tuple[str, TimeLike]]) -> None:
+        """
+        Load persisted timers (overdue ones fire on the next run pass).
+
+        Args:
+            timers: (user_id, due) pairs
+        """
+        for user_id, due in timers:
+            due = _to_epoch(due)
+            if self._due.get(user_id) != due:
+                self._push(user_id, due)
+
+    async def schedule(self, user_id: str, due: TimeLike) -> None:
+        """
+        Schedule (or move) a user's re-evaluation.
+
+        Args:
+            user_id: User identifier
+            due: When to fire
+        """
+        due = _to_epoch(due)
+        self._push(user_id, due)
+        if self.persist:
+            await self.persist(user_id, due)
+
+    async def cancel(self, user_id: str, stored: bool = True) -> None:
+        """
+        Drop a user's pending timer.
+
+        Args:
+            user_id: User identifier
+            stored: Also delete the stored timer, which may have been
+                scheduled by another worker (False if the caller already did)
+        """
+        self._due.pop(user_id, None)
+        if stored and self.remove:
+            await self.remove(user_id)
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """
+        Remove and return the users whose timers are due.
+
+        Args:
+            now: Reference epoch (defaults to now)
+
+        Returns:
+            List[str]: Due user IDs, earliest first
+        """
+        now = now if now is not None else time.time()
+        due_users = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, user_id = heapq.heappop(self._heap)
+            # Skip entries superseded by a reschedule or cancel
+            if self._due.get(user_id) == due:
+                del self._due[user_id]
+                due_users.append(user_id)
+        return due_users
+
+    def next_due(self) -> Optional[float]:
+        """Earliest live due time."""
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def _fire(self, user_id: str) -> None:
+        if self.claim is not None:
+            try:
+                if not await self.claim(user_id):
+                    return
+            except Exception as e:
+                logger.error(f"Claiming cooling-period re-evaluation failed for {user_id}: {e}")
+                return
+        try:
+            await self.fire(user_id)
+            self.fired += 1
+        except Exception as e:
+            logger.error(f"Cooling-period re-evaluation failed for {user_id}: {e}")
+        finally:
+            # A claimed timer's stored row is already gone
+            if self.claim is None and self.remove and user_id not in self._due:
+                await self.remove(user_id)
+
+    async def run(self) -> None:
+        """Fire timers as they come due (runs until cancelled)."""
+        while True:
+            self._wakeup.clear()
+            for user_id in self.pop_due():
+                task = asyncio.ensure_future(self._fire(user_id))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            next_due = self.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - time.time())
+            try:
+                # Woken early when an earlier timer is scheduled
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,82 @@
+"""
+Schema Upgrade for Omtobe MVP v0.1
+
+`Base.metadata.create_all` creates missing tables but never alters existing
+ones. On startup, upgrade_schema() adds the columns and indexes that models
+gained since a database was created, so existing SQLite / PostgreSQL
+databases keep working without a separate migration step.
+
+Every worker runs this at import time. On PostgreSQL the whole upgrade runs
+under a transaction-scoped advisory lock, so concurrent boots apply the DDL
+one at a time and later workers inspect the already-upgraded tables.
+
+Only additive changes are handled: new nullable columns, or columns with a
+scalar default (used to backfill existing rows), and new indexes.
+"""
+
+import logging
+from typing import List
+from sqlalchemy import Column, inspect, text
+from sqlalchemy.engine import Engine
+
+from models import Base
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key serializing schema upgrades across workers
+SCHEMA_LOCK_KEY = 0x6F6D746F
+
+
+def _add_column_ddl(engine: Engine, table_name: str, column: Column) -> str:
+    """ALTER TABLE statement adding a model column."""
+    preparer = engine.dialect.identifier_preparer
+    ddl = (
+        f"ALTER TABLE {preparer.quote(table_name)} "
+        f"ADD COLUMN {preparer.quote(column.name)} {column.type.compile(engine.dialect)}"
+    )
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is not None:
+        ddl += f" DEFAULT {default!r}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    return ddl
+
+
+def upgrade_schema(engine: Engine) -> List[str]:
+    """
+    Create missing tables, then add missing columns and indexes to existing ones.
+
+    Args:
+        engine: Sync engine
+
+    Returns:
+        List[str]: Applied changes, e.g. "state_machine_states.reflection_pending"
+    """
+    applied = []
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        Base.metadata.create_all(bind=conn)
+
+        # Inspect through the locked connection so a worker that waited on
+        # the lock sees the changes the previous one committed
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    conn.execute(text(_add_column_ddl(engine, table.name, column)))
+                    applied.append(f"{table.name}.{column.name}")
+
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+                    applied.append(f"{table.name}:{index.name}")
+
+    for change in applied:
+        logger.info(f"Schema upgraded: {change}")
+    return applied
@@ -0,0 +1,61 @@
+"""
+Single-Flight Request Coalescing for Omtobe MVP v0.1
+
+Concurrent calls for the same key share one in-flight execution and its
+result (or exception). Used so that client retries and multiple devices
+checking the same user at once trigger one set of upstream calls instead
+of one per request.
+
+The shared call runs in its own task: a caller that is cancelled (e.g. the
+client disconnected) does not cancel the work the other callers wait on.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Per-key coalescing of concurrent async calls."""
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0  # Executions started
+        self.shared = 0  # Callers that joined an existing execution
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless a call for key is already in flight, then share its outcome.
+
+        Args:
+            key: Coalescing key (e.g. user ID)
+            fn: Zero-argument coroutine function performing the work
+
+        Returns:
+            Any: Result of the (possibly shared) execution
+
+        Raises:
+            Exception: Whatever the shared execution raised
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(fn())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._forget(key, flight))
+            self.calls += 1
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(flight)
+
+    def _forget(self, key: Hashable, flight: asyncio.Future) -> None:
+        """Drop a finished flight so the next call starts fresh."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Consume the exception when every caller was cancelled
+        if not flight.cancelled():
+            flight.exception()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """True while a call for key is running."""
+        return key in self._flights
@@ -0,0 +1,137 @@
+"""
+In-Process State Cache for Omtobe MVP v0.1
+
+LRU + TTL cache of hydrated state machines keyed by user ID. Endpoints that
+change state write through to it after committing, so the 60-second
+GET /api/v1/state polls are served from memory for most users.
+
+Entries are copied in and out, so each request mutates its own state machine.
+A cached copy may be stale (another worker, a bulk UPDATE); writes from it
+are rejected by the repository's version check and retried from the database.
+"""
+
+from collections import OrderedDict
+import copy
+from dataclasses import replace
+import os
+import sys
+import time
+from typing import Optional
+
+from repository import LoadedState
+
+# Cache configuration
+STATE_CACHE_TTL_SECONDS = float(os.getenv("STATE_CACHE_TTL_SECONDS", "300"))
+STATE_CACHE_MAX_BYTES = int(os.getenv("STATE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+def _copy(loaded: LoadedState) -> LoadedState:
+    """Entry with its own state machine (the rolling HRV baseline stays shared)."""
+    return replace(loaded, state_machine=copy.copy(loaded.state_machine), is_new=False)
+
+
+def _estimate_size(loaded: LoadedState) -> int:
+    """
+    Rough memory footprint of a cached entry.
+
+    Counts the state machine's own attributes and the user's column values;
+    the shared rolling HRV baseline is owned elsewhere and excluded.
+    """
+    sm = loaded.state_machine
+    size = sys.getsizeof(sm) + sys.getsizeof(sm.__dict__)
+    for name, value in sm.__dict__.items():
+        if name != "hrv_baseline":
+            size += sys.getsizeof(value)
+    for column in loaded.user.__table__.columns:
+        size += sys.getsizeof(getattr(loaded.user, column.key, None))
+    return size
+
+
+class StateMachineCache:
+    """Bounded LRU cache with per-entry expiry."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = STATE_CACHE_TTL_SECONDS,
+        max_bytes: int = STATE_CACHE_MAX_BYTES
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: Seconds an entry stays valid after it was stored
+            max_bytes: Approximate memory budget for all entries
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple[float, int, LoadedState]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated bytes currently held."""
+        return self._bytes
+
+    def get(self, user_id: str) -> Optional[LoadedState]:
+        """
+        Get a copy of a cached state machine.
+
+        The cycle day is recomputed on every hit so a cached entry never
+        reports a stale day across midnight.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Optional[LoadedState]: Copy of the cached entry, or None on miss/expiry
+        """
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, loaded = entry
+        if time.monotonic() >= expires_at:
+            self.invalidate(user_id)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        loaded = _copy(loaded)
+        loaded.state_machine.refresh_day()
+        return loaded
+
+    def put(self, user_id: str, loaded: LoadedState) -> None:
+        """
+        Store (or refresh) a state machine after it was persisted.
+
+        Args:
+            user_id: User identifier
+            loaded: User row and state machine as written to the database
+        """
+        self.invalidate(user_id)
+        loaded = _copy(loaded)
+        size = _estimate_size(loaded)
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, size, loaded)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's entry (e.g. after a failed write)."""
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._bytes = 0
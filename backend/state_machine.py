@@ -9,11 +9,17 @@ Core Logic:
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass
 import pytz
 
+from calendar_index import HighStakesEventIndex, event_start_epoch, event_end_epoch
+from clock import Clock, SYSTEM_CLOCK
+from high_stakes import TRIGGER_KEYWORDS as HIGH_STAKES_KEYWORDS, high_stakes_classifier
+from hrv_baseline import RollingHRVBaseline
+from hrv_series import HRVSeries
+
 
 class DecisionType(str, Enum):
     """Decision types recorded in the system."""
@@ -42,6 +48,14 @@ class CalendarEvent:
     start_time: datetime
     end_time: datetime
     is_high_stakes: bool  # True if contains trigger keywords or '!' prefix
+    start_epoch: Optional[float] = None  # Epoch seconds (derived from start_time if omitted)
+    end_epoch: Optional[float] = None
+    
+    def __post_init__(self):
+        if self.start_epoch is None:
+            self.start_epoch = self.start_time.timestamp()
+        if self.end_epoch is None:
+            self.end_epoch = self.end_time.timestamp()
 
 
 @dataclass
@@ -71,12 +85,18 @@ class OmtobeStateMachine:
     - Persistence: Only timestamp + decision_type (no content logging)
     """
     
-    TRIGGER_KEYWORDS = {"board", "negotiation", "review", "high-stakes"}
+    TRIGGER_KEYWORDS = set(HIGH_STAKES_KEYWORDS)
     HRV_THRESHOLD_PERCENT = 0.20  # 20% drop threshold
     COOLING_PERIOD_SECONDS = 1200  # 20 minutes
     REFLECTION_HOUR = 9  # 09:00 AM local time
     
-    def __init__(self, user_id: str, cycle_start_date: Optional[datetime] = None, timezone: str = "UTC"):
+    def __init__(
+        self,
+        user_id: str,
+        cycle_start_date: Optional[datetime] = None,
+        timezone: str = "UTC",
+        clock: Optional[Clock] = None
+    ):
         """
         Initialize state machine for a user.
         
@@ -84,19 +104,35 @@ class OmtobeStateMachine:
             user_id: Unique user identifier
             cycle_start_date: Start of current 7-day cycle (defaults to now)
             timezone: User's timezone for reflection timing
+            clock: Time source (defaults to wall-clock time)
         """
         self.user_id = user_id
-        self.cycle_start_date = cycle_start_date or datetime.now(pytz.UTC)
+        self.clock = clock or SYSTEM_CLOCK
+        self.cycle_start_date = cycle_start_date or self.clock.now()
         self.timezone = pytz.timezone(timezone)
         
         # State tracking
         self.current_day = self._calculate_day()
         self.hrv_baseline_mean: Optional[float] = None
         self.hrv_baseline_std_dev: Optional[float] = None
+        self.hrv_baseline: Optional[RollingHRVBaseline] = None  # Persistent rolling accumulator
         self.cooling_period_active = False
         self.cooling_period_start: Optional[datetime] = None
         self.decision_locked_for_event: Optional[str] = None  # Event ID
         self.last_brake_display_time: Optional[datetime] = None
+        self.reflection_pending = False  # Marked by the reflection dispatcher
+    
+    def refresh_day(self) -> int:
+        """
+        Recompute the cycle day; a pending reflection lapses once Day 7 is over.
+        
+        Returns:
+            int: Day number (1-7)
+        """
+        self.current_day = self._calculate_day()
+        if self.current_day != 7:
+            self.reflection_pending = False
+        return self.current_day
     
     def _calculate_day(self) -> int:
         """
@@ -105,7 +141,7 @@ class OmtobeStateMachine:
         Returns:
             int: Day number (1-7)
         """
-        now = datetime.now(pytz.UTC)
+        now = self.clock.now()
         days_elapsed = (now - self.cycle_start_date).days
         day = (days_elapsed % 7) + 1
         return day
@@ -124,24 +160,14 @@ class OmtobeStateMachine:
         Returns:
             bool: True if event is high-stakes
         """
-        title_lower = event.title.lower()
-        
-        # Check for trigger keywords
-        if any(keyword in title_lower for keyword in self.TRIGGER_KEYWORDS):
-            return True
-        
-        # Check for "!" prefix
-        if event.title.startswith("!"):
-            return True
-        
-        return False
+        return high_stakes_classifier.is_high_stakes(event.title, getattr(event, "event_id", None))
     
-    def _compute_hrv_baseline(self, hrv_samples: List[HRVSample]) -> Tuple[float, float]:
+    def _compute_hrv_baseline(self, hrv_samples: Union[HRVSeries, List[HRVSample]]) -> Tuple[float, float]:
         """
         Compute 7-day rolling baseline mean and std dev.
         
         Args:
-            hrv_samples: List of HRV samples from past 7 days
+            hrv_samples: HRV series (or list of samples) from past 7 days
             
         Returns:
             Tuple[float, float]: (mean, std_dev)
@@ -149,6 +175,9 @@ class OmtobeStateMachine:
         if not hrv_samples:
             return 0.0, 0.0
         
+        if isinstance(hrv_samples, HRVSeries):
+            return hrv_samples.mean_std()
+        
         values = [sample.value for sample in hrv_samples]
         mean = sum(values) / len(values)
         
@@ -175,24 +204,40 @@ class OmtobeStateMachine:
         threshold = baseline_mean * (1 - self.HRV_THRESHOLD_PERCENT)
         return current_hrv <= threshold
     
+    def build_event_index(self, calendar_events: List[CalendarEvent]) -> HighStakesEventIndex:
+        """
+        Build an interval index over the high-stakes subset of the events.
+        
+        Args:
+            calendar_events: List of calendar events
+            
+        Returns:
+            HighStakesEventIndex: Index answering active-event queries in O(log n)
+        """
+        return HighStakesEventIndex(calendar_events, is_high_stakes=self._is_high_stakes_event)
+    
     def _is_active_high_stakes_event(
         self,
-        calendar_events: List[CalendarEvent],
+        calendar_events: Union[HighStakesEventIndex, List[CalendarEvent]],
         current_time: datetime
     ) -> Optional[CalendarEvent]:
         """
         Check if any high-stakes event is currently active.
         
         Args:
-            calendar_events: List of calendar events
+            calendar_events: Prebuilt event index, or list of calendar events
             current_time: Current time
             
         Returns:
             Optional[CalendarEvent]: Active high-stakes event, or None
         """
+        if isinstance(calendar_events, HighStakesEventIndex):
+            return calendar_events.active_at(current_time)
+        
+        now = current_time.timestamp()
         for event in calendar_events:
             if self._is_high_stakes_event(event):
-                if event.start_time <= current_time <= event.end_time:
+                if event_start_epoch(event) <= now <= event_end_epoch(event):
                     return event
         
         return None
@@ -200,8 +245,8 @@ class OmtobeStateMachine:
     def should_display_brake_screen(
         self,
         current_hrv: float,
-        calendar_events: List[CalendarEvent],
-        hrv_samples: List[HRVSample]
+        calendar_events: Union[HighStakesEventIndex, List[CalendarEvent]],
+        hrv_samples: Union[HRVSeries, List[HRVSample]]
     ) -> Tuple[bool, Optional[str]]:
         """
         Determine if Brake screen should be displayed.
@@ -214,8 +259,8 @@ class OmtobeStateMachine:
         
         Args:
             current_hrv: Current HRV sample
-            calendar_events: List of calendar events
-            hrv_samples: Historical HRV samples for baseline
+            calendar_events: High-stakes event index, or list of calendar events
+            hrv_samples: Historical HRV series (or list of samples) for baseline
             
         Returns:
             Tuple[bool, Optional[str]]: (should_display, event_id)
@@ -237,8 +282,11 @@ class OmtobeStateMachine:
             if self.decision_locked_for_event:
                 return False, None
             
-            # Compute HRV baseline
-            baseline_mean, baseline_std_dev = self._compute_hrv_baseline(hrv_samples)
+            # Compute HRV baseline (incrementally when a rolling accumulator is attached)
+            if self.hrv_baseline is not None:
+                baseline_mean, baseline_std_dev = self.hrv_baseline.update(hrv_samples, now=self.clock.now())
+            else:
+                baseline_mean, baseline_std_dev = self._compute_hrv_baseline(hrv_samples)
             self.hrv_baseline_mean = baseline_mean
             self.hrv_baseline_std_dev = baseline_std_dev
             
@@ -248,12 +296,12 @@ class OmtobeStateMachine:
             # Check for active high-stakes event
             active_event = self._is_active_high_stakes_event(
                 calendar_events,
-                datetime.now(pytz.UTC)
+                self.clock.now()
             )
             
             # Both conditions must be true
             if hrv_drop_detected and active_event:
-                self.last_brake_display_time = datetime.now(pytz.UTC)
+                self.last_brake_display_time = self.clock.now()
                 return True, active_event.title
         
         # Day 6 and 7: No intervention
@@ -263,7 +311,8 @@ class OmtobeStateMachine:
         """
         Determine if reflection screen should be displayed on Day 7.
         
-        Displays at 09:00 AM local time.
+        Displays from 09:00 AM local time: once the reflection dispatcher has
+        marked the user, or during that hour if it hasn't run yet.
         
         Args:
             user_timezone: User's timezone string
@@ -274,9 +323,12 @@ class OmtobeStateMachine:
         if self.current_day != 7:
             return False
         
+        if self.reflection_pending:
+            return True
+        
         # Get current time in user's timezone
         tz = pytz.timezone(user_timezone)
-        now_local = datetime.now(tz)
+        now_local = self.clock.now(tz)
         
         # Check if current hour is 9 AM
         return now_local.hour == self.REFLECTION_HOUR
@@ -291,7 +343,7 @@ class OmtobeStateMachine:
         Returns:
             Dict: State update information
         """
-        timestamp = datetime.now(pytz.UTC)
+        timestamp = self.clock.now()
         
         if response == DecisionType.DELAY:
             # Activate cooling period
@@ -330,7 +382,7 @@ class OmtobeStateMachine:
         if not self.cooling_period_start:
             return False
         
-        elapsed = (datetime.now(pytz.UTC) - self.cooling_period_start).total_seconds()
+        elapsed = (self.clock.now() - self.cooling_period_start).total_seconds()
         return elapsed >= self.COOLING_PERIOD_SECONDS
     
     def handle_reflection_response(self, response: ReflectionResponse) -> Dict:
@@ -345,7 +397,7 @@ class OmtobeStateMachine:
         Returns:
             Dict: Reflection log and reset information
         """
-        timestamp = datetime.now(pytz.UTC)
+        timestamp = self.clock.now()
         
         # Calculate next cycle start (Day 8, 00:00 UTC)
         next_cycle_start = (self.cycle_start_date + timedelta(days=7)).replace(
@@ -363,21 +415,25 @@ class OmtobeStateMachine:
             "message": "Cycle will reset to Day 1 at next 00:00 UTC"
         }
     
-    def reset_cycle(self) -> Dict:
+    def reset_cycle(self, cycle_start_date: Optional[datetime] = None) -> Dict:
         """
         Reset state machine to Day 1 of new cycle.
         
         Called automatically at Day 8, 00:00 UTC.
         
+        Args:
+            cycle_start_date: Start of the new cycle (defaults to now)
+        
         Returns:
             Dict: Reset confirmation
         """
-        self.cycle_start_date = datetime.now(pytz.UTC)
+        self.cycle_start_date = cycle_start_date or self.clock.now()
         self.current_day = 1
         self.cooling_period_active = False
         self.cooling_period_start = None
         self.decision_locked_for_event = None
         self.last_brake_display_time = None
+        self.reflection_pending = False
         
         return {
             "status": "cycle_reset",
@@ -398,6 +454,7 @@ class OmtobeStateMachine:
             "cycle_start_date": self.cycle_start_date.isoformat(),
             "cooling_period_active": self.cooling_period_active,
             "decision_locked": self.decision_locked_for_event is not None,
+            "reflection_pending": self.reflection_pending,
             "hrv_baseline_mean": self.hrv_baseline_mean,
             "hrv_baseline_std_dev": self.hrv_baseline_std_dev,
             "phase": self._get_phase_name()
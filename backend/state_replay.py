@@ -0,0 +1,382 @@
+"""
+Offline State-Machine Replay for Omtobe MVP v0.1
+
+Feeds recorded per-user traffic (HRV samples, calendar events, Brake
+decisions, reflections) through OmtobeStateMachine on a simulated clock, so a
+month of production traffic can be re-evaluated against a changed threshold
+in minutes. Users are independent and are replayed in parallel across
+processes.
+
+Each HRV sample is one brake check, as in production; decisions and
+reflections are applied at their recorded times. The Day-8 rollover (00:00
+UTC after a cycle ends) and the Day-7 reflection at 09:00 local are
+simulated the way the server jobs apply them.
+
+Trace format (one JSON object per line):
+
+    {"user_id": "u1", "cycle_start_date": "2024-01-01T00:00:00Z", "timezone": "UTC",
+     "hrv": [["2024-01-01T00:05:00Z", 61.2], ...],
+     "events": [{"title": "Board Meeting", "start": "...", "end": "..."}],
+     "decisions": [["2024-01-03T10:02:00Z", "Delay"]],
+     "reflections": [["2024-01-07T09:10:00Z", "Yes"]]}
+
+Usage:
+    python state_replay.py traces.jsonl --workers 8 --set HRV_THRESHOLD_PERCENT=0.25
+"""
+
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+import heapq
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import pytz
+
+from clock import ManualClock
+from hrv_baseline import RollingHRVBaseline
+from hrv_series import HRVSeries
+from reflection_dispatcher import next_reflection_instant
+from state_machine import CalendarEvent, DecisionType, OmtobeStateMachine, ReflectionResponse
+from timestamps import parse_epoch, parse_epochs
+
+CYCLE_SECONDS = 7 * 24 * 60 * 60
+
+# Timeline order for entries at the same instant
+_DECISION, _REFLECTION, _CHECK = 0, 1, 2
+
+
+def _epoch(value) -> float:
+    """Epoch seconds from an ISO 8601 string or a number."""
+    return parse_epoch(value) if isinstance(value, str) else float(value)
+
+
+@dataclass
+class UserTrace:
+    """Recorded inputs of one user."""
+    user_id: str
+    cycle_start_date: datetime
+    hrv: HRVSeries
+    events: List[CalendarEvent] = field(default_factory=list)
+    decisions: List[Tuple[float, DecisionType]] = field(default_factory=list)  # (epoch, type)
+    reflections: List[Tuple[float, ReflectionResponse]] = field(default_factory=list)
+    timezone: str = "UTC"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UserTrace":
+        """
+        Build a trace from its JSON form (see module docstring).
+
+        Raises:
+            KeyError: Required field missing
+            ValueError: Unparseable timestamp or enum value
+        """
+        hrv = data.get("hrv", [])
+        stamps = [stamp for stamp, _ in hrv]
+        if all(isinstance(stamp, str) for stamp in stamps):
+            timestamps = parse_epochs(stamps)
+        else:
+            timestamps = array("d", (_epoch(stamp) for stamp in stamps))
+
+        events = []
+        for event in data.get("events", []):
+            start = datetime.fromtimestamp(_epoch(event["start"]), pytz.UTC)
+            end = datetime.fromtimestamp(_epoch(event["end"]), pytz.UTC)
+            events.append(CalendarEvent(event["title"], start, end, is_high_stakes=False))
+
+        return cls(
+            user_id=data["user_id"],
+            cycle_start_date=datetime.fromtimestamp(_epoch(data["cycle_start_date"]), pytz.UTC),
+            hrv=HRVSeries(timestamps, array("d", (value for _, value in hrv))),
+            events=events,
+            decisions=[(_epoch(stamp), DecisionType(kind)) for stamp, kind in data.get("decisions", [])],
+            reflections=[(_epoch(stamp), ReflectionResponse(kind)) for stamp, kind in data.get("reflections", [])],
+            timezone=data.get("timezone", "UTC")
+        )
+
+
+@dataclass
+class ReplayResult:
+    """What the state machine did for one user."""
+    user_id: str
+    checks: int = 0
+    brake_displays: int = 0
+    displays_by_day: List[int] = field(default_factory=lambda: [0] * 7)  # Index 0 = Day 1
+    display_times: List[float] = field(default_factory=list)
+    decisions: int = 0
+    reflections_due: int = 0
+    cycles_completed: int = 0
+
+
+def _validate_overrides(overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Only state-machine constants (e.g. HRV_THRESHOLD_PERCENT) may be overridden."""
+    overrides = dict(overrides or {})
+    for name in overrides:
+        if not name.isupper() or not hasattr(OmtobeStateMachine, name):
+            raise ValueError(f"Unknown state machine setting: {name}")
+    return overrides
+
+
+def _rollover_at(cycle_start: datetime) -> float:
+    """00:00 UTC at or after the end of a cycle (when the rollover job resets it)."""
+    end = cycle_start + timedelta(seconds=CYCLE_SECONDS)
+    midnight = end.replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight if midnight == end else midnight + timedelta(days=1)).timestamp()
+
+
+def _next_cycle_start(cycle_start: datetime, at: datetime) -> datetime:
+    """Start of the cycle running at `at`: whole 7-day periods after the old start."""
+    periods = int((at - cycle_start).total_seconds() // CYCLE_SECONDS)
+    return cycle_start + timedelta(seconds=periods * CYCLE_SECONDS)
+
+
+def _reflection_at(cycle_start: datetime, timezone: str) -> float:
+    """First 09:00 local on Day 7 (when the reflection dispatcher marks the user)."""
+    day_7 = cycle_start + timedelta(days=6)
+    return next_reflection_instant(timezone, day_7 - timedelta(microseconds=1)).timestamp()
+
+
+def _timeline(trace: UserTrace) -> Iterable[Tuple[float, int, Any]]:
+    """Checks, decisions and reflections merged in time order."""
+    checks = ((timestamp, _CHECK, i) for i, timestamp in enumerate(trace.hrv.timestamps))
+    decisions = ((timestamp, _DECISION, kind) for timestamp, kind in sorted(trace.decisions))
+    reflections = ((timestamp, _REFLECTION, kind) for timestamp, kind in sorted(trace.reflections))
+    return heapq.merge(checks, decisions, reflections, key=lambda entry: (entry[0], entry[1]))
+
+
+class SimulatedUser:
+    """
+    A state machine on a manual clock, with the server-side jobs simulated.
+
+    Callers move time forward with advance() and then run checks, decisions
+    and reflections at that instant.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        cycle_start_date: datetime,
+        timezone: str = "UTC",
+        events: Iterable[CalendarEvent] = (),
+        overrides: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize simulated user.
+
+        Args:
+            user_id: User identifier
+            cycle_start_date: Start of the first cycle
+            timezone: User's timezone (Day-7 reflection at 09:00 local)
+            events: Calendar events for the whole simulated period
+            overrides: State-machine constants to change, e.g. {"HRV_THRESHOLD_PERCENT": 0.25}
+
+        Raises:
+            ValueError: Unknown override
+        """
+        self.timezone = timezone
+        self.clock = ManualClock(cycle_start_date)
+        self.sm = OmtobeStateMachine(user_id, cycle_start_date, timezone, clock=self.clock)
+        for name, value in _validate_overrides(overrides).items():
+            setattr(self.sm, name, value)
+        self.baseline = RollingHRVBaseline()
+        self.sm.hrv_baseline = self.baseline
+        self.index = self.sm.build_event_index(list(events))
+        self._schedule_jobs()
+
+    def _schedule_jobs(self) -> None:
+        self.rollover_at = _rollover_at(self.sm.cycle_start_date)
+        self.reflection_at = _reflection_at(self.sm.cycle_start_date, self.timezone)
+
+    def advance(self, timestamp: float) -> List[Dict[str, Any]]:
+        """
+        Move the clock forward, applying rollovers and reflection marking.
+
+        Args:
+            timestamp: New simulated time (epoch seconds)
+
+        Returns:
+            List[Dict]: Transitions ("cycle_reset", "day", "reflection_due") with their epoch
+        """
+        sm = self.sm
+        transitions = []
+        # Day-8 rollover jobs that ran since the previous instant
+        while timestamp >= self.rollover_at:
+            rolled_at = self.rollover_at
+            self.clock.set(rolled_at)
+            sm.reset_cycle(_next_cycle_start(sm.cycle_start_date, self.clock.now()))
+            self._schedule_jobs()
+            transitions.append({"type": "cycle_reset", "at": rolled_at})
+
+        self.clock.set(timestamp)
+        previous_day = sm.current_day
+        day = sm.refresh_day()
+        if day != previous_day:
+            transitions.append({"type": "day", "at": timestamp, "current_day": day})
+        if day == 7 and timestamp >= self.reflection_at:
+            sm.reflection_pending = True
+            self.reflection_at = float("inf")  # Marked once per cycle
+            transitions.append({"type": "reflection_due", "at": timestamp})
+        return transitions
+
+    def check(self, hrv: HRVSeries, position: int) -> Tuple[bool, Optional[str]]:
+        """
+        Brake check on the sample at `position` (at the current instant).
+
+        Args:
+            hrv: HRV series, ascending
+            position: Index of the current sample
+
+        Returns:
+            Tuple[bool, Optional[str]]: (should_display, event title)
+        """
+        timestamps = hrv.timestamps
+        # Only samples the rolling baseline hasn't ingested yet, within its window
+        lo = bisect_left(timestamps, timestamps[position] - self.baseline.window_seconds)
+        if self.baseline.last_timestamp is not None:
+            lo = max(lo, bisect_right(timestamps, self.baseline.last_timestamp))
+        return self.sm.should_display_brake_screen(
+            current_hrv=hrv.values[position],
+            calendar_events=self.index,
+            hrv_samples=hrv[lo:position + 1]
+        )
+
+    def reflect(self, response: ReflectionResponse) -> Dict:
+        """Record a reflection and start a new cycle (as POST /api/v1/reflections)."""
+        self.sm.handle_reflection_response(response)
+        reset = self.sm.reset_cycle()
+        self._schedule_jobs()
+        return reset
+
+
+def replay_user(trace: UserTrace, overrides: Optional[Dict[str, Any]] = None) -> ReplayResult:
+    """
+    Replay one user's trace through a fresh state machine.
+
+    Args:
+        trace: Recorded inputs
+        overrides: State-machine constants to change, e.g. {"HRV_THRESHOLD_PERCENT": 0.25}
+
+    Returns:
+        ReplayResult: Brake displays, decisions and cycles
+    """
+    user = SimulatedUser(trace.user_id, trace.cycle_start_date, trace.timezone, trace.events, overrides)
+    result = ReplayResult(trace.user_id)
+
+    for timestamp, kind, payload in _timeline(trace):
+        for transition in user.advance(timestamp):
+            if transition["type"] == "cycle_reset":
+                result.cycles_completed += 1
+            elif transition["type"] == "reflection_due":
+                result.reflections_due += 1
+
+        if kind == _CHECK:
+            should_display, _ = user.check(trace.hrv, payload)
+            result.checks += 1
+            if should_display:
+                result.brake_displays += 1
+                result.displays_by_day[user.sm.current_day - 1] += 1
+                result.display_times.append(timestamp)
+
+        elif kind == _DECISION:
+            user.sm.handle_brake_response(payload)
+            result.decisions += 1
+
+        else:
+            user.reflect(payload)
+            result.cycles_completed += 1
+
+    return result
+
+
+class ReplayEngine:
+    """Replays many users' traces in parallel worker processes."""
+
+    def __init__(self, workers: Optional[int] = None, overrides: Optional[Dict[str, Any]] = None):
+        """
+        Initialize engine.
+
+        Args:
+            workers: Worker processes (defaults to the CPU count; 1 runs inline)
+            overrides: State-machine constants applied to every user
+
+        Raises:
+            ValueError: Unknown override
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.overrides = _validate_overrides(overrides)
+
+    def run(self, traces: Sequence[UserTrace]) -> List[ReplayResult]:
+        """
+        Replay every trace.
+
+        Args:
+            traces: One trace per user
+
+        Returns:
+            List[ReplayResult]: Results in trace order
+        """
+        replay = partial(replay_user, overrides=self.overrides)
+        if self.workers == 1 or len(traces) <= 1:
+            return [replay(trace) for trace in traces]
+
+        # Batches amortize pickling the traces across the process boundary
+        chunksize = max(1, len(traces) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(replay, traces, chunksize=chunksize))
+
+
+def summarize(results: Sequence[ReplayResult]) -> Dict[str, Any]:
+    """
+    Fleet totals of a replay.
+
+    Args:
+        results: Per-user results
+
+    Returns:
+        Dict: Totals, displays per cycle day and display rate per check
+    """
+    checks = sum(result.checks for result in results)
+    displays = sum(result.brake_displays for result in results)
+    return {
+        "users": len(results),
+        "checks": checks,
+        "brake_displays": displays,
+        "display_rate": displays / checks if checks else 0.0,
+        "displays_by_day": [sum(result.displays_by_day[day] for result in results) for day in range(7)],
+        "decisions": sum(result.decisions for result in results),
+        "reflections_due": sum(result.reflections_due for result in results),
+        "cycles_completed": sum(result.cycles_completed for result in results),
+    }
+
+
+def load_traces(path: str) -> List[UserTrace]:
+    """Read a JSON-lines trace file."""
+    with open(path, encoding="utf-8") as f:
+        return [UserTrace.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded traffic through the state machine")
+    parser.add_argument("traces", help="JSON-lines trace file")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--set", action="append", default=[], metavar="NAME=VALUE",
+        help="Override a state machine constant, e.g. HRV_THRESHOLD_PERCENT=0.25"
+    )
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    for setting in args.set:
+        name, _, value = setting.partition("=")
+        overrides[name] = type(getattr(OmtobeStateMachine, name, 0.0))(value)
+
+    results = ReplayEngine(args.workers, overrides).run(load_traces(args.traces))
+    print(json.dumps(summarize(results), indent=2))
+
+
+if __name__ == "__main__":
+    main()
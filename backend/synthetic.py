@@ -0,0 +1,224 @@
+"""
+Synthetic Integration Data for Omtobe MVP v0.1
+
+Vectorized, seeded HRV generator and latency/failure model behind the mock
+integrations. A 7-day series is a handful of NumPy operations instead of a
+Python loop with one random draw per sample, so load tests measure the
+service rather than the mock.
+
+Samples sit on a fixed grid (multiples of the sampling interval) and each
+sample depends only on (seed, user, timestamp), so overlapping or
+incremental fetches agree and a stored 7-day window never drifts.
+Different users get different (but reproducible) data.
+
+Drop and trend are relative to an anchor. By default the anchor recurs on
+absolute time (every `period_seconds`, at a per-user phase); a generator
+given a fixed anchor (e.g. a demo session's start) uses only that one.
+
+Scenarios:
+- steady: Stable baseline with natural variation
+- acute_drop: Steady, with HRV down ~40% for two hours before each daily anchor
+- noisy: Same mean, much larger variance
+- sparse: One reading per 15 minutes with half of them missing
+- trend: Baseline declining ~1.5 ms per day, restarting weekly
+
+Configuration (environment):
+- MOCK_HRV_SCENARIO: Scenario name (default "steady")
+- MOCK_SEED: Base seed (default 0)
+- MOCK_CALENDAR_LATENCY_MS / MOCK_CALENDAR_JITTER_MS: Simulated calendar
+  latency mean and spread (default 0 / 0)
+- MOCK_CALENDAR_FAILURE_RATE: Probability a calendar call fails (default 0)
+"""
+
+import asyncio
+from dataclasses import dataclass
+import os
+from typing import Dict, Optional
+import zlib
+import numpy as np
+
+from hrv_series import HRVSeries
+
+
+@dataclass(frozen=True)
+class HRVScenario:
+    """Parameters of a synthetic HRV pattern."""
+    name: str
+    mean: float = 50.0  # Baseline HRV (ms)
+    std_dev: float = 5.0  # Sample-to-sample variation (ms)
+    interval_seconds: int = 5 * 60  # Sampling interval
+    dropout: float = 0.0  # Fraction of samples missing
+    drop_fraction: float = 0.0  # Relative HRV drop near the anchor time
+    drop_seconds: int = 0  # How long before the anchor the drop starts
+    trend_per_day: float = 0.0  # Baseline change per day (ms), zero at the anchor
+    period_seconds: int = 7 * 24 * 60 * 60  # Recurrence of the default anchor
+    floor: float = 20.0  # Minimum plausible HRV
+
+
+SCENARIOS: Dict[str, HRVScenario] = {
+    "steady": HRVScenario("steady"),
+    "acute_drop": HRVScenario("acute_drop", drop_fraction=0.4, drop_seconds=2 * 60 * 60, period_seconds=24 * 60 * 60),
+    "noisy": HRVScenario("noisy", std_dev=15.0),
+    "sparse": HRVScenario("sparse", interval_seconds=15 * 60, dropout=0.5),
+    "trend": HRVScenario("trend", trend_per_day=-1.5),
+}
+
+# Grid samples drawn from one seeded block of random numbers
+BLOCK_SAMPLES = 288
+
+
+def _user_seed(seed: int, user_id: Optional[str]) -> int:
+    """Stable per-user seed (independent of PYTHONHASHSEED)."""
+    return seed ^ zlib.crc32((user_id or "").encode("utf-8"))
+
+
+class SyntheticHRVGenerator:
+    """Vectorized HRV sample generator for one user."""
+
+    def __init__(
+        self,
+        scenario: str = "steady",
+        seed: int = 0,
+        user_id: Optional[str] = None,
+        anchor: Optional[float] = None
+    ):
+        """
+        Initialize generator.
+
+        Args:
+            scenario: Name from SCENARIOS
+            seed: Base seed
+            user_id: User identifier (mixed into the seed)
+            anchor: Fixed epoch the drop/trend are relative to (None: recurring
+                anchor every period_seconds at a per-user phase)
+
+        Raises:
+            KeyError: Unknown scenario
+        """
+        self.scenario = SCENARIOS[scenario]
+        self.seed = _user_seed(seed, user_id)
+        self.anchor = anchor
+        self.phase = float((self.seed & 0xFFFFFFFF) % self.scenario.period_seconds)
+
+    def _since_anchor(self, timestamps: np.ndarray) -> np.ndarray:
+        """Seconds from each timestamp's anchor (negative before it)."""
+        if self.anchor is not None:
+            return timestamps - self.anchor
+        period = self.scenario.period_seconds
+        # Relative to the next recurrence: in [-period, 0)
+        return np.mod(timestamps - self.phase, period) - period
+
+    def _noise(self, indexes: np.ndarray):
+        """Standard normal and uniform draws per grid index, from seeded blocks."""
+        normal = np.empty(len(indexes))
+        uniform = np.empty(len(indexes))
+        blocks = indexes // BLOCK_SAMPLES
+        for block in np.unique(blocks):
+            rng = np.random.default_rng((self.seed & 0xFFFFFFFF, int(block)))
+            block_normal = rng.standard_normal(BLOCK_SAMPLES)
+            block_uniform = rng.random(BLOCK_SAMPLES)
+            selected = blocks == block
+            offsets = indexes[selected] - block * BLOCK_SAMPLES
+            normal[selected] = block_normal[offsets]
+            uniform[selected] = block_uniform[offsets]
+        return normal, uniform
+
+    @classmethod
+    def from_env(cls, user_id: Optional[str] = None) -> "SyntheticHRVGenerator":
+        """Build a generator from MOCK_HRV_SCENARIO / MOCK_SEED."""
+        return cls(
+            scenario=os.getenv("MOCK_HRV_SCENARIO", "steady"),
+            seed=int(os.getenv("MOCK_SEED", "0")),
+            user_id=user_id
+        )
+
+    def generate(self, start: float, end: float, limit: Optional[int] = None) -> HRVSeries:
+        """
+        Grid samples between two epochs (inclusive), oldest first.
+
+        Args:
+            start: Range start (epoch seconds)
+            end: Range end (epoch seconds)
+            limit: Maximum number of samples
+
+        Returns:
+            HRVSeries: Synthetic measurements
+        """
+        scenario = self.scenario
+        interval = scenario.interval_seconds
+        first = -(-int(np.ceil(start)) // interval)  # First grid index at or after start
+        count = int(np.floor(end)) // interval - first + 1
+        if limit is not None:
+            count = min(count, limit)
+        if count <= 0:
+            return HRVSeries()
+
+        indexes = np.arange(first, first + count, dtype=np.int64)
+        timestamps = indexes.astype(np.float64) * interval
+        normal, uniform = self._noise(indexes)
+        values = scenario.mean + normal * scenario.std_dev
+
+        if scenario.trend_per_day or scenario.drop_fraction:
+            since_anchor = self._since_anchor(timestamps)
+            if scenario.trend_per_day:
+                values += scenario.trend_per_day * since_anchor / 86400.0
+            if scenario.drop_fraction:
+                dropped = since_anchor >= -scenario.drop_seconds
+                values[dropped] *= 1.0 - scenario.drop_fraction
+        np.maximum(values, scenario.floor, out=values)
+
+        if scenario.dropout:
+            keep = uniform >= scenario.dropout
+            timestamps, values = timestamps[keep], values[keep]
+
+        series = HRVSeries()
+        series.timestamps.frombytes(timestamps.tobytes())
+        series.values.frombytes(values.tobytes())
+        return series
+
+
+class LatencyModel:
+    """Simulated upstream latency and failures."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """
+        Initialize model.
+
+        Args:
+            latency_ms: Mean latency per call
+            jitter_ms: Standard deviation of the latency
+            failure_rate: Probability that a call fails
+            seed: Seed for latency and failure draws
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def calendar_from_env(cls) -> "LatencyModel":
+        """Calendar latency model from MOCK_CALENDAR_* variables."""
+        return cls(
+            latency_ms=float(os.getenv("MOCK_CALENDAR_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("MOCK_CALENDAR_JITTER_MS", "0")),
+            failure_rate=float(os.getenv("MOCK_CALENDAR_FAILURE_RATE", "0")),
+            seed=int(os.getenv("MOCK_SEED", "0"))
+        )
+
+    async def wait(self) -> bool:
+        """
+        Sleep for one simulated call.
+
+        Returns:
+            bool: False if the call should be treated as failed
+        """
+        if self.latency_ms or self.jitter_ms:
+            delay = max(0.0, self._rng.normal(self.latency_ms, self.jitter_ms)) / 1000.0
+            await asyncio.sleep(delay)
+        return not (self.failure_rate and self._rng.random() < self.failure_rate)
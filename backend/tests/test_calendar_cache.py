@@ -0,0 +1,138 @@
+"""
+Omtobe MVP v0.1: Incremental Calendar Sync Tests
+
+Drives GoogleCalendarIntegration against a fake Calendar API served by
+httpx.MockTransport.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+import pytz
+
+from calendar_cache import SYNC_HORIZON, CalendarEventCache
+from http_pool import HTTPClientPool
+from integrations import GoogleCalendarIntegration
+
+
+def event(event_id: str, title: str, start: datetime, minutes: int = 60, status: str = "confirmed"):
+    """Google Calendar event resource."""
+    return {
+        "id": event_id,
+        "status": status,
+        "summary": title,
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": (start + timedelta(minutes=minutes)).isoformat()},
+    }
+
+
+class FakeCalendarAPI:
+    """Serves a paginated full sync, then scripted delta responses."""
+
+    def __init__(self, now: datetime):
+        self.now = now
+        self.requests = []
+        self.deltas = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        self.requests.append(params)
+
+        if "syncToken" in params:
+            status, body = self.deltas.pop(0)
+            return httpx.Response(status, json=body)
+
+        if params.get("pageToken") == "page2":
+            return httpx.Response(200, json={
+                "items": [event("e3", "! Decision", self.now + timedelta(hours=3))],
+                "nextSyncToken": "token1",
+            })
+        return httpx.Response(200, json={
+            "items": [
+                event("e1", "Board Meeting", self.now - timedelta(minutes=10)),
+                event("e2", "Lunch", self.now + timedelta(hours=1)),
+            ],
+            "nextPageToken": "page2",
+        })
+
+
+def make_integration(api: FakeCalendarAPI, cache: CalendarEventCache) -> GoogleCalendarIntegration:
+    """Integration bound to the fake API."""
+    pool = HTTPClientPool(http2=False, transport=httpx.MockTransport(api))
+    return GoogleCalendarIntegration("token", http_pool=pool, user_id="cal_user", event_cache=cache)
+
+
+class TestCalendarIncrementalSync:
+    """Sync token, pagination and invalidation tests"""
+
+    def test_full_sync_then_delta(self):
+        """Initial sync pages through everything; later syncs apply deltas."""
+        now = datetime.now(pytz.UTC)
+        api = FakeCalendarAPI(now)
+        cache = CalendarEventCache()
+        calendar = make_integration(api, cache)
+
+        index = asyncio.run(calendar.sync_events())
+        assert sorted(e.event_id for e in index.events) == ["e1", "e3"]
+        assert cache.get("cal_user").sync_token == "token1"
+        assert len(api.requests) == 2
+
+        api.deltas.append((200, {
+            "items": [
+                {"id": "e1", "status": "cancelled"},
+                event("e4", "Contract Negotiation", now + timedelta(hours=5)),
+            ],
+            "nextSyncToken": "token2",
+        }))
+        index = asyncio.run(calendar.sync_events())
+
+        assert api.requests[-1] == {"maxResults": "250", "singleEvents": "true", "syncToken": "token1"}
+        assert sorted(e.event_id for e in index.events) == ["e3", "e4"]
+        assert cache.get("cal_user").sync_token == "token2"
+        assert index.active_at(now) is None
+
+    def test_expired_sync_token_forces_full_sync(self):
+        """A 410 response drops the cache and re-runs the full sync."""
+        now = datetime.now(pytz.UTC)
+        api = FakeCalendarAPI(now)
+        cache = CalendarEventCache()
+        cache.get("cal_user").sync_token = "stale"
+        cache.get("cal_user").horizon = now + timedelta(days=14)
+        api.deltas.append((410, {"error": {"code": 410, "message": "Sync token is no longer valid"}}))
+
+        index = asyncio.run(make_integration(api, cache).sync_events())
+
+        assert api.requests[0]["syncToken"] == "stale"
+        assert "syncToken" not in api.requests[1]
+        assert cache.get("cal_user").sync_token == "token1"
+        assert index.active_at(now).event_id == "e1"
+
+    def test_sync_window_is_bounded_and_rolls_forward(self):
+        """Full syncs stop at the horizon; an expiring horizon triggers a new full sync."""
+        now = datetime.now(pytz.UTC)
+        api = FakeCalendarAPI(now)
+        cache = CalendarEventCache()
+        calendar = make_integration(api, cache)
+
+        asyncio.run(calendar.sync_events())
+        first = api.requests[0]
+        assert datetime.fromisoformat(first["timeMax"]) == cache.get("cal_user").horizon
+        assert cache.get("cal_user").horizon - now >= SYNC_HORIZON
+
+        # A delta can report instances beyond the window; they are evicted
+        api.deltas.append((200, {
+            "items": [event("e5", "Board Meeting", now + SYNC_HORIZON + timedelta(days=1))],
+            "nextSyncToken": "token2",
+        }))
+        index = asyncio.run(calendar.sync_events())
+        assert "e5" not in {e.event_id for e in index.events}
+
+        cache.get("cal_user").horizon = now + timedelta(days=6)
+        cache.get("cal_user").push_enabled = True
+        cache.get("cal_user").dirty = False
+        assert cache.needs_sync("cal_user")
+        requests_before = len(api.requests)
+        asyncio.run(calendar.sync_events())
+        assert "syncToken" not in api.requests[requests_before]
+        assert "timeMax" in api.requests[requests_before]
+        assert cache.get("cal_user").push_enabled is True
@@ -0,0 +1,208 @@
+"""
+Omtobe MVP v0.1: Calendar Push Channel Tests
+
+Covers channel bookkeeping, the notification webhook (driven by
+LocalCalendarNotifier) and skipping Calendar API calls for quiet calendars.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+import pytest
+import pytz
+
+from calendar_cache import CalendarEventCache
+from calendar_channels import CalendarChannelRegistry, LocalCalendarNotifier
+from http_pool import HTTPClientPool
+from integrations import GoogleCalendarIntegration
+
+
+class TestCalendarChannelRegistry:
+    """Registration, validation and renewal bookkeeping"""
+
+    def test_notification_marks_user_dirty(self):
+        """Valid change notifications mark the user's events dirty; "sync" is only acked."""
+        cache = CalendarEventCache()
+        registry = CalendarChannelRegistry(cache)
+        channel = registry.register("user_a")
+        state = cache.get("user_a")
+        state.dirty = False
+
+        assert registry.handle_notification(channel.channel_id, channel.token, "sync") is None
+        assert state.dirty is False
+
+        assert registry.handle_notification(channel.channel_id, channel.token, "exists") == "user_a"
+        assert state.dirty is True
+
+    def test_rejects_unknown_channel_and_bad_token(self):
+        """Unknown or expired channels and wrong tokens are refused."""
+        registry = CalendarChannelRegistry(CalendarEventCache())
+        channel = registry.register("user_a", ttl=timedelta(hours=1))
+
+        with pytest.raises(KeyError):
+            registry.handle_notification("missing", channel.token, "exists")
+        with pytest.raises(PermissionError):
+            registry.handle_notification(channel.channel_id, "wrong", "exists")
+        with pytest.raises(KeyError):
+            registry.handle_notification(
+                channel.channel_id, channel.token, "exists",
+                now=datetime.now(pytz.UTC) + timedelta(hours=2)
+            )
+
+    def test_renewal_replaces_expiring_channels(self):
+        """Channels inside the margin are renewed without leaving push mode."""
+        cache = CalendarEventCache()
+        registry = CalendarChannelRegistry(cache)
+        now = datetime.now(pytz.UTC)
+        soon = registry.register("user_a", ttl=timedelta(hours=12), now=now)
+        registry.register("user_b", ttl=timedelta(days=7), now=now)
+
+        due = registry.channels_due_for_renewal(now)
+        assert [c.channel_id for c in due] == [soon.channel_id]
+
+        renewed = registry.renew(soon.channel_id, now=now)
+        assert registry.get(soon.channel_id) is None
+        assert registry.channels_for("user_a") == [renewed]
+        assert cache.get("user_a").push_enabled is True
+        assert cache.get("user_a").dirty is True
+
+        registry.remove(renewed.channel_id)
+        assert cache.get("user_a").push_enabled is False
+
+    def test_changes_recorded_elsewhere_apply_once(self):
+        """A change accepted by another worker marks the user dirty exactly once."""
+        cache = CalendarEventCache()
+        registry = CalendarChannelRegistry(cache)
+        channel = registry.register("user_a")
+        state = cache.get("user_a")
+        changed_at = datetime.now(pytz.UTC)
+
+        state.dirty = False
+        assert registry.apply_change(channel.channel_id, changed_at) is True
+        assert state.dirty is True
+
+        state.dirty = False
+        assert registry.apply_change(channel.channel_id, changed_at) is False
+        assert state.dirty is False
+
+
+class TestCalendarNotificationWebhook:
+    """Webhook endpoint driven by the local stand-in notifier"""
+
+    def test_webhook_marks_dirty_and_validates(self):
+        """Notifications reach the registry; bad tokens are rejected."""
+        import main
+
+        channel = main.calendar_channels.register("webhook_user")
+        main.calendar_cache.get("webhook_user").dirty = False
+
+        async def run():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                notifier = LocalCalendarNotifier(client)
+                ack = await notifier.notify(channel, "exists")
+                channel_copy = type(channel)(**{**channel.__dict__, "token": "wrong"})
+                rejected = await notifier.notify(channel_copy, "exists")
+                return ack, rejected
+
+        try:
+            ack, rejected = asyncio.run(run())
+            assert ack.status_code == 200
+            assert main.calendar_cache.get("webhook_user").dirty is True
+            assert rejected.status_code == 403
+        finally:
+            main.calendar_channels.remove(channel.channel_id)
+
+
+    def test_channels_are_shared_through_the_database(self):
+        """A worker that never saw the channel accepts its notifications and shares the change."""
+        import main
+
+        async def run():
+            channel = CalendarChannelRegistry(CalendarEventCache()).register("webhook_user")
+            await main.persist_calendar_channel(channel)  # Registered by another worker
+            transport = httpx.ASGITransport(app=main.app)
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    ack = await LocalCalendarNotifier(client).notify(channel, "exists")
+
+                # A third worker picks the change up from the stored channel
+                other = CalendarChannelRegistry(CalendarEventCache())
+                other.event_cache.get("webhook_user").dirty = False
+                main_registry, main.calendar_channels = main.calendar_channels, other
+                try:
+                    await main.sync_calendar_channels()
+                finally:
+                    main.calendar_channels = main_registry
+                claimed = await main.delete_calendar_channel(channel.channel_id)
+                claimed_again = await main.delete_calendar_channel(channel.channel_id)
+                return channel, ack, other, claimed, claimed_again
+            finally:
+                main.calendar_channels.remove(channel.channel_id)
+
+        channel, ack, other, claimed, claimed_again = asyncio.run(run())
+        assert ack.status_code == 200
+        assert other.get(channel.channel_id) is not None
+        assert other.event_cache.get("webhook_user").push_enabled is True
+        assert other.event_cache.get("webhook_user").dirty is True
+        assert (claimed, claimed_again) == (True, False)
+
+
+    def test_watch_needs_webhook_for_google_calendars(self):
+        """Without CALENDAR_WEBHOOK_URL only mock calendars get a (local) channel."""
+        import main
+        from database import AsyncSessionLocal
+        from models import User
+
+        async def run():
+            async with AsyncSessionLocal() as db:
+                for user_id, token in (("watch_google", "gc-token"), ("watch_mock", None)):
+                    if await db.get(User, user_id) is None:
+                        db.add(User(id=user_id, email=f"{user_id}@example.com", calendar_token=token))
+                await db.commit()
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                google = await client.post("/api/v1/calendar/watch", params={"user_id": "watch_google"})
+                mock = await client.post("/api/v1/calendar/watch", params={"user_id": "watch_mock"})
+            return google, mock
+
+        webhook_url, main.CALENDAR_WEBHOOK_URL = main.CALENDAR_WEBHOOK_URL, None
+        try:
+            google, mock = asyncio.run(run())
+        finally:
+            main.CALENDAR_WEBHOOK_URL = webhook_url
+        try:
+            assert google.status_code == 409
+            assert main.calendar_channels.channels_for("watch_google") == []
+            assert main.calendar_cache.get("watch_google").push_enabled is False
+            assert mock.status_code == 200
+        finally:
+            if mock.status_code == 200:
+                main.calendar_channels.remove(mock.json()["channel_id"])
+
+
+class TestPushAwareSync:
+    """Quiet push-enabled calendars are served from the cache"""
+
+    def test_clean_calendar_skips_api_call(self):
+        """Only dirty (or unsynced) calendars hit the Calendar API."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"items": [], "nextSyncToken": f"token{len(requests)}"})
+
+        cache = CalendarEventCache()
+        registry = CalendarChannelRegistry(cache)
+        channel = registry.register("cal_user")
+        pool = HTTPClientPool(http2=False, transport=httpx.MockTransport(handler))
+        calendar = GoogleCalendarIntegration("token", http_pool=pool, user_id="cal_user", event_cache=cache)
+
+        asyncio.run(calendar.sync_event_index())
+        asyncio.run(calendar.sync_event_index())
+        assert len(requests) == 1
+
+        registry.handle_notification(channel.channel_id, channel.token, "exists")
+        asyncio.run(calendar.sync_event_index())
+        assert len(requests) == 2
+        assert cache.get("cal_user").sync_token == "token2"
@@ -0,0 +1,60 @@
+"""
+Omtobe MVP v0.1: High-Stakes Event Index Tests
+"""
+
+import random
+from datetime import datetime, timedelta
+import pytz
+
+from calendar_index import HighStakesEventIndex
+from state_machine import OmtobeStateMachine, CalendarEvent
+
+
+def make_event(title: str, start: datetime, minutes: int) -> CalendarEvent:
+    """Build a state machine calendar event."""
+    return CalendarEvent(
+        title=title,
+        start_time=start,
+        end_time=start + timedelta(minutes=minutes),
+        is_high_stakes=True
+    )
+
+
+class TestHighStakesEventIndex:
+    """Interval index tests"""
+
+    def test_matches_linear_scan(self):
+        """active_at() agrees with the state machine's linear scan."""
+        rng = random.Random(3)
+        day = datetime(2026, 3, 2, tzinfo=pytz.UTC)
+        titles = ["Board Meeting", "Lunch", "! Decision", "Standup", "Quarterly Review"]
+        events = [
+            make_event(rng.choice(titles), day + timedelta(minutes=rng.randint(0, 1440)), rng.randint(5, 180))
+            for _ in range(300)
+        ]
+        sm = OmtobeStateMachine(user_id="index_user", timezone="UTC")
+        index = sm.build_event_index(events)
+
+        for minute in range(0, 1700, 7):
+            t = day + timedelta(minutes=minute)
+            linear = [
+                event for event in events
+                if sm._is_high_stakes_event(event) and event.start_time <= t <= event.end_time
+            ]
+            indexed = index.active_events_at(t)
+            assert sorted(map(id, indexed)) == sorted(map(id, linear))
+            assert (sm._is_active_high_stakes_event(index, t) is None) == (not linear)
+
+    def test_next_boundary(self):
+        """next_boundary() reports the next start or end."""
+        day = datetime(2026, 3, 2, tzinfo=pytz.UTC)
+        index = HighStakesEventIndex([
+            make_event("Board Meeting", day + timedelta(hours=10), 60),
+            make_event("! Pitch", day + timedelta(hours=14), 30),
+        ])
+
+        assert index.next_boundary(day) == day + timedelta(hours=10)
+        assert index.next_boundary(day + timedelta(hours=10, minutes=5)) == day + timedelta(hours=11)
+        assert index.next_boundary(day + timedelta(hours=12)) == day + timedelta(hours=14)
+        assert index.next_boundary(day + timedelta(hours=15)) is None
+        assert index.active_at(day + timedelta(hours=12)) is None
@@ -0,0 +1,69 @@
+"""
+Omtobe MVP v0.1: Cohort Brake Evaluation Tests
+
+Verifies the vectorized engine returns the same decisions as the per-user
+state machine.
+"""
+
+import random
+from datetime import datetime, timedelta
+import pytz
+
+from cohort import BrakeCohort, evaluate_brake_cohort
+from hrv_series import HRVSeries
+from state_machine import OmtobeStateMachine, CalendarEvent
+
+
+class TestCohortEvaluation:
+    """Vectorized cohort engine tests"""
+
+    def test_matches_per_user_decisions(self):
+        """Every user's cohort decision equals should_display_brake_screen."""
+        rng = random.Random(7)
+        now = datetime.now(pytz.UTC)
+        machines, current_hrv, baseline_mean, event_active = [], [], [], []
+
+        for i in range(600):
+            sm = OmtobeStateMachine(
+                user_id=f"cohort_user_{i}",
+                cycle_start_date=now - timedelta(days=rng.randint(0, 6), hours=1),
+                timezone="UTC"
+            )
+            cooling = rng.choice(["none", "recent", "expired", "no_start"])
+            if cooling != "none":
+                sm.cooling_period_active = True
+            if cooling == "recent":
+                sm.cooling_period_start = now - timedelta(minutes=5)
+            elif cooling == "expired":
+                sm.cooling_period_start = now - timedelta(minutes=30)
+            if rng.random() < 0.2:
+                sm.decision_locked_for_event = now
+
+            machines.append(sm)
+            current_hrv.append(rng.uniform(25.0, 60.0))
+            baseline_mean.append(rng.choice([0.0, 45.0, 50.0, 55.0]))
+            event_active.append(rng.random() < 0.7)
+
+        cohort = BrakeCohort.from_state_machines(machines, current_hrv, baseline_mean, event_active)
+        decision = evaluate_brake_cohort(cohort, now)
+
+        event = CalendarEvent(
+            title="Board Meeting",
+            start_time=now - timedelta(minutes=10),
+            end_time=now + timedelta(minutes=50),
+            is_high_stakes=True
+        )
+        for i, sm in enumerate(machines):
+            samples = HRVSeries()
+            if baseline_mean[i]:
+                samples.append(now - timedelta(hours=1), baseline_mean[i])
+            expected, _ = sm.should_display_brake_screen(
+                current_hrv=current_hrv[i],
+                calendar_events=[event] if event_active[i] else [],
+                hrv_samples=samples
+            )
+            assert bool(decision.should_display[i]) == expected, sm.user_id
+            assert bool(decision.cooling_period_active[i]) == sm.cooling_period_active, sm.user_id
+
+        assert decision.should_display.any()
+        assert len(decision.display_user_ids()) == int(decision.should_display.sum())
@@ -0,0 +1,134 @@
+"""
+Omtobe MVP v0.1: Accelerated Demo Session Tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+import pytz
+
+from clock import AcceleratedClock, Clock
+from demo import DemoLimitError, DemoSession, DemoSessionManager
+from state_machine import DecisionType, ReflectionResponse
+
+START = datetime(2024, 1, 1, 15, 30, tzinfo=pytz.UTC)  # Day 1 starts at 00:00 UTC
+DAY = 86400
+
+
+def make_session(**options) -> DemoSession:
+    """Session whose virtual clock only moves on fast-forward."""
+    return DemoSession("demo_test", speed=1e-9, start=START, **options)
+
+
+def of_type(transitions, kind):
+    return [transition for transition in transitions if transition["type"] == kind]
+
+
+class TestAcceleratedClock:
+    """Virtual time"""
+
+    def test_speed_and_fast_forward(self):
+        """Virtual time runs `speed` times faster and can jump ahead."""
+        wall = [100.0]
+        clock = AcceleratedClock(START, speed=3600, timer=lambda: wall[0])
+
+        wall[0] += 2
+        assert clock.now() == START + timedelta(hours=2)
+
+        clock.fast_forward(timedelta(days=1))
+        clock.set_speed(60)
+        wall[0] += 1
+        assert clock.now() == START + timedelta(days=1, hours=2, minutes=1)
+
+    def test_clock_is_abstract(self):
+        """A clock must implement now()."""
+        with pytest.raises(TypeError):
+            Clock()
+
+
+class TestDemoSession:
+    """Simulated cycle on a virtual clock"""
+
+    def test_full_cycle(self):
+        """A 7-day fast-forward walks through every phase of the cycle."""
+        session = make_session()
+        transitions = session.fast_forward(7 * DAY)
+
+        assert [t["current_day"] for t in of_type(transitions, "day")] == [2, 3, 4, 5, 6, 7]
+
+        displays = of_type(transitions, "brake_display")
+        assert {display["current_day"] for display in displays} == {3, 4, 5}
+        assert all(display["at"][11:13] == "10" or display["at"][11:16] == "11:00" for display in displays)
+        assert len(of_type(transitions, "decision")) == len(displays)  # auto Delay
+
+        assert of_type(transitions, "reflection_due")[0]["at"] == "2024-01-07T09:00:00+00:00"
+        assert of_type(transitions, "cycle_reset")[0]["at"] == "2024-01-08T00:00:00+00:00"
+        assert session.snapshot()["state"]["current_day"] == 1
+
+    def test_manual_decision(self):
+        """Without auto decisions the client's Delay starts the cooling period."""
+        session = make_session(auto_decision=None)
+        transitions = session.fast_forward(2 * DAY + 10 * 3600 + 60)
+        assert len(of_type(transitions, "brake_display")) == 1  # 10:00 on Day 3
+
+        transitions = session.decide(DecisionType.DELAY)
+        assert transitions[-1]["decision_type"] == DecisionType.DELAY
+        assert session.snapshot()["state"]["cooling_period_active"] is True
+
+        transitions = session.fast_forward(5 * 60)
+        assert of_type(transitions, "brake_display") == []
+
+    def test_reflection_resets_cycle(self):
+        """Answering the Day-7 reflection starts a new cycle."""
+        session = make_session()
+        session.fast_forward(6 * DAY + 10 * 3600)
+        snapshot = session.snapshot()
+        assert snapshot["state"]["reflection_pending"] is True
+        assert snapshot["virtual_time"] == "2024-01-07T10:00:00+00:00"
+
+        transitions = session.reflect(ReflectionResponse.YES)
+        assert [t["type"] for t in transitions] == ["reflection", "cycle_reset"]
+        assert session.snapshot()["state"]["current_day"] == 1
+
+    def test_stops_at_horizon(self):
+        """Sessions end when the synthetic calendar runs out."""
+        session = make_session()
+        session.fast_forward(60 * DAY)
+        assert session.finished
+        assert session.fast_forward(DAY) == []
+
+
+class TestDemoSessionManager:
+    """Session lifecycle"""
+
+    def test_limit_and_removal(self):
+        """Sessions are capped, streamed to and removed."""
+        async def scenario():
+            manager = DemoSessionManager(max_sessions=1, tick_seconds=0.01)
+            session = manager.create(speed=1e-9, start=START)
+            try:
+                manager.create()
+                assert False, "expected DemoLimitError"
+            except DemoLimitError:
+                pass
+
+            received = []
+
+            async def listen():
+                async for message in manager.hub.subscribe(session.session_id):
+                    received.append(message)
+                    return
+
+            listener = asyncio.ensure_future(listen())
+            await asyncio.sleep(0)
+            manager.publish(session, session.fast_forward(DAY))
+            await listener
+
+            assert manager.get(session.session_id) is session
+            assert manager.remove(session.session_id) is True
+            assert manager.get(session.session_id) is None
+            await manager.aclose()
+            return received
+
+        received = asyncio.run(scenario())
+        assert received[0]["type"] == "day"
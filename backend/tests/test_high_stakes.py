@@ -0,0 +1,47 @@
+"""
+Omtobe MVP v0.1: High-Stakes Classifier Tests
+"""
+
+from high_stakes import HighStakesClassifier, TRIGGER_KEYWORDS
+
+
+def reference_is_high_stakes(title: str) -> bool:
+    """Original keyword + prefix rule."""
+    title_lower = title.lower()
+    return any(keyword in title_lower for keyword in TRIGGER_KEYWORDS) or title.startswith("!")
+
+
+class TestHighStakesClassifier:
+    """Compiled classifier tests"""
+
+    TITLES = [
+        "Board Meeting",
+        "Quarterly REVIEW",
+        "negotiation prep",
+        "High-Stakes Pitch",
+        "! Critical Decision",
+        "Lunch!",
+        "Standup",
+        "Keyboard shopping",
+        "Highstakes",
+        "",
+    ]
+
+    def test_matches_reference_rule(self):
+        """Compiled matcher agrees with the keyword/prefix rule."""
+        classifier = HighStakesClassifier()
+
+        assert classifier.classify(self.TITLES) == [reference_is_high_stakes(t) for t in self.TITLES]
+
+    def test_memoizes_by_event_id_and_title(self):
+        """Recurring events are served from the memo; title edits are re-checked."""
+        classifier = HighStakesClassifier(memo_size=2)
+        ids = [f"evt_{i}" for i in range(len(self.TITLES))]
+
+        first = classifier.classify(self.TITLES, ids)
+        assert first == [reference_is_high_stakes(t) for t in self.TITLES]
+        assert len(classifier._memo) == 2
+
+        # Same ID with a renamed title gets a fresh classification
+        assert classifier.is_high_stakes("Standup", "evt_0") is False
+        assert classifier.is_high_stakes("Board Meeting", "evt_0") is True
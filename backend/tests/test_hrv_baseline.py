@@ -0,0 +1,141 @@
+"""
+Omtobe MVP v0.1: Rolling HRV Baseline Tests
+
+Verifies the incremental baseline matches a full 7-day recompute and expires
+samples as they age out of the window.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+import pytz
+
+from hrv_baseline import RollingHRVBaseline, HRVBaselineRegistry
+from state_machine import OmtobeStateMachine, HRVSample
+
+
+def make_samples(end: datetime, count: int, step_minutes: int = 5):
+    """Build ascending HRV samples ending at `end`."""
+    return [
+        HRVSample(
+            timestamp=end - timedelta(minutes=step_minutes * (count - 1 - i)),
+            value=50.0 + (i % 7) - 3.0
+        )
+        for i in range(count)
+    ]
+
+
+class TestRollingHRVBaseline:
+    """Rolling baseline accumulator tests"""
+
+    def test_matches_full_recompute(self):
+        """Incremental updates produce the same baseline as a full recompute."""
+        now = datetime.now(pytz.UTC)
+        samples = make_samples(now, 2000)
+        sm = OmtobeStateMachine(user_id="baseline_user", timezone="UTC")
+        baseline = RollingHRVBaseline()
+
+        # Feed the history in three growing prefixes, as successive checks would
+        for end in (500, 1200, 2000):
+            mean, std_dev = baseline.update(samples[:end], now=now)
+
+        expected_mean, expected_std_dev = sm._compute_hrv_baseline(samples)
+        assert baseline.count == 2000
+        assert mean == pytest.approx(expected_mean, rel=1e-9)
+        assert std_dev == pytest.approx(expected_std_dev, rel=1e-9)
+
+    def test_only_new_samples_are_ingested(self):
+        """Re-sending already-seen samples does not double count them."""
+        now = datetime.now(pytz.UTC)
+        samples = make_samples(now, 100)
+        baseline = RollingHRVBaseline()
+
+        baseline.update(samples, now=now)
+        baseline.update(samples, now=now)
+
+        assert baseline.count == 100
+
+    def test_fetch_time_only_set_by_fetched_samples(self):
+        """Empty updates move neither last_update nor last_fetched_at."""
+        now = datetime.now(pytz.UTC)
+        baseline = RollingHRVBaseline()
+
+        baseline.update(make_samples(now, 10), now=now, fetched=True)
+        baseline.update([], now=now + timedelta(minutes=5))
+        baseline.update(make_samples(now, 10), now=now + timedelta(minutes=10))
+
+        assert baseline.last_fetched_at == now
+        assert baseline.last_update == now
+
+    def test_expires_samples_outside_window(self):
+        """Samples older than the window are removed from the statistics."""
+        now = datetime.now(pytz.UTC)
+        baseline = RollingHRVBaseline(window_seconds=3600)
+        samples = [
+            HRVSample(timestamp=now - timedelta(hours=2), value=10.0),
+            HRVSample(timestamp=now - timedelta(minutes=30), value=40.0),
+            HRVSample(timestamp=now - timedelta(minutes=10), value=60.0),
+        ]
+
+        mean, std_dev = baseline.update(samples, now=now)
+
+        assert baseline.count == 2
+        assert mean == pytest.approx(50.0)
+        assert std_dev == pytest.approx(10.0)
+
+        # Once everything has aged out the baseline is empty again
+        baseline.expire(now + timedelta(hours=2))
+        assert baseline.count == 0
+        assert baseline.mean == 0.0
+        assert baseline.std_dev == 0.0
+
+    def test_state_machine_uses_attached_baseline(self):
+        """The brake check reads the baseline from the attached accumulator."""
+        registry = HRVBaselineRegistry()
+        sm = OmtobeStateMachine(
+            user_id="baseline_user",
+            cycle_start_date=datetime.now(pytz.UTC) - timedelta(days=3),
+            timezone="UTC"
+        )
+        sm.hrv_baseline = registry.get("baseline_user")
+        samples = make_samples(datetime.now(pytz.UTC), 288)
+
+        sm.should_display_brake_screen(
+            current_hrv=35.0,
+            calendar_events=[],
+            hrv_samples=samples
+        )
+
+        expected_mean, _ = sm._compute_hrv_baseline(samples)
+        assert registry.get("baseline_user") is sm.hrv_baseline
+        assert sm.hrv_baseline_mean == pytest.approx(expected_mean, rel=1e-9)
+
+
+class TestHRVBaselineRegistry:
+    """Bounded per-user registry"""
+
+    def test_evicts_least_recently_used(self):
+        """Beyond max_users the least recently used baseline is dropped."""
+        registry = HRVBaselineRegistry(max_users=2)
+        first = registry.get("u1")
+        registry.get("u2")
+        assert registry.get("u1") is first  # u1 is now the most recent
+        registry.get("u3")
+
+        assert len(registry) == 2
+        assert registry.evictions == 1
+        assert registry.get("u1") is first  # u2 was evicted, not u1
+
+    def test_evicts_idle_baselines(self, monkeypatch):
+        """Baselines unused for idle_seconds are dropped and start over."""
+        clock = [1000.0]
+        monkeypatch.setattr("hrv_baseline.time.monotonic", lambda: clock[0])
+        registry = HRVBaselineRegistry(idle_seconds=60)
+        stale = registry.get("idle_user")
+        registry.get("active_user")
+
+        clock[0] += 30
+        registry.get("active_user")
+        clock[0] += 45
+        assert registry.get("idle_user") is not stale
+        assert registry.evictions == 1
+        assert len(registry) == 2
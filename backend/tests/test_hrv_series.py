@@ -0,0 +1,60 @@
+"""
+Omtobe MVP v0.1: Columnar HRV Series Tests
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+import pytz
+
+from hrv_series import HRVSeries
+from hrv_baseline import RollingHRVBaseline
+from integrations import MockHealthKitIntegration
+from state_machine import OmtobeStateMachine, HRVSample
+
+
+class TestHRVSeries:
+    """Array-backed HRV series tests"""
+
+    def test_window_slicing(self):
+        """window() and after() select inclusive/exclusive time ranges."""
+        start = datetime(2026, 1, 1, tzinfo=pytz.UTC)
+        series = HRVSeries()
+        for i in range(10):
+            series.append(start + timedelta(minutes=5 * i), 40.0 + i)
+
+        window = series.window(start + timedelta(minutes=10), start + timedelta(minutes=20))
+        assert list(window.values) == [42.0, 43.0, 44.0]
+
+        newer = series.after(start + timedelta(minutes=35))
+        assert list(newer.values) == [48.0, 49.0]
+
+        series.drop_before(start + timedelta(minutes=40))
+        assert len(series) == 2
+        assert series.latest() == (start + timedelta(minutes=45), 49.0)
+
+    def test_baseline_matches_sample_list(self):
+        """The state machine computes the same baseline from a series or a list."""
+        now = datetime.now(pytz.UTC)
+        samples = [
+            HRVSample(timestamp=now - timedelta(hours=i), value=50.0 + (i % 5))
+            for i in reversed(range(100))
+        ]
+        series = HRVSeries.from_samples(samples)
+        sm = OmtobeStateMachine(user_id="series_user", timezone="UTC")
+
+        assert sm._compute_hrv_baseline(series) == sm._compute_hrv_baseline(samples)
+
+        rolling = RollingHRVBaseline()
+        mean, std_dev = rolling.update(series, now=now)
+        expected_mean, expected_std_dev = sm._compute_hrv_baseline(samples)
+        assert mean == pytest.approx(expected_mean, rel=1e-9)
+        assert std_dev == pytest.approx(expected_std_dev, rel=1e-9)
+
+    def test_mock_integration_produces_series(self):
+        """The mock HealthKit integration returns a compact 7-day series."""
+        series = asyncio.run(MockHealthKitIntegration().get_7day_baseline())
+
+        assert isinstance(series, HRVSeries)
+        assert len(series) in (7 * 24 * 12, 7 * 24 * 12 + 1)  # 5-minute grid inside the window
+        assert series.timestamps.itemsize == 8
@@ -0,0 +1,80 @@
+"""
+Omtobe MVP v0.1: Incremental HealthKit Sync Tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import pytz
+
+from hrv_baseline import HRVBaselineRegistry
+from hrv_series import HRVSeries
+from hrv_store import HRVSampleStore
+from integrations import MockHealthKitIntegration
+
+
+class RecordingHealthKit(MockHealthKitIntegration):
+    """Mock integration that records the requested ranges."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = []
+
+    async def get_hrv_samples(self, start_date, end_date, limit=1000):
+        self.requests.append((start_date, end_date))
+        return await super().get_hrv_samples(start_date, end_date, limit)
+
+
+class TestHRVSampleStore:
+    """Watermark + rolling window tests"""
+
+    def test_second_sync_fetches_only_new_samples(self):
+        """After the first full sync only the range after the watermark is requested."""
+        store = HRVSampleStore()
+        healthkit = RecordingHealthKit(user_id="store_user", sample_store=store)
+
+        first = asyncio.run(healthkit.get_7day_baseline())
+        first_count = len(first)
+        watermark = store.watermark("store_user")
+        second = asyncio.run(healthkit.get_7day_baseline())
+
+        (full_start, full_end), (delta_start, _) = healthkit.requests
+        assert (full_end - full_start) >= timedelta(days=7) - timedelta(seconds=1)
+        assert delta_start == watermark
+        assert len(second) <= first_count + 1
+
+    def test_ingest_ignores_seen_samples_and_evicts_expired(self):
+        """Samples at or before the watermark are ignored; old ones are evicted."""
+        now = datetime(2026, 3, 9, 12, tzinfo=pytz.UTC)
+        store = HRVSampleStore()
+        batch = HRVSeries()
+        batch.append(now - timedelta(days=8), 40.0)
+        batch.append(now - timedelta(days=1), 50.0)
+        batch.append(now - timedelta(minutes=5), 55.0)
+
+        assert store.ingest("store_user", batch, now) == 3
+        assert list(store.window("store_user").values) == [50.0, 55.0]
+
+        overlap = HRVSeries()
+        overlap.append(now - timedelta(minutes=5), 55.0)
+        overlap.append(now, 60.0)
+        assert store.ingest("store_user", overlap, now) == 1
+        assert store.watermark("store_user") == now
+        assert list(store.window("store_user").values) == [50.0, 55.0, 60.0]
+
+    def test_window_is_the_users_baseline(self):
+        """The store and the brake-check baseline share one window per user."""
+        now = datetime(2026, 3, 9, 12, tzinfo=pytz.UTC)
+        registry = HRVBaselineRegistry()
+        store = HRVSampleStore(registry)
+        batch = HRVSeries()
+        batch.append(now - timedelta(hours=1), 50.0)
+        batch.append(now, 60.0)
+
+        store.ingest("store_user", batch, now)
+        baseline = registry.get("store_user")
+        assert store.window("store_user") is baseline.window()
+        assert baseline.mean == 55.0
+
+        # Re-feeding the stored window adds nothing
+        assert baseline.update(store.window("store_user"), now=now, fetched=True) == (55.0, 5.0)
+        assert baseline.count == 2
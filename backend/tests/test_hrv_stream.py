@@ -0,0 +1,93 @@
+"""
+Omtobe MVP v0.1: Streaming HealthKit Parser Tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import json
+import httpx
+import pytest
+import pytz
+
+from hrv_stream import HRVStreamParser, parse_hrv_stream
+from integrations import HealthKitIntegration
+from resilience import Resilience
+
+
+def samples_body(count: int, start: datetime) -> bytes:
+    """HealthKit-style response body with surrounding metadata."""
+    return json.dumps({
+        "source": "Applé Watch",  # Multi-byte character before the array
+        "samples": [
+            {"timestamp": (start + timedelta(minutes=5 * i)).isoformat(), "value": 40 + i % 20, "unit": "ms"}
+            for i in range(count)
+        ],
+        "next": None,
+    }).encode("utf-8")
+
+
+def chunked(body: bytes, size: int):
+    """Split a body into fixed-size chunks."""
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+async def aiter(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestHRVStreamParser:
+    """Incremental decoding"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+    def test_matches_full_decode_for_any_chunking(self, chunk_size):
+        """Chunk boundaries (even inside UTF-8 sequences) do not change the result."""
+        start = datetime(2026, 1, 1, tzinfo=pytz.UTC)
+        body = samples_body(50, start)
+
+        series = asyncio.run(parse_hrv_stream(aiter(chunked(body, chunk_size))))
+
+        expected = json.loads(body)["samples"]
+        assert len(series) == 50
+        assert list(series.values) == [float(item["value"]) for item in expected]
+        assert series.timestamps[0] == start.timestamp()
+
+    def test_buffer_stays_bounded(self):
+        """Only the unparsed tail is buffered, not the whole body."""
+        parser = HRVStreamParser()
+        body = samples_body(2000, datetime(2026, 1, 1, tzinfo=pytz.UTC))
+        peak = 0
+        for chunk in chunked(body, 256):
+            parser.feed(chunk)
+            peak = max(peak, len(parser._buffer))
+
+        assert len(parser.close()) == 2000
+        assert peak < 512
+
+    def test_truncated_body_raises(self):
+        """A body cut off inside the array is an error, not a short series."""
+        body = samples_body(10, datetime(2026, 1, 1, tzinfo=pytz.UTC))
+        with pytest.raises(ValueError):
+            asyncio.run(parse_hrv_stream(aiter([body[: len(body) // 2]])))
+
+    def test_missing_samples_key(self):
+        """A body without samples yields an empty series."""
+        assert len(asyncio.run(parse_hrv_stream(aiter([b'{"error": null}'])))) == 0
+
+
+class TestStreamingIntegration:
+    """HealthKitIntegration streams the response body"""
+
+    def test_get_hrv_samples_streams(self):
+        """Samples come back as a series parsed from the streamed body."""
+        now = datetime.now(pytz.UTC)
+        body = samples_body(300, now - timedelta(days=1))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, stream=httpx.ByteStream(body))
+
+        healthkit = HealthKitIntegration("token", resilience=Resilience("test"))
+        healthkit.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        series = asyncio.run(healthkit.get_hrv_samples(now - timedelta(days=1), now))
+        assert len(series) == 300
@@ -0,0 +1,59 @@
+"""
+Omtobe MVP v0.1: Shared HTTP Client Pool Tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+import pytz
+
+from http_pool import HTTPClientPool
+from integrations import HealthKitIntegration, GoogleCalendarIntegration
+
+
+def healthkit_handler(request: httpx.Request) -> httpx.Response:
+    """Serve a two-sample HealthKit response."""
+    return httpx.Response(200, json={"samples": [
+        {"timestamp": "2026-03-02T10:00:00+00:00", "value": 48.0},
+        {"timestamp": "2026-03-02T10:05:00+00:00", "value": 52.0},
+    ]})
+
+
+class TestHTTPClientPool:
+    """Client pool lifecycle and injection tests"""
+
+    def test_integrations_share_one_client(self):
+        """Integrations reuse the pool's client and per-host timeouts."""
+        async def scenario():
+            pool = HTTPClientPool(
+                http2=False,
+                host_timeouts={"api.healthkit.apple.com": 2.5},
+                transport=httpx.MockTransport(healthkit_handler)
+            )
+            await pool.start()
+            healthkit = HealthKitIntegration("token", http_pool=pool)
+            calendar = GoogleCalendarIntegration("token", http_pool=pool)
+
+            now = datetime.now(pytz.UTC)
+            series = await healthkit.get_hrv_samples(now - timedelta(hours=1), now)
+            shared = healthkit.client is calendar.client is pool.client
+
+            await pool.aclose()
+            return series, shared, healthkit.timeout, calendar.timeout, healthkit.client.is_closed
+
+        series, shared, healthkit_timeout, calendar_timeout, closed = asyncio.run(scenario())
+
+        assert list(series.values) == [48.0, 52.0]
+        assert shared is True
+        assert healthkit_timeout == httpx.Timeout(2.5)
+        assert calendar_timeout == httpx.Timeout(10.0)
+        assert closed is True
+
+    def test_env_host_timeouts(self, monkeypatch):
+        """Per-host timeouts are read from HTTP_HOST_TIMEOUTS."""
+        monkeypatch.setenv("HTTP_HOST_TIMEOUTS", "www.googleapis.com=8, api.healthkit.apple.com=5")
+        pool = HTTPClientPool.from_env()
+
+        assert pool.timeout_for("https://www.googleapis.com/calendar/v3") == httpx.Timeout(8.0)
+        assert pool.timeout_for("https://api.healthkit.apple.com") == httpx.Timeout(5.0)
+        assert pool.timeout_for("https://example.com") == httpx.Timeout(10.0)
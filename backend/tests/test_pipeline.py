@@ -0,0 +1,172 @@
+"""
+Omtobe MVP v0.1: Brake Check Pipeline Tests
+
+Uses slow fake integrations to verify concurrent fetching, early
+cancellation and the overall deadline.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+import pytz
+
+from calendar_index import HighStakesEventIndex
+from hrv_series import HRVSeries
+from pipeline import BrakeCheckPipeline
+from state_machine import OmtobeStateMachine, HRVSample, CalendarEvent
+
+
+class SlowHealthKit:
+    """Fake HealthKit integration with configurable latency."""
+
+    def __init__(self, current_hrv, delay=0.2):
+        self.current_hrv = current_hrv
+        self.delay = delay
+        self.calls = []
+
+    async def get_latest_hrv(self):
+        self.calls.append("latest_hrv")
+        await asyncio.sleep(self.delay)
+        if self.current_hrv is None:
+            return None
+        return HRVSample(timestamp=datetime.now(pytz.UTC), value=self.current_hrv)
+
+    async def get_7day_baseline(self):
+        self.calls.append("baseline")
+        await asyncio.sleep(self.delay)
+        series = HRVSeries()
+        series.append(datetime.now(pytz.UTC) - timedelta(hours=1), 50.0)
+        return series
+
+
+class SlowCalendar:
+    """Fake calendar integration with configurable latency."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.cancelled = False
+
+    async def sync_event_index(self):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        now = datetime.now(pytz.UTC)
+        return HighStakesEventIndex([CalendarEvent(
+            title="Board Meeting",
+            start_time=now - timedelta(minutes=10),
+            end_time=now + timedelta(minutes=50),
+            is_high_stakes=True
+        )])
+
+
+def intervention_day_machine() -> OmtobeStateMachine:
+    """State machine on Day 4."""
+    return OmtobeStateMachine(
+        user_id="pipeline_user",
+        cycle_start_date=datetime.now(pytz.UTC) - timedelta(days=3),
+        timezone="UTC"
+    )
+
+
+class TestBrakeCheckPipeline:
+    """Concurrent fetch pipeline tests"""
+
+    def test_fetches_run_concurrently(self):
+        """Latency is close to one upstream call, not the sum of three."""
+        sm = intervention_day_machine()
+        pipeline = BrakeCheckPipeline(SlowHealthKit(35.0), SlowCalendar())
+
+        started = time.monotonic()
+        inputs = asyncio.run(pipeline.fetch(sm))
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 0.45
+        assert inputs.event_index is not None
+        should_display, _ = sm.should_display_brake_screen(
+            current_hrv=inputs.latest_hrv.value,
+            calendar_events=inputs.event_index,
+            hrv_samples=inputs.baseline_samples
+        )
+        assert should_display is True
+
+    def test_calendar_cancelled_without_hrv_drop(self):
+        """The calendar fetch is cancelled once the HRV drop test fails."""
+        calendar = SlowCalendar(delay=5.0)
+        pipeline = BrakeCheckPipeline(SlowHealthKit(49.0, delay=0.05), calendar)
+
+        inputs = asyncio.run(pipeline.fetch(intervention_day_machine()))
+
+        assert "events" in inputs.skipped
+        assert inputs.event_index is None
+        assert calendar.cancelled is True
+
+    def test_deadline_returns_partial_results(self):
+        """Fetches still running at the deadline are reported as timed out."""
+        pipeline = BrakeCheckPipeline(
+            SlowHealthKit(35.0, delay=0.05),
+            SlowCalendar(delay=5.0),
+            deadline_seconds=0.3
+        )
+
+        inputs = asyncio.run(pipeline.fetch(intervention_day_machine()))
+
+        assert inputs.latest_hrv is not None
+        assert inputs.timed_out == ["events"]
+
+    def test_outside_intervention_window_only_latest_hrv(self):
+        """Days outside 3-5 only need the latest HRV value."""
+        healthkit = SlowHealthKit(35.0, delay=0.01)
+        sm = OmtobeStateMachine(user_id="pipeline_user", timezone="UTC")
+
+        inputs = asyncio.run(BrakeCheckPipeline(healthkit, SlowCalendar()).fetch(sm))
+
+        assert healthkit.calls == ["latest_hrv"]
+        assert set(inputs.skipped) == {"baseline", "events"}
+
+    def test_failed_fetch_counts_as_missing(self):
+        """A fetch that raises is reported and its input left missing."""
+        class BrokenCalendar(SlowCalendar):
+            async def sync_event_index(self):
+                raise ValueError("malformed calendar response")
+
+        class BrokenHealthKit(SlowHealthKit):
+            async def get_latest_hrv(self):
+                raise KeyError("value")
+
+        inputs = asyncio.run(BrakeCheckPipeline(SlowHealthKit(35.0, delay=0.01), BrokenCalendar()).fetch(
+            intervention_day_machine()
+        ))
+        assert inputs.latest_hrv is not None
+        assert inputs.event_index is None
+        assert inputs.failed == ["events"]
+
+        inputs = asyncio.run(BrakeCheckPipeline(BrokenHealthKit(35.0), SlowCalendar()).fetch(
+            intervention_day_machine()
+        ))
+        assert inputs.latest_hrv is None
+        assert inputs.failed == ["latest_hrv"]
+        assert set(inputs.skipped) == {"baseline", "events"}
+
+    def test_baseline_refetched_once_stale(self):
+        """Frequent checks still re-fetch the baseline once it is older than the max age."""
+        from hrv_baseline import RollingHRVBaseline
+
+        healthkit = SlowHealthKit(49.0, delay=0.001)
+        sm = intervention_day_machine()
+        sm.hrv_baseline = RollingHRVBaseline()
+        pipeline = BrakeCheckPipeline(healthkit, SlowCalendar(delay=0.001), baseline_max_age_seconds=0.1)
+
+        async def run():
+            for _ in range(8):
+                inputs = await pipeline.fetch(sm)
+                sm.should_display_brake_screen(
+                    current_hrv=inputs.latest_hrv.value,
+                    calendar_events=inputs.event_index or [],
+                    hrv_samples=inputs.baseline_samples
+                )
+                await asyncio.sleep(0.04)
+
+        asyncio.run(run())
+        assert 2 <= healthkit.calls.count("baseline") <= 4
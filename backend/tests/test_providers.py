@@ -0,0 +1,158 @@
+"""
+Omtobe MVP v0.1: Integration Provider and Replay Tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import pytz
+
+from calendar_cache import CalendarEventCache
+from hrv_store import HRVSampleStore
+from http_pool import HTTPClientPool
+from integrations import (
+    GoogleCalendarIntegration,
+    HealthKitIntegration,
+    MockGoogleCalendarIntegration,
+    MockHealthKitIntegration
+)
+from providers import IntegrationProviderRegistry, ProviderContext, ReplayProvider
+from replay import write_fixture
+from resilience import upstream
+from synthetic import LatencyModel
+
+
+def make_registry(default: str = "real") -> IntegrationProviderRegistry:
+    context = ProviderContext(
+        http_pool=HTTPClientPool(http2=False),
+        sample_store=HRVSampleStore(),
+        event_cache=CalendarEventCache(),
+        calendar_latency=LatencyModel()
+    )
+    return IntegrationProviderRegistry(context, default=default)
+
+
+def user(user_id: str, healthkit_token=None, calendar_token=None, timezone="UTC", integration_provider=None):
+    return SimpleNamespace(
+        id=user_id, healthkit_token=healthkit_token, calendar_token=calendar_token, timezone=timezone,
+        integration_provider=integration_provider
+    )
+
+
+class TestProviderSelection:
+    """Deployment default, token fallback and per-user pins"""
+
+    def test_real_uses_tokens_and_falls_back_to_mock(self):
+        """Connected accounts get the upstream integration; others the mock."""
+        registry = make_registry("real")
+
+        hrv, calendar = registry.resolve(user("a", healthkit_token="hk"))
+        assert isinstance(hrv, HealthKitIntegration)
+        assert isinstance(calendar, MockGoogleCalendarIntegration)
+
+        hrv, calendar = registry.resolve(user("b", calendar_token="gc"))
+        assert isinstance(hrv, MockHealthKitIntegration)
+        assert isinstance(calendar, GoogleCalendarIntegration)
+
+    def test_overrides_pin_users(self):
+        """A pinned user ignores the deployment default."""
+        registry = make_registry("mock")
+        bench = user("bench")
+        registry.set_override(bench, "replay")
+
+        assert bench.integration_provider == "replay"
+        assert registry.provider_for(user("someone")) == "mock"
+        assert isinstance(registry.resolve(bench)[0], HealthKitIntegration)
+
+        registry.set_override(bench, None)
+        assert registry.provider_for(bench) == "mock"
+        with pytest.raises(KeyError):
+            registry.set_override(bench, "unknown")
+
+    def test_pin_endpoint_persists(self):
+        """Pins set through the API are stored on the user row."""
+        import main
+        from database import AsyncSessionLocal
+        from models import User
+
+        async def run():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await client.post("/api/v1/users", params={"user_id": "pinned_user", "email": "pinned_user@example.com"})
+                pinned = await client.put(
+                    "/api/v1/integrations/provider", params={"user_id": "pinned_user", "provider": "mock"}
+                )
+                unknown = await client.put(
+                    "/api/v1/integrations/provider", params={"user_id": "pinned_user", "provider": "unknown"}
+                )
+            async with AsyncSessionLocal() as db:
+                stored = await db.get(User, "pinned_user")
+            return pinned, unknown, stored
+
+        pinned, unknown, stored = asyncio.run(run())
+        assert pinned.status_code == 200
+        assert pinned.json()["provider"] == "mock"
+        assert unknown.status_code == 400
+        assert stored.integration_provider == "mock"
+
+
+class TestReplayProvider:
+    """Real integration code paths against recorded responses"""
+
+    def test_replays_recorded_payloads(self, tmp_path):
+        """HealthKit and paginated Calendar fixtures are served from disk."""
+        now = datetime.now(pytz.UTC)
+        write_fixture(tmp_path, "https://api.healthkit.apple.com/v1/samples", {
+            "samples": [
+                {"timestamp": (now - timedelta(minutes=i)).isoformat(), "value": 45 + i % 10}
+                for i in range(5000, 0, -1)
+            ]
+        })
+        calendar_url = "https://www.googleapis.com/calendar/v3/calendars/primary/events"
+        write_fixture(tmp_path, calendar_url, {
+            "items": [{
+                "id": "e1", "summary": "Board Meeting",
+                "start": {"dateTime": (now - timedelta(minutes=5)).isoformat()},
+                "end": {"dateTime": (now + timedelta(minutes=55)).isoformat()},
+            }],
+            "nextPageToken": "p2",
+        })
+        write_fixture(tmp_path, calendar_url, {
+            "items": [{"id": "e2", "summary": "Lunch", "start": {"date": "2026-01-01"}, "end": {"date": "2026-01-02"}}],
+            "nextSyncToken": "s1",
+        }, token="p2")
+
+        registry = make_registry("mock")
+        provider = ReplayProvider(str(tmp_path))
+        registry.register("replay", provider)
+        hrv, calendar = registry.resolve(user("bench", integration_provider="replay"))
+        assert hrv.resilience is not upstream("healthkit")
+        assert calendar.resilience is not upstream("google_calendar")
+
+        async def run():
+            try:
+                return await hrv.get_7day_baseline(), await calendar.sync_event_index()
+            finally:
+                await provider.aclose()
+
+        baseline, index = asyncio.run(run())
+        assert len(baseline) == 5000
+        assert index.active_at(now).event_id == "e1"
+        assert registry.context.event_cache.get("bench").sync_token == "s1"
+
+    def test_missing_fixture_is_a_404(self, tmp_path):
+        """Unrecorded endpoints degrade like an upstream error."""
+        provider = ReplayProvider(str(tmp_path))
+        hrv, _ = provider(user("bench"), make_registry().context)
+        now = datetime.now(pytz.UTC)
+
+        async def run():
+            try:
+                return await hrv.get_hrv_samples(now - timedelta(hours=1), now)
+            finally:
+                await provider.aclose()
+
+        assert len(asyncio.run(run())) == 0
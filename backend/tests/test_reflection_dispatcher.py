@@ -0,0 +1,179 @@
+"""
+Omtobe MVP v0.1: Day-7 Reflection Dispatcher Tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import pytz
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from clock import ManualClock
+from models import Base, User, StateMachineState
+from reflection_dispatcher import ReflectionDispatcher, next_reflection_instant
+from repository import StateRepository
+from state_machine import OmtobeStateMachine
+
+
+class TestNextReflectionInstant:
+    """09:00 local fire instants"""
+
+    def test_later_today_and_tomorrow(self):
+        """Before 09:00 fires today; at or after 09:00 fires tomorrow."""
+        before = datetime(2024, 1, 10, 6, 0, tzinfo=pytz.UTC)  # 07:00 in Berlin
+        fire = next_reflection_instant("Europe/Berlin", before)
+        assert fire == datetime(2024, 1, 10, 8, 0, tzinfo=pytz.UTC)
+
+        assert next_reflection_instant("Europe/Berlin", fire) == datetime(2024, 1, 11, 8, 0, tzinfo=pytz.UTC)
+
+    def test_dst_transition(self):
+        """The UTC instant moves with daylight saving time."""
+        before = datetime(2024, 3, 9, 20, 0, tzinfo=pytz.UTC)
+        first = next_reflection_instant("America/New_York", before)
+        second = next_reflection_instant("America/New_York", first)
+        assert first == datetime(2024, 3, 10, 13, 0, tzinfo=pytz.UTC)  # EDT from 02:00
+        assert second - first == timedelta(hours=24)
+
+        before = datetime(2024, 3, 9, 12, 0, tzinfo=pytz.UTC)
+        assert next_reflection_instant("America/New_York", before) == datetime(2024, 3, 9, 14, 0, tzinfo=pytz.UTC)
+
+
+class TestReflectionDispatcher:
+    """Bucket heap and dispatch"""
+
+    def test_buckets_fire_once_per_zone(self):
+        """Each timezone is one bucket, rescheduled a day later after it fires."""
+        now = datetime(2024, 1, 9, 23, 0, tzinfo=pytz.UTC)
+        calls = []
+
+        async def mark(timezone, fire_at):
+            calls.append((timezone, fire_at))
+            return ["u1", "u2"] if timezone == "UTC" else []
+
+        dispatcher = ReflectionDispatcher(mark)
+        assert dispatcher.add_zones(["UTC", "Asia/Tokyo", "UTC", "Not/AZone", None], now=now) == 2
+        assert len(dispatcher) == 2
+
+        due = dispatcher.pop_due(now=datetime(2024, 1, 10, 9, 0, tzinfo=pytz.UTC).timestamp())
+        assert [timezone for timezone, _ in due] == ["Asia/Tokyo", "UTC"]  # 00:00 UTC is 09:00 in Tokyo
+
+        for timezone, fire_at in due:
+            asyncio.run(dispatcher.dispatch(timezone, fire_at))
+
+        assert dispatcher.wakeups == 2
+        assert dispatcher.marked == 2
+        assert dispatcher.fire_at("UTC") == datetime(2024, 1, 11, 9, 0, tzinfo=pytz.UTC).timestamp()
+        assert calls[1] == ("UTC", datetime(2024, 1, 10, 9, 0, tzinfo=pytz.UTC))
+
+    def test_catch_up_fires_todays_past_instant(self):
+        """A worker started after 09:00 local dispatches that instant right away."""
+        now = datetime(2024, 1, 10, 15, 0, tzinfo=pytz.UTC)
+        dispatcher = ReflectionDispatcher(lambda timezone, fire_at: None)
+        assert dispatcher.add_zones(["UTC", "America/New_York"], now=now, catch_up=True) == 2
+
+        # 09:00 UTC has passed; 09:00 in New York (14:00 UTC) has too
+        due = dict(dispatcher.pop_due(now=now.timestamp()))
+        assert due["UTC"] == datetime(2024, 1, 10, 9, 0, tzinfo=pytz.UTC).timestamp()
+        assert due["America/New_York"] == datetime(2024, 1, 10, 14, 0, tzinfo=pytz.UTC).timestamp()
+
+        later = ReflectionDispatcher(lambda timezone, fire_at: None)
+        later.add_zones(["UTC"], now=now)
+        assert later.pop_due(now=now.timestamp()) == []
+
+
+class TestMarkReflectionDue:
+    """Bulk Day-7 UPDATE"""
+
+    def test_marks_only_day_7_users_of_zone(self, tmp_path):
+        """Only Day-7 users in the bucket's timezone are flagged, once."""
+        fire_at = datetime(2024, 1, 10, 9, 0, tzinfo=pytz.UTC)
+        users = {
+            "day7": ("UTC", fire_at - timedelta(days=6, hours=2)),
+            "day7_edge": ("UTC", fire_at - timedelta(days=6)),
+            "day6": ("UTC", fire_at - timedelta(days=5, hours=23)),
+            "day8": ("UTC", fire_at - timedelta(days=7)),
+            "other_zone": ("Asia/Tokyo", fire_at - timedelta(days=6, hours=2)),
+        }
+
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'reflection.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            try:
+                async with session_factory() as db:
+                    for user_id, (timezone, cycle_start) in users.items():
+                        db.add(User(id=user_id, email=f"{user_id}@example.com", timezone=timezone))
+                        db.add(StateMachineState(
+                            user_id=user_id, cycle_start_date=cycle_start, current_day=1, reflection_pending=0
+                        ))
+                    await db.commit()
+
+                async with session_factory() as db:
+                    first = await StateRepository(db).mark_reflection_due("UTC", fire_at)
+                    second = await StateRepository(db).mark_reflection_due("UTC", fire_at)
+                    await db.commit()
+
+                async with session_factory() as db:
+                    flagged = (await db.scalars(
+                        select(StateMachineState.user_id).where(StateMachineState.reflection_pending == 1)
+                    )).all()
+                    loaded = await StateRepository(db, ManualClock(fire_at)).load("day7")
+                return first, second, flagged, loaded
+            finally:
+                await engine.dispose()
+
+        first, second, flagged, loaded = asyncio.run(scenario())
+        assert sorted(first) == ["day7", "day7_edge"]
+        assert second == []
+        assert sorted(flagged) == ["day7", "day7_edge"]
+        assert loaded.state_machine.reflection_pending is True
+
+    def test_late_dispatch_skips_users_past_day_7(self, tmp_path):
+        """A catch-up of a past instant only flags users still on that Day 7."""
+        fire_at = datetime(2024, 1, 10, 9, 0, tzinfo=pytz.UTC)
+        now = fire_at + timedelta(hours=6)
+        users = {
+            "still_day7": fire_at - timedelta(days=6, hours=2),
+            "now_day8": fire_at - timedelta(days=6, hours=20),
+        }
+
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'late.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            try:
+                async with session_factory() as db:
+                    for user_id, cycle_start in users.items():
+                        db.add(User(id=user_id, email=f"{user_id}@example.com", timezone="UTC"))
+                        db.add(StateMachineState(
+                            user_id=user_id, cycle_start_date=cycle_start, current_day=1, reflection_pending=0
+                        ))
+                    await db.commit()
+
+                async with session_factory() as db:
+                    flagged = await StateRepository(db).mark_reflection_due("UTC", fire_at, now=now)
+                    await db.commit()
+                return flagged
+            finally:
+                await engine.dispose()
+
+        assert asyncio.run(scenario()) == ["still_day7"]
+
+
+class TestReflectionFlag:
+    """Lifetime of the reflection flag"""
+
+    def test_flag_lapses_after_day_7(self):
+        """A skipped reflection's flag is cleared once the cycle leaves Day 7."""
+        start = datetime(2024, 1, 1, tzinfo=pytz.UTC)
+        clock = ManualClock(start + timedelta(days=6, hours=10))
+        sm = OmtobeStateMachine("flag_user", cycle_start_date=start, clock=clock)
+        sm.reflection_pending = True
+        assert sm.refresh_day() == 7
+        assert sm.reflection_pending is True
+
+        clock.advance(timedelta(days=1))
+        assert sm.refresh_day() == 1
+        assert sm.reflection_pending is False
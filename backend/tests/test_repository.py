@@ -0,0 +1,185 @@
+"""
+Omtobe MVP v0.1: State Repository Tests
+
+Runs against a throwaway SQLite database.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import pytz
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from clock import ManualClock
+from models import Base, User, StateMachineState
+from repository import StateRepository, StaleStateError
+
+
+async def run_with_session(tmp_path, scenario):
+    """Create a fresh database and run `scenario(session)` against it."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'repo.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            db.add(User(id="repo_user", email="repo@example.com", timezone="UTC"))
+            await db.commit()
+        async with session_factory() as db:
+            return await scenario(db, session_factory)
+    finally:
+        await engine.dispose()
+
+
+class TestStateRepository:
+    """Joined load + UPSERT tests"""
+
+    def test_missing_user(self, tmp_path):
+        """Unknown users load as None."""
+        async def scenario(db, _):
+            return await StateRepository(db).load("nobody")
+
+        assert asyncio.run(run_with_session(tmp_path, scenario)) is None
+
+    def test_upsert_round_trip(self, tmp_path):
+        """New state is inserted once, then updated in place."""
+        cooling_start = datetime.now(pytz.UTC) - timedelta(minutes=3)
+
+        async def scenario(db, session_factory):
+            repo = StateRepository(db)
+            loaded = await repo.load("repo_user")
+            assert loaded.is_new is True
+            assert loaded.user.email == "repo@example.com"
+
+            await repo.save(loaded)
+            await db.commit()
+
+            current = await repo.load("repo_user")
+            sm = current.state_machine
+            sm.cooling_period_active = True
+            sm.cooling_period_start = cooling_start
+            await repo.save(current)
+            await db.commit()
+
+            async with session_factory() as fresh:
+                reloaded = await StateRepository(fresh).load("repo_user")
+                rows = await fresh.scalar(select(func.count()).select_from(StateMachineState))
+            return reloaded, rows
+
+        reloaded, rows = asyncio.run(run_with_session(tmp_path, scenario))
+
+        assert rows == 1
+        assert reloaded.is_new is False
+        assert reloaded.state_machine.cooling_period_active is True
+        assert reloaded.state_machine.cooling_period_start == cooling_start
+        assert reloaded.state_machine.cycle_start_date.tzinfo is not None
+        assert reloaded.version == 2
+
+    def test_stale_save_is_rejected(self, tmp_path):
+        """A copy loaded before another write (or a bulk UPDATE) cannot overwrite it."""
+        async def scenario(db, session_factory):
+            repo = StateRepository(db)
+            await repo.save(await repo.load("repo_user"))
+            await db.commit()
+
+            stale = await repo.load("repo_user")
+            async with session_factory() as other:
+                other_repo = StateRepository(other)
+                fresh = await other_repo.load("repo_user")
+                fresh.state_machine.cooling_period_active = True
+                await other_repo.save(fresh)
+                await other.commit()
+
+            stale.state_machine.decision_locked_for_event = "evt"
+            try:
+                await repo.save(stale)
+                raise AssertionError("expected StaleStateError")
+            except StaleStateError:
+                await db.rollback()
+
+            new_user = await repo.load("repo_user")
+            new_user.is_new, new_user.version = True, 0  # A concurrent first write
+            try:
+                await repo.save(new_user)
+                raise AssertionError("expected StaleStateError")
+            except StaleStateError:
+                await db.rollback()
+
+            async with session_factory() as fresh_db:
+                return await StateRepository(fresh_db).load("repo_user")
+
+        reloaded = asyncio.run(run_with_session(tmp_path, scenario))
+        assert reloaded.version == 2
+        assert reloaded.state_machine.cooling_period_active is True
+        assert reloaded.state_machine.decision_locked_for_event is None
+
+    def test_roll_over_cycles_in_chunks(self, tmp_path):
+        """Ended cycles advance by whole 7-day periods with transient state cleared, chunk by chunk."""
+        now = datetime(2024, 1, 20, 0, 0, 5, tzinfo=pytz.UTC)
+
+        async def scenario(db, session_factory):
+            starts = {
+                "repo_user": now - timedelta(days=7, hours=1),
+                "old_user": now - timedelta(days=30),
+                "ended_user": now - timedelta(days=7),
+                "active_user": now - timedelta(days=6, hours=23),
+            }
+            for user_id, start in starts.items():
+                if user_id != "repo_user":
+                    db.add(User(id=user_id, email=f"{user_id}@example.com", timezone="UTC"))
+                db.add(StateMachineState(
+                    user_id=user_id, cycle_start_date=start, current_day=7,
+                    cooling_period_active=1, cooling_period_start=start,
+                    decision_locked_for_event="evt", reflection_pending=1
+                ))
+            await db.commit()
+
+            repo = StateRepository(db, ManualClock(now))
+            chunks = []
+            while True:
+                chunk = await repo.roll_over_cycles(now, limit=2)
+                await db.commit()
+                if not chunk:
+                    break
+                chunks.append(chunk)
+
+            async with session_factory() as fresh:
+                fresh_repo = StateRepository(fresh, ManualClock(now))
+                loaded = {user_id: (await fresh_repo.load(user_id)).state_machine for user_id in starts}
+            return chunks, loaded
+
+        chunks, loaded = asyncio.run(run_with_session(tmp_path, scenario))
+
+        assert sorted(chunks[0]) == ["old_user", "repo_user"]  # oldest first
+        assert sum(chunk.count("old_user") for chunk in chunks) == 4  # 30 days = 4 whole periods
+        assert {user_id for chunk in chunks for user_id in chunk} == {"old_user", "repo_user", "ended_user"}
+
+        rolled = loaded["repo_user"]
+        assert rolled.cycle_start_date == now - timedelta(hours=1)  # Where the old cycle ended
+        assert rolled.current_day == 1
+        assert rolled.cooling_period_active is False
+        assert rolled.decision_locked_for_event is None
+        assert rolled.reflection_pending is False
+        assert loaded["old_user"].cycle_start_date == now - timedelta(days=2)
+        assert loaded["old_user"].current_day == 3
+        assert loaded["ended_user"].cycle_start_date == now
+
+        active = loaded["active_user"]
+        assert active.cycle_start_date == now - timedelta(days=6, hours=23)
+        assert active.cooling_period_active is True
+        assert active.reflection_pending is True
+
+    def test_save_writes_naive_utc(self, tmp_path):
+        """Timezone-aware state is stored as naive UTC (what asyncpg expects for DateTime)."""
+        cooling_start = pytz.timezone("Asia/Tokyo").localize(datetime(2024, 1, 3, 9, 0))
+
+        async def scenario(db, _):
+            repo = StateRepository(db)
+            loaded = await repo.load("repo_user")
+            loaded.state_machine.cooling_period_start = cooling_start
+            await repo.save(loaded)
+            await db.commit()
+            return await db.scalar(select(StateMachineState.cooling_period_start))
+
+        stored = asyncio.run(run_with_session(tmp_path, scenario))
+        assert stored == datetime(2024, 1, 3, 0, 0)
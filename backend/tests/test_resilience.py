@@ -0,0 +1,209 @@
+"""
+Omtobe MVP v0.1: Upstream Resilience Tests
+
+Drives the resilience policy against scripted upstreams served by
+httpx.MockTransport.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+import pytest
+import pytz
+
+from integrations import HealthKitIntegration
+from resilience import CircuitBreaker, CircuitOpenError, Resilience, TokenBucket
+
+
+def scripted_client(statuses):
+    """Client answering with the given status codes in turn."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(statuses[min(len(calls), len(statuses)) - 1], json={"samples": []})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+def fast_policy(**kwargs) -> Resilience:
+    """Policy without meaningful backoff delays."""
+    return Resilience("test", base_delay=0.001, max_delay=0.001, **kwargs)
+
+
+class TestRetries:
+    """Retry classification and backoff"""
+
+    def test_retries_transient_errors_then_succeeds(self):
+        """503s are retried; the first good response is returned."""
+        client, calls = scripted_client([503, 503, 200])
+        policy = fast_policy(max_attempts=3)
+
+        response = asyncio.run(policy.call(lambda: client.get("https://upstream/x")))
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert policy.metrics.retries == 2
+        assert policy.metrics.successes == 1
+
+    def test_client_errors_are_not_retried(self):
+        """A 410 is returned immediately for the caller to handle."""
+        client, calls = scripted_client([410])
+        policy = fast_policy()
+
+        response = asyncio.run(policy.call(lambda: client.get("https://upstream/x")))
+
+        assert response.status_code == 410
+        assert len(calls) == 1
+
+    def test_exhausted_attempts_raise(self):
+        """Persistent 5xx raises HTTPStatusError after the last attempt."""
+        client, calls = scripted_client([500])
+        policy = fast_policy(max_attempts=2)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(policy.call(lambda: client.get("https://upstream/x")))
+        assert len(calls) == 2
+        assert policy.metrics.failures == 1
+
+    def test_slow_attempt_times_out(self):
+        """An attempt exceeding the attempt timeout counts as a transport failure."""
+        policy = fast_policy(max_attempts=1, attempt_timeout=0.01)
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(httpx.TimeoutException):
+            asyncio.run(policy.call(slow))
+
+    def test_request_timeout_bounds_attempt(self):
+        """Without a policy cap, the request's own (per-host) timeout bounds each attempt."""
+        policy = fast_policy(max_attempts=1)
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(httpx.TimeoutException):
+            asyncio.run(policy.call(slow, timeout=httpx.Timeout(0.01)))
+        assert policy._attempt_timeout(httpx.Timeout(8)) == 8
+        assert fast_policy(attempt_timeout=3)._attempt_timeout(httpx.Timeout(8)) == 3
+
+
+class TestCircuitBreaker:
+    """Fail-fast behaviour"""
+
+    def test_open_circuit_short_circuits(self):
+        """After the threshold, calls fail without reaching the upstream."""
+        client, calls = scripted_client([503])
+        policy = fast_policy(max_attempts=1, failure_threshold=2, reset_timeout=60)
+
+        async def run():
+            for _ in range(2):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await policy.call(lambda: client.get("https://upstream/x"))
+            with pytest.raises(CircuitOpenError):
+                await policy.call(lambda: client.get("https://upstream/x"))
+
+        asyncio.run(run())
+        assert len(calls) == 2
+        assert policy.metrics.short_circuits == 1
+
+    def test_half_open_probe(self):
+        """After the reset timeout one probe is allowed; success closes the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_cancelled_probe_is_released(self):
+        """A probe that is cancelled (or raises unexpectedly) does not block later probes."""
+        policy = fast_policy(max_attempts=1, failure_threshold=1, reset_timeout=0)
+        policy.breaker.record_failure()
+
+        async def run():
+            async def hang():
+                await asyncio.sleep(10)
+
+            probe = asyncio.ensure_future(policy.call(hang))
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+            async def broken():
+                raise ValueError("bad payload")
+
+            with pytest.raises(ValueError):
+                await policy.call(broken)
+            return await policy.call(lambda: asyncio.sleep(0, httpx.Response(200)))
+
+        assert asyncio.run(run()).status_code == 200
+        assert policy.breaker.state == CircuitBreaker.CLOSED
+
+    def test_caller_timeouts_are_not_upstream_failures(self):
+        """Callers giving up, even while waiting for a rate-limit token, never open the circuit."""
+        policy = fast_policy(max_attempts=1, failure_threshold=3, rate=1, burst=1)
+
+        async def slow():
+            await asyncio.sleep(1)
+            return httpx.Response(200)
+
+        async def run():
+            for _ in range(5):
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(policy.call(slow), 0.05)
+            return policy.breaker.state, policy.breaker.failures
+
+        assert asyncio.run(run()) == (CircuitBreaker.CLOSED, 0)
+
+
+class TestHedgingAndRateLimit:
+    """Hedged requests and token bucket"""
+
+    def test_hedge_beats_slow_first_request(self):
+        """A hedged request answers when the first one stalls."""
+        attempts = []
+
+        async def request():
+            attempts.append(1)
+            if len(attempts) == 1:
+                await asyncio.sleep(1)
+            return httpx.Response(200)
+
+        policy = fast_policy(hedge_after=0.01, attempt_timeout=2)
+        response = asyncio.run(policy.call(request))
+
+        assert response.status_code == 200
+        assert policy.metrics.hedges == 1
+        assert policy.metrics.hedge_wins == 1
+
+    def test_token_bucket_limits_rate(self):
+        """Requests beyond the burst wait for refills."""
+        bucket = TokenBucket(rate=100, capacity=2)
+        assert bucket.try_acquire() and bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+        waited = asyncio.run(bucket.acquire())
+        assert waited > 0
+
+
+class TestIntegrationFallback:
+    """Integrations degrade to empty results"""
+
+    def test_healthkit_returns_empty_when_upstream_down(self):
+        """Final failure yields an empty series instead of an exception."""
+        client, calls = scripted_client([503])
+        healthkit = HealthKitIntegration("token", resilience=fast_policy(max_attempts=2))
+        healthkit.client = client
+        now = datetime.now(pytz.UTC)
+
+        samples = asyncio.run(healthkit.get_hrv_samples(now - timedelta(hours=1), now))
+
+        assert len(samples) == 0
+        assert len(calls) == 2
@@ -0,0 +1,222 @@
+"""
+Omtobe MVP v0.1: Cooling-Period Scheduler and Push Hub Tests
+"""
+
+import asyncio
+from datetime import datetime
+import time
+
+from push import PushHub, PushRelay, RelayedMessage
+from scheduler import CoolingPeriodScheduler
+
+
+async def noop(user_id):
+    pass
+
+
+class TestCoolingPeriodScheduler:
+    """Heap ordering, rescheduling and timed firing"""
+
+    def test_pop_due_in_order_with_lazy_deletion(self):
+        """Due users come out earliest first; superseded entries are skipped."""
+        scheduler = CoolingPeriodScheduler(noop)
+        scheduler.restore([("c", 30.0), ("a", 10.0), ("b", 20.0)])
+        asyncio.run(scheduler.schedule("a", 40.0))  # moved later
+        asyncio.run(scheduler.cancel("b"))
+
+        assert scheduler.next_due() == 30.0
+        assert scheduler.pop_due(now=35.0) == ["c"]
+        assert scheduler.pop_due(now=100.0) == ["a"]
+        assert len(scheduler) == 0
+
+    def test_persistence_callbacks(self):
+        """Scheduling persists the timer; firing removes it."""
+        persisted, removed, fired = {}, [], []
+
+        async def persist(user_id, due):
+            persisted[user_id] = due
+
+        async def remove(user_id):
+            removed.append(user_id)
+
+        async def fire(user_id):
+            fired.append(user_id)
+
+        scheduler = CoolingPeriodScheduler(fire, persist=persist, remove=remove)
+
+        async def run():
+            runner = asyncio.ensure_future(scheduler.run())
+            await scheduler.schedule("u", time.time() + 0.05)
+            await asyncio.sleep(0.15)
+            runner.cancel()
+
+        asyncio.run(run())
+        assert "u" in persisted
+        assert fired == ["u"]
+        assert removed == ["u"]
+
+    def test_cancel_removes_timer_held_elsewhere(self):
+        """Cancelling deletes the stored timer even if another worker scheduled it."""
+        removed = []
+
+        async def remove(user_id):
+            removed.append(user_id)
+
+        scheduler = CoolingPeriodScheduler(noop, remove=remove)
+        asyncio.run(scheduler.cancel("elsewhere"))
+        assert removed == ["elsewhere"]
+
+    def test_fires_at_due_time_not_before(self):
+        """Timers fire no earlier than their due time, earlier timers first."""
+        fired = []
+
+        async def fire(user_id):
+            fired.append((user_id, time.time()))
+
+        scheduler = CoolingPeriodScheduler(fire)
+
+        async def run():
+            runner = asyncio.ensure_future(scheduler.run())
+            start = time.time()
+            await scheduler.schedule("late", start + 0.12)
+            await asyncio.sleep(0.01)
+            # Scheduling an earlier timer wakes the runner
+            await scheduler.schedule("early", start + 0.05)
+            await asyncio.sleep(0.25)
+            runner.cancel()
+            return start
+
+        start = asyncio.run(run())
+        assert [user_id for user_id, _ in fired] == ["early", "late"]
+        assert fired[0][1] >= start + 0.05
+        assert fired[1][1] >= start + 0.12
+
+    def test_only_the_claiming_worker_fires(self):
+        """Workers sharing a stored timer fire it once; the claim replaces removal."""
+        stored = {"u": 0.0}
+        fired, removed = [], []
+
+        async def claim(user_id):
+            return stored.pop(user_id, None) is not None
+
+        async def fire(user_id):
+            fired.append(user_id)
+
+        async def remove(user_id):
+            removed.append(user_id)
+
+        workers = [CoolingPeriodScheduler(fire, remove=remove, claim=claim) for _ in range(2)]
+
+        async def run():
+            runners = []
+            for scheduler in workers:
+                scheduler.restore([("u", time.time() + 0.02)])
+                runners.append(asyncio.ensure_future(scheduler.run()))
+            await asyncio.sleep(0.1)
+            for runner in runners:
+                runner.cancel()
+
+        asyncio.run(run())
+        assert fired == ["u"]
+        assert removed == []
+
+    def test_restore_skips_known_timers(self):
+        """Periodic restores do not pile up duplicate heap entries."""
+        scheduler = CoolingPeriodScheduler(noop)
+        scheduler.restore([("u", 10.0)])
+        scheduler.restore([("u", 10.0)])
+        assert len(scheduler._heap) == 1
+
+
+class TestPushHub:
+    """Per-user fan-out"""
+
+    def test_publish_reaches_subscribers(self):
+        """Messages go to the user's subscribers only; slow readers drop old messages."""
+        hub = PushHub(queue_size=2)
+
+        async def run():
+            stream = hub.subscribe("u")
+            first = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+            assert hub.subscriber_count("u") == 1
+            assert hub.publish("other", {"n": 0}) == 0
+            hub.publish("u", {"n": 1})
+            received = [await first]
+            for n in (2, 3, 4):
+                hub.publish("u", {"n": n})
+            received += [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            return received
+
+        assert asyncio.run(run()) == [{"n": 1}, {"n": 3}, {"n": 4}]
+        assert hub.subscriber_count("u") == 0
+
+
+class TestPushRelay:
+    """Cross-worker delivery through a shared store"""
+
+    def test_pushes_reach_other_workers_once(self):
+        """Each worker delivers its own pushes directly and the others' by polling."""
+        table = []
+
+        async def store(origin, messages):
+            for user_id, message in messages:
+                table.append(RelayedMessage(len(table) + 1, origin, user_id, message, datetime.utcnow()))
+
+        async def load(since):
+            return [row for row in table if row.created_at > since]
+
+        hubs = [PushHub(), PushHub()]
+        relays = [PushRelay(hub, f"worker{i}", store, load) for i, hub in enumerate(hubs)]
+
+        async def run():
+            streams = [hub.subscribe("u") for hub in hubs]
+            reads = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+            await asyncio.sleep(0)
+            local = await relays[0].publish("u", {"n": 1})
+            polled = [await relay.poll() for relay in relays]
+            repolled = await relays[1].poll()
+            received = [await read for read in reads]
+            for stream in streams:
+                await stream.aclose()
+            return local, polled, repolled, received
+
+        local, polled, repolled, received = asyncio.run(run())
+        assert local == 1
+        assert polled == [0, 1]  # The origin skips its own message
+        assert repolled == 0
+        assert received == [{"n": 1}, {"n": 1}]
+
+
+class TestStoredReevaluations:
+    """Shared timer rows"""
+
+    def test_upsert_and_single_claim(self):
+        """Concurrent Delays upsert one row; only one claim of a due timer succeeds."""
+        import main
+        from sqlalchemy import select
+        from database import AsyncSessionLocal
+        from models import ScheduledReevaluation, User
+
+        async def run():
+            async with AsyncSessionLocal() as db:
+                if await db.get(User, "timer_user") is None:
+                    db.add(User(id="timer_user", email="timer_user@example.com"))
+                    await db.commit()
+            await asyncio.gather(*(
+                main.persist_reevaluation("timer_user", time.time() + offset) for offset in (60, 120, 180)
+            ))
+            not_due = await main.claim_reevaluation("timer_user")
+            await main.persist_reevaluation("timer_user", time.time() - 1)
+            async with AsyncSessionLocal() as db:
+                rows = (await db.scalars(
+                    select(ScheduledReevaluation).where(ScheduledReevaluation.user_id == "timer_user")
+                )).all()
+            claims = await asyncio.gather(*(main.claim_reevaluation("timer_user") for _ in range(3)))
+            return not_due, len(rows), claims
+
+        not_due, row_count, claims = asyncio.run(run())
+        assert not_due is False
+        assert row_count == 1
+        assert sorted(claims) == [False, False, True]
@@ -0,0 +1,39 @@
+"""
+Omtobe MVP v0.1: Startup Schema Upgrade Tests
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+from models import Base
+from schema import upgrade_schema
+
+
+class TestUpgradeSchema:
+    """Additive upgrades of existing databases"""
+
+    def test_adds_missing_columns_and_indexes(self, tmp_path):
+        """A table created before new columns existed is upgraded in place."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE state_machine_states ("
+                "id INTEGER PRIMARY KEY, user_id VARCHAR(255) NOT NULL UNIQUE, "
+                "cycle_start_date DATETIME NOT NULL, current_day INTEGER NOT NULL)"
+            ))
+            conn.execute(text(
+                "INSERT INTO state_machine_states (user_id, cycle_start_date, current_day) "
+                "VALUES ('old_user', '2024-01-01 00:00:00', 3)"
+            ))
+        Base.metadata.create_all(bind=engine)
+
+        applied = upgrade_schema(engine)
+        assert "state_machine_states.reflection_pending" in applied
+        assert "state_machine_states:ix_state_cycle_start" in applied
+
+        inspector = inspect(engine)
+        assert "ix_state_cycle_start" in {index["name"] for index in inspector.get_indexes("state_machine_states")}
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT reflection_pending FROM state_machine_states")).scalar() == 0
+
+        assert upgrade_schema(engine) == []
+        engine.dispose()
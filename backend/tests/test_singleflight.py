@@ -0,0 +1,90 @@
+"""
+Omtobe MVP v0.1: Single-Flight Coalescing Tests
+"""
+
+import asyncio
+import pytest
+
+from hrv_store import HRVSampleStore
+from integrations import MockHealthKitIntegration, baseline_sync_flights
+from singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Coalescing, error sharing and cancellation"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Callers arriving while a call is in flight get its result."""
+        flights = SingleFlight()
+        executions = []
+
+        async def work():
+            executions.append(1)
+            await asyncio.sleep(0.01)
+            return len(executions)
+
+        async def run():
+            results = await asyncio.gather(*(flights.do("user", work) for _ in range(5)))
+            later = await flights.do("user", work)
+            return results, later
+
+        results, later = asyncio.run(run())
+        assert results == [1] * 5
+        assert later == 2
+        assert flights.calls == 2
+        assert flights.shared == 4
+        assert not flights.in_flight("user")
+
+    def test_keys_are_independent_and_errors_shared(self):
+        """Different keys run separately; a failure reaches every waiter."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        async def ok():
+            return "ok"
+
+        async def run():
+            return await asyncio.gather(
+                flights.do("a", fail), flights.do("a", fail), flights.do("b", ok),
+                return_exceptions=True
+            )
+
+        first, second, other = asyncio.run(run())
+        assert isinstance(first, ValueError) and first is second
+        assert other == "ok"
+
+    def test_cancelled_caller_does_not_cancel_flight(self):
+        """A disconnecting caller leaves the shared work running."""
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def run():
+            leader = asyncio.ensure_future(flights.do("user", work))
+            follower = asyncio.ensure_future(flights.do("user", work))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(run()) == "done"
+
+    def test_concurrent_baseline_syncs_fetch_once(self):
+        """Simultaneous baseline syncs for one user make one upstream fetch."""
+        store = HRVSampleStore()
+        healthkit = MockHealthKitIntegration(user_id="flight_user", sample_store=store)
+        calls_before = baseline_sync_flights.calls
+
+        async def run():
+            return await asyncio.gather(*(healthkit.get_7day_baseline() for _ in range(3)))
+
+        windows = asyncio.run(run())
+        assert baseline_sync_flights.calls == calls_before + 1
+        assert windows[0] is windows[1] is windows[2]
+        assert len(windows[0]) > 0
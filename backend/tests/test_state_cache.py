@@ -0,0 +1,80 @@
+"""
+Omtobe MVP v0.1: State Cache Tests
+"""
+
+from datetime import datetime, timedelta
+import pytz
+
+from models import User
+from repository import LoadedState
+from state_cache import StateMachineCache
+from state_machine import OmtobeStateMachine
+
+
+def make_loaded(user_id: str, days_ago: int = 0) -> LoadedState:
+    """Build a cache entry without touching the database."""
+    sm = OmtobeStateMachine(
+        user_id=user_id,
+        cycle_start_date=datetime.now(pytz.UTC) - timedelta(days=days_ago),
+        timezone="UTC"
+    )
+    user = User(id=user_id, email=f"{user_id}@example.com", timezone="UTC")
+    return LoadedState(user=user, state_machine=sm, is_new=True)
+
+
+class TestStateMachineCache:
+    """LRU + TTL cache tests"""
+
+    def test_hit_refreshes_current_day(self):
+        """Cached entries are returned with a recomputed cycle day."""
+        cache = StateMachineCache(ttl_seconds=60)
+        loaded = make_loaded("cache_user", days_ago=3)
+        loaded.state_machine.current_day = 1  # Simulate an entry cached yesterday
+        cache.put("cache_user", loaded)
+
+        hit = cache.get("cache_user")
+
+        assert hit.is_new is False
+        assert hit.state_machine.current_day == 4
+        assert cache.hits == 1
+
+    def test_requests_get_their_own_copy(self):
+        """Mutating a hit (or the stored original) never changes the cached entry."""
+        cache = StateMachineCache(ttl_seconds=60)
+        loaded = make_loaded("cache_user")
+        cache.put("cache_user", loaded)
+        loaded.state_machine.cooling_period_active = True
+
+        first = cache.get("cache_user")
+        first.state_machine.decision_locked_for_event = "evt"
+        second = cache.get("cache_user")
+
+        assert first.state_machine is not second.state_machine
+        assert second.state_machine.cooling_period_active is False
+        assert second.state_machine.decision_locked_for_event is None
+
+    def test_ttl_expiry(self):
+        """Entries expire after the TTL."""
+        cache = StateMachineCache(ttl_seconds=0)
+        cache.put("cache_user", make_loaded("cache_user"))
+
+        assert cache.get("cache_user") is None
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        """The oldest untouched entries are evicted to stay within budget."""
+        probe = StateMachineCache()
+        probe.put("probe", make_loaded("probe"))
+        entry_size = probe.size_bytes
+
+        cache = StateMachineCache(ttl_seconds=60, max_bytes=entry_size * 3 + entry_size // 2)
+        for i in range(3):
+            cache.put(f"user_{i}", make_loaded(f"user_{i}"))
+        cache.get("user_0")  # Touch so user_1 becomes least recently used
+        cache.put("user_3", make_loaded("user_3"))
+
+        assert cache.get("user_1") is None
+        assert cache.get("user_0") is not None
+        assert cache.get("user_3") is not None
+        assert cache.size_bytes <= cache.max_bytes
@@ -0,0 +1,125 @@
+"""
+Omtobe MVP v0.1: Clock and State-Machine Replay Tests
+"""
+
+from datetime import datetime, timedelta
+import pytz
+
+from clock import ManualClock
+from hrv_series import HRVSeries
+from state_machine import CalendarEvent, DecisionType, OmtobeStateMachine
+from state_replay import ReplayEngine, SimulatedUser, UserTrace, replay_user, summarize
+
+START = datetime(2024, 1, 1, tzinfo=pytz.UTC)  # Monday 00:00 UTC
+
+
+def make_trace(user_id: str = "replay_user", days: int = 14, delay_at=None) -> UserTrace:
+    """Half-hourly HRV of 60 ms, dropping to 40 ms during a Board meeting on Day 3."""
+    meeting_start = START + timedelta(days=2, hours=10)
+    meeting_end = meeting_start + timedelta(hours=1)
+    hrv = HRVSeries()
+    for step in range(days * 48):
+        timestamp = START + timedelta(minutes=30 * step)
+        hrv.append(timestamp, 40.0 if meeting_start <= timestamp <= meeting_end else 60.0)
+
+    decisions = [(delay_at.timestamp(), DecisionType.DELAY)] if delay_at else []
+    return UserTrace(
+        user_id=user_id,
+        cycle_start_date=START,
+        hrv=hrv,
+        events=[CalendarEvent("Board Meeting", meeting_start, meeting_end, is_high_stakes=True)],
+        decisions=decisions
+    )
+
+
+class TestClock:
+    """Injected clock"""
+
+    def test_state_machine_follows_manual_clock(self):
+        """Cycle day and cooling expiry are evaluated against the injected clock."""
+        clock = ManualClock(START)
+        sm = OmtobeStateMachine("clock_user", cycle_start_date=START, clock=clock)
+        assert sm.current_day == 1
+
+        clock.advance(timedelta(days=3, hours=1))
+        assert sm._calculate_day() == 4
+
+        sm.handle_brake_response(DecisionType.DELAY)
+        assert sm.cooling_period_start == clock.now()
+        clock.advance(sm.COOLING_PERIOD_SECONDS - 1)
+        assert sm._is_cooling_period_expired() is False
+        clock.advance(1)
+        assert sm._is_cooling_period_expired() is True
+
+
+class TestSimulatedJobs:
+    """Server-side jobs in replays"""
+
+    def test_rollover_keeps_cycle_boundary(self):
+        """A cycle starting mid-day rolls over to where it ended, without repeating Day 1."""
+        start = START + timedelta(hours=18)
+        user = SimulatedUser("rollover_user", start)
+
+        transitions = user.advance((start + timedelta(days=8)).timestamp())
+
+        assert [t["type"] for t in transitions][0] == "cycle_reset"
+        assert user.sm.cycle_start_date == start + timedelta(days=7)
+        assert user.sm.current_day == 2
+
+
+class TestReplay:
+    """Offline replay of recorded traces"""
+
+    def test_replay_user(self):
+        """Brake displays, cooling periods, reflections and rollovers over two cycles."""
+        result = replay_user(make_trace())
+
+        assert result.checks == 14 * 48
+        assert result.brake_displays == 3  # 10:00, 10:30 and 11:00 on Day 3
+        assert result.displays_by_day[2] == 3
+        assert result.cycles_completed == 1
+        assert result.reflections_due == 2
+
+    def test_recorded_delay_suppresses_display(self):
+        """A Delay at 10:25 holds the 10:30 check inside the cooling period."""
+        result = replay_user(make_trace(delay_at=START + timedelta(days=2, hours=10, minutes=25)))
+
+        assert result.decisions == 1
+        assert result.brake_displays == 2
+
+    def test_threshold_override(self):
+        """Overrides apply to state-machine constants only."""
+        assert replay_user(make_trace(), {"HRV_THRESHOLD_PERCENT": 0.5}).brake_displays == 0
+
+        try:
+            replay_user(make_trace(), {"hrv_baseline": None})
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+    def test_parallel_matches_inline(self):
+        """Worker processes produce the same results as an inline replay."""
+        traces = [make_trace(f"user_{i}", days=7) for i in range(4)]
+
+        inline = ReplayEngine(workers=1).run(traces)
+        parallel = ReplayEngine(workers=2).run(traces)
+
+        assert parallel == inline
+        assert summarize(parallel)["brake_displays"] == 12
+
+    def test_trace_from_dict(self):
+        """JSON traces parse ISO timestamps and enum values."""
+        trace = UserTrace.from_dict({
+            "user_id": "json_user",
+            "cycle_start_date": "2024-01-01T00:00:00Z",
+            "timezone": "Europe/Berlin",
+            "hrv": [["2024-01-01T00:05:00Z", 61.0], ["2024-01-01T00:10:00+00:00", 59.5]],
+            "events": [{"title": "!Offer", "start": "2024-01-03T10:00:00Z", "end": 1704279600}],
+            "decisions": [["2024-01-03T10:02:00Z", "Proceed"]],
+        })
+
+        assert trace.cycle_start_date == START
+        assert list(trace.hrv.values) == [61.0, 59.5]
+        assert trace.hrv.timestamps[1] - trace.hrv.timestamps[0] == 300
+        assert trace.events[0].end_time == datetime(2024, 1, 3, 11, tzinfo=pytz.UTC)
+        assert trace.decisions[0][1] == DecisionType.PROCEED
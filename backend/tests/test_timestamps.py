@@ -0,0 +1,81 @@
+"""
+Omtobe MVP v0.1: Bulk Timestamp Decoding Tests
+"""
+
+from datetime import datetime
+
+import pytest
+import pytz
+
+from integrations import GoogleCalendarIntegration
+from timestamps import TimestampDecoder, parse_epoch, parse_epochs
+
+
+class TestTimestampDecoding:
+    """Fast path agrees with the standard library"""
+
+    def test_matches_fromisoformat(self):
+        """Offsets, Z, fractions and naive values decode like fromisoformat."""
+        values = [
+            "2026-03-01T09:30:00Z",
+            "2026-03-01T09:30:00+00:00",
+            "2026-03-01T09:30:00.250000-05:00",
+            "2026-12-31T23:59:59+0530",
+            "2024-02-29T12:00:00",
+            "1999-01-01 00:00:00+01:00",
+        ]
+        expected = []
+        for value in values:
+            parsed = datetime.fromisoformat(value)
+            if parsed.tzinfo is None:
+                parsed = pytz.UTC.localize(parsed)
+            expected.append(parsed.timestamp())
+
+        assert list(parse_epochs(values)) == expected
+
+    def test_date_only_all_day_form(self):
+        """Date-only values are midnight in the decoder's timezone."""
+        assert parse_epoch("2026-03-01") == datetime(2026, 3, 1, tzinfo=pytz.UTC).timestamp()
+
+        eastern = pytz.timezone("US/Eastern")
+        assert TimestampDecoder(eastern).decode("2026-03-01") == eastern.localize(datetime(2026, 3, 1)).timestamp()
+
+    def test_unusual_forms_fall_back(self):
+        """Forms outside the fast path still decode."""
+        assert parse_epoch("2026-03-01T09:30Z") == datetime(2026, 3, 1, 9, 30, tzinfo=pytz.UTC).timestamp()
+
+    def test_out_of_range_fields_rejected(self):
+        """Invalid dates and times raise like fromisoformat instead of rolling over."""
+        for value in ("2026-13-45T25:61:61Z", "2026-02-30", "2026-02-29", "2026-03-01T24:00:00Z",
+                      "2026-03-01T09:30:00+25:00", "2026-+3-01"):
+            with pytest.raises(ValueError):
+                parse_epoch(value)
+        assert parse_epoch("2024-02-29") == datetime(2024, 2, 29, tzinfo=pytz.UTC).timestamp()
+
+
+class TestCalendarEventEpochs:
+    """Calendar events carry epoch bounds"""
+
+    def test_all_day_and_timed_events(self):
+        """Both dateTime and all-day date events parse to aware datetimes and epochs."""
+        events = GoogleCalendarIntegration._parse_events([
+            {"id": "a", "summary": "Board offsite", "start": {"date": "2026-03-02"}, "end": {"date": "2026-03-03"}},
+            {"id": "b", "summary": "! Pitch", "start": {"dateTime": "2026-03-02T10:00:00+01:00"},
+             "end": {"dateTime": "2026-03-02T11:00:00+01:00"}},
+        ])
+
+        assert events[0].end_epoch - events[0].start_epoch == 86400
+        assert events[0].start_time == datetime(2026, 3, 2, tzinfo=pytz.UTC)
+        assert events[1].start_time == datetime(2026, 3, 2, 9, tzinfo=pytz.UTC)
+        assert events[1].start_epoch == events[1].start_time.timestamp()
+
+    def test_all_day_events_in_user_timezone(self):
+        """All-day events start at the user's local midnight."""
+        tokyo = pytz.timezone("Asia/Tokyo")
+        events = GoogleCalendarIntegration._parse_events(
+            [{"id": "a", "summary": "Board offsite", "start": {"date": "2026-03-02"}, "end": {"date": "2026-03-03"}}],
+            tokyo
+        )
+
+        assert events[0].start_time == tokyo.localize(datetime(2026, 3, 2))
+        assert events[0].start_epoch == datetime(2026, 3, 1, 15, tzinfo=pytz.UTC).timestamp()
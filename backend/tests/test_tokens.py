@@ -0,0 +1,275 @@
+"""
+Omtobe MVP v0.1: OAuth Token Manager Tests
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from http_pool import HTTPClientPool
+from integrations import GoogleCalendarIntegration
+from resilience import upstream_metrics
+from tokens import Credential, OAuthRefresher, TokenManager, TokenRefreshError
+
+
+class FakeRefresher:
+    """Issues numbered tokens after a short delay."""
+
+    def __init__(self, lifetime: float = 3600, fail: bool = False, rejected: bool = False, rotate: bool = False):
+        self.lifetime = lifetime
+        self.fail = fail
+        self.rejected = rejected
+        self.rotate = rotate
+        self.calls = 0
+
+    async def refresh(self, provider, refresh_token):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail or self.rejected:
+            raise TokenRefreshError("refresh rejected", rejected=self.rejected)
+        rotated = f"{provider}-refresh-{self.calls}" if self.rotate else None
+        return f"{provider}-access-{self.calls}", self.lifetime, rotated
+
+
+class TestTokenManager:
+    """Caching, proactive refresh and deduplication"""
+
+    def test_fresh_token_served_from_cache(self):
+        """A valid token outside the margin is returned without refreshing."""
+        refresher = FakeRefresher()
+        manager = TokenManager(refresher, refresh_margin=300)
+        manager.register("u", "google_calendar", "refresh", "cached", time.time() + 3600)
+
+        assert asyncio.run(manager.get("u", "google_calendar")) == "cached"
+        assert refresher.calls == 0
+
+    def test_expiring_token_refreshed_in_background(self):
+        """Inside the margin the current token is served while a refresh runs."""
+        refresher = FakeRefresher()
+        manager = TokenManager(refresher, refresh_margin=300)
+        manager.register("u", "healthkit", "refresh", "old", time.time() + 60)
+
+        async def run():
+            served = await manager.get("u", "healthkit")
+            await asyncio.sleep(0.05)
+            return served, await manager.get("u", "healthkit")
+
+        served, later = asyncio.run(run())
+        assert served == "old"
+        assert later == "healthkit-access-1"
+        assert refresher.calls == 1
+
+    def test_concurrent_refreshes_deduplicated(self):
+        """Many callers with an expired token share one refresh round trip."""
+        refresher = FakeRefresher()
+        manager = TokenManager(refresher)
+        manager.register("u", "google_calendar", "refresh")
+
+        async def run():
+            return await asyncio.gather(*(manager.get("u", "google_calendar") for _ in range(10)))
+
+        assert set(asyncio.run(run())) == {"google_calendar-access-1"}
+        assert refresher.calls == 1
+
+    def test_loader_store_and_fallback(self):
+        """Credentials are loaded once, refreshed tokens stored; unknown users use the raw token."""
+        refresher = FakeRefresher()
+        loads, stored = [], []
+
+        async def load(user_id, provider):
+            loads.append(user_id)
+            return Credential("refresh") if user_id == "linked" else None
+
+        async def store(user_id, provider, credential):
+            stored.append(credential.access_token)
+
+        manager = TokenManager(refresher, load=load, store=store)
+
+        async def run():
+            return (
+                await manager.get("linked", "healthkit"),
+                await manager.get("raw", "healthkit", fallback="raw-token"),
+                await manager.get("raw", "healthkit", fallback="raw-token"),
+            )
+
+        assert asyncio.run(run()) == ("healthkit-access-1", "raw-token", "raw-token")
+        assert loads == ["linked", "raw"]
+        assert stored == ["healthkit-access-1"]
+
+    def test_refresh_due_and_failures(self):
+        """The sweep renews tokens near expiry; failures keep the old token and back off."""
+        manager = TokenManager(FakeRefresher(fail=True), refresh_margin=300, backoff=60)
+        manager.register("u", "healthkit", "refresh", "old", time.time() + 60)
+        manager.register("v", "healthkit", "refresh", "fine", time.time() + 3600)
+
+        assert asyncio.run(manager.refresh_due()) == 0
+        assert asyncio.run(manager.get("u", "healthkit")) == "old"
+
+        manager.refresher = FakeRefresher()
+        assert asyncio.run(manager.refresh_due()) == 0  # Backing off
+        assert asyncio.run(manager.refresh_due(now=time.time() + 61)) == 1
+
+    def test_backoff_doubles_and_expired_token_falls_back(self):
+        """Failed refreshes are retried later and later; meanwhile the row token is served."""
+        refresher = FakeRefresher(fail=True)
+        manager = TokenManager(refresher, backoff=60, backoff_max=100)
+        manager.register("u", "healthkit", "refresh", "expired", time.time() - 1)
+
+        async def run():
+            served = [await manager.get("u", "healthkit", fallback="row-token") for _ in range(3)]
+            credential = manager._credentials[("u", "healthkit")]
+            first_retry = credential.retry_at
+            credential.retry_at = 0.0
+            await manager.get("u", "healthkit", fallback="row-token")
+            credential.retry_at = 0.0
+            await manager.get("u", "healthkit", fallback="row-token")
+            return served, first_retry, credential
+
+        served, first_retry, credential = asyncio.run(run())
+        assert served == ["row-token"] * 3
+        assert refresher.calls == 3
+        assert first_retry - time.time() <= 60
+        assert credential.failures == 3
+        assert 99 <= credential.retry_at - time.time() <= 100  # 60, 120 -> capped
+
+    def test_rejected_grant_drops_credentials(self):
+        """A refused refresh token is forgotten and deleted, not retried."""
+        removed = []
+
+        async def remove(user_id, provider, credential):
+            removed.append(credential.refresh_token)
+
+        refresher = FakeRefresher(rejected=True)
+        manager = TokenManager(refresher, remove=remove)
+        manager.register("u", "google_calendar", "revoked")
+
+        async def run():
+            first = await manager.get("u", "google_calendar", fallback="row-token")
+            swept = await manager.refresh_due()
+            return first, swept, await manager.get("u", "google_calendar", fallback="row-token")
+
+        assert asyncio.run(run()) == ("row-token", 0, "row-token")
+        assert refresher.calls == 1
+        assert removed == ["revoked"]
+
+    def test_missing_credentials_cache_expires(self):
+        """Missing credentials are looked up again once the negative cache expires."""
+        stored = {}
+
+        async def load(user_id, provider):
+            return stored.get(user_id)
+
+        manager = TokenManager(FakeRefresher(), load=load, missing_ttl=300)
+
+        async def run():
+            before = await manager.get("u", "healthkit", fallback="row-token")
+            stored["u"] = Credential("refresh", "linked", time.time() + 3600)
+            cached = await manager.get("u", "healthkit", fallback="row-token")
+            manager._missing_until[("u", "healthkit")] = 0.0
+            return before, cached, await manager.get("u", "healthkit", fallback="row-token")
+
+        assert asyncio.run(run()) == ("row-token", "row-token", "linked")
+
+    def test_rotated_refresh_token_is_kept(self):
+        """A refresh token returned with the new access token replaces the old one."""
+        stored = []
+
+        async def store(user_id, provider, credential):
+            stored.append(credential.refresh_token)
+
+        manager = TokenManager(FakeRefresher(rotate=True), store=store)
+        manager.register("u", "google_calendar", "original")
+
+        credential = asyncio.run(manager.refresh("u", "google_calendar"))
+        assert credential.refresh_token == "google_calendar-refresh-1"
+        assert stored == ["google_calendar-refresh-1"]
+
+    def test_idle_and_excess_entries_evicted(self):
+        """Unused entries leave the cache and are no longer swept."""
+        refresher = FakeRefresher()
+        manager = TokenManager(refresher, refresh_margin=300, idle_seconds=600, max_entries=2)
+        manager.register("idle", "healthkit", "refresh", "old", time.time() + 60)
+        assert asyncio.run(manager.refresh_due(now=time.time() + 601)) == 0
+        assert len(manager) == 0
+        assert refresher.calls == 0
+
+        for user_id in ("a", "b", "c"):
+            manager.register(user_id, "healthkit", "refresh", "token", time.time() + 3600)
+        assert len(manager) == 2
+        assert ("a", "healthkit") not in manager._credentials
+
+
+class TestOAuthRefresher:
+    """Refresh-token grant"""
+
+    def test_uses_own_policy_and_returns_rotated_token(self):
+        """Token requests go through "<provider>_oauth", not the data API's policy."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"access_token": "a", "expires_in": 60, "refresh_token": "r2"})
+
+        pool = HTTPClientPool(http2=False)
+        pool._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        before = upstream_metrics().get("google_calendar")
+
+        result = asyncio.run(OAuthRefresher(pool).refresh("google_calendar", "r1"))
+        assert result == ("a", 60.0, "r2")
+        assert "google_calendar_oauth" in upstream_metrics()
+        assert upstream_metrics().get("google_calendar") == before
+
+
+class TestManagedIntegrationToken:
+    """Integrations read the managed token per request"""
+
+    def test_calendar_uses_current_token(self):
+        """The Authorization header carries the manager's token."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers["Authorization"])
+            return httpx.Response(200, json={"items": []})
+
+        manager = TokenManager(FakeRefresher())
+        manager.register("u", "google_calendar", "refresh", "managed", time.time() + 3600)
+        calendar = GoogleCalendarIntegration(
+            "stale", token_source=manager.source("u", "google_calendar", "stale")
+        )
+        calendar.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        asyncio.run(calendar.get_active_high_stakes_events())
+        assert seen == ["Bearer managed"]
+
+
+class TestCredentialEndpoint:
+    """Credentials stored through the API"""
+
+    def test_put_stores_and_registers(self):
+        """Stored credentials are served by the manager and survive a reload."""
+        import main
+
+        async def run():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await client.post("/api/v1/users", params={"user_id": "oauth_user", "email": "oauth_user@example.com"})
+                responses = [
+                    await client.put(
+                        "/api/v1/oauth/credentials",
+                        params={"user_id": "oauth_user", "provider": "google_calendar"},
+                        json={"refresh_token": refresh, "access_token": access, "expires_in": 3600}
+                    )
+                    for refresh, access in (("r1", "a1"), ("r2", "a2"))
+                ]
+                unknown = await client.put(
+                    "/api/v1/oauth/credentials",
+                    params={"user_id": "oauth_user", "provider": "dropbox"},
+                    json={"refresh_token": "r"}
+                )
+            served = await main.token_manager.get("oauth_user", "google_calendar")
+            loaded = await main.load_oauth_credential("oauth_user", "google_calendar")
+            return responses, unknown, served, loaded
+
+        responses, unknown, served, loaded = asyncio.run(run())
+        assert [response.status_code for response in responses] == [200, 200]
+        assert unknown.status_code == 400
+        assert served == "a2"
+        assert (loaded.refresh_token, loaded.access_token) == ("r2", "a2")
@@ -0,0 +1,182 @@
+"""
+Bulk ISO-8601 Timestamp Decoding for Omtobe MVP v0.1
+
+Converts ISO-8601 strings from integration payloads straight to epoch
+seconds without building datetime objects. Handles the forms HealthKit and
+Google Calendar send:
+
+- 2026-03-01T09:30:00Z / +01:00 / -05:00, optionally with a fraction
+- 2026-03-01 (date-only, used by Google Calendar for all-day events)
+
+Date-only and offset-less values are interpreted in a given timezone (UTC
+by default). Fields are range-checked; anything else (including invalid
+dates and times) falls back to datetime.fromisoformat, which raises for
+values it cannot parse either.
+"""
+
+from array import array
+from datetime import datetime, tzinfo
+from typing import Dict, Iterable, Optional
+import pytz
+
+_SECONDS_PER_DAY = 86400
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _days_from_civil(year: int, month: int, day: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date."""
+    year -= month <= 2
+    era = (year if year >= 0 else year - 399) // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _field(value: str, start: int, end: int, low: int, high: int) -> int:
+    """Digits value[start:end] as an int within [low, high]."""
+    digits = value[start:end]
+    if not digits.isdigit():
+        raise ValueError(f"Invalid timestamp field in {value!r}")
+    number = int(digits)
+    if not low <= number <= high:
+        raise ValueError(f"Timestamp field out of range in {value!r}")
+    return number
+
+
+def _offset_seconds(suffix: str) -> Optional[int]:
+    """UTC offset encoded by "Z", "+HH:MM", "-HHMM" (None if absent/unknown)."""
+    if suffix in ("Z", "z"):
+        return 0
+    if len(suffix) in (5, 6) and suffix[0] in "+-" and (len(suffix) == 5 or suffix[3] == ":"):
+        hours, minutes = _field(suffix, 1, 3, 0, 23), _field(suffix, len(suffix) - 2, len(suffix), 0, 59)
+        sign = 1 if suffix[0] == "+" else -1
+        return sign * (hours * 3600 + minutes * 60)
+    return None
+
+
+def _fallback(value: str, tz: tzinfo) -> float:
+    """Parse with the standard library (localizing naive values)."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = tz.localize(parsed) if hasattr(tz, "localize") else parsed.replace(tzinfo=tz)
+    return parsed.timestamp()
+
+
+class TimestampDecoder:
+    """ISO-8601 to epoch decoder memoizing per-date arithmetic."""
+
+    def __init__(self, tz: tzinfo = pytz.UTC):
+        """
+        Initialize decoder.
+
+        Args:
+            tz: Timezone for date-only and offset-less values
+        """
+        self.tz = tz
+        self._utc = tz is pytz.UTC
+        self._days: Dict[str, int] = {}  # "YYYY-MM-DD" -> days since epoch
+
+    def _day(self, date: str) -> int:
+        days = self._days.get(date)
+        if days is None:
+            year, month = _field(date, 0, 4, 1, 9999), _field(date, 5, 7, 1, 12)
+            leap_day = month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            day = _field(date, 8, 10, 1, _DAYS_IN_MONTH[month - 1] + leap_day)
+            days = _days_from_civil(year, month, day)
+            self._days[date] = days
+        return days
+
+    def decode(self, value: str) -> float:
+        """
+        Decode one timestamp.
+
+        Args:
+            value: ISO-8601 date or date-time string
+
+        Returns:
+            float: Epoch seconds
+
+        Raises:
+            ValueError: Not an ISO-8601 value
+        """
+        try:
+            if len(value) == 10 and value[4] == "-" and value[7] == "-":
+                if not self._utc:
+                    return _fallback(value, self.tz)
+                return float(self._day(value) * _SECONDS_PER_DAY)
+
+            if len(value) >= 19 and value[10] in "Tt " and value[13] == ":" and value[16] == ":":
+                seconds = (
+                    self._day(value[:10]) * _SECONDS_PER_DAY
+                    + _field(value, 11, 13, 0, 23) * 3600
+                    + _field(value, 14, 16, 0, 59) * 60
+                    + _field(value, 17, 19, 0, 59)
+                )
+                position = 19
+                fraction = 0.0
+                if position < len(value) and value[position] in ".,":
+                    end = position + 1
+                    while end < len(value) and value[end].isdigit():
+                        end += 1
+                    fraction = float("0." + value[position + 1:end])
+                    position = end
+
+                suffix = value[position:]
+                if not suffix:
+                    if not self._utc:
+                        return _fallback(value, self.tz)
+                    return seconds + fraction
+                offset = _offset_seconds(suffix)
+                if offset is not None:
+                    return seconds - offset + fraction
+        except (ValueError, IndexError):
+            pass
+
+        return _fallback(value, self.tz)
+
+    def decode_many(self, values: Iterable[str]) -> array:
+        """
+        Decode many timestamps in one pass.
+
+        Args:
+            values: ISO-8601 strings
+
+        Returns:
+            array: array('d') of epoch seconds, in input order
+        """
+        decode = self.decode
+        return array("d", (decode(value) for value in values))
+
+
+_utc_decoder = TimestampDecoder()
+
+
+def parse_epoch(value: str, tz: tzinfo = pytz.UTC) -> float:
+    """
+    Convert one ISO-8601 string to epoch seconds.
+
+    Args:
+        value: ISO-8601 date or date-time
+        tz: Timezone for date-only and offset-less values
+
+    Returns:
+        float: Epoch seconds
+    """
+    decoder = _utc_decoder if tz is pytz.UTC else TimestampDecoder(tz)
+    return decoder.decode(value)
+
+
+def parse_epochs(values: Iterable[str], tz: tzinfo = pytz.UTC) -> array:
+    """
+    Convert ISO-8601 strings to epoch seconds in bulk.
+
+    Args:
+        values: ISO-8601 dates or date-times
+        tz: Timezone for date-only and offset-less values
+
+    Returns:
+        array: array('d') of epoch seconds, in input order
+    """
+    decoder = _utc_decoder if tz is pytz.UTC else TimestampDecoder(tz)
+    return decoder.decode_many(values)
@@ -0,0 +1,379 @@
+"""
+OAuth Access-Token Manager for Omtobe MVP v0.1
+
+Caches access tokens per (user, provider) and refreshes them before they
+expire, off the request path:
+
+- A token inside the refresh margin is still served; a background refresh
+  is started for it
+- A periodic sweep (refresh_due) renews every token nearing expiry
+- Concurrent refreshes of the same token share one OAuth round trip
+
+Only a missing or already-expired token is refreshed inline. Users without
+stored OAuth credentials, or whose refresh failed, use the raw token on
+their user row. Failed refreshes back off exponentially; credentials whose
+grant the provider rejected (revoked or expired refresh token) are dropped.
+A refresh token rotated by the provider replaces the stored one.
+
+The cache is bounded: entries unused for TOKEN_CACHE_IDLE_SECONDS are
+evicted (and no longer refreshed by the sweep), as are the least recently
+used ones beyond TOKEN_CACHE_MAX_ENTRIES; they are reloaded on next use.
+Token endpoints have their own resilience policy ("<provider>_oauth"), so
+refreshes don't share the data API's rate budget or circuit.
+
+Configuration (environment):
+- TOKEN_REFRESH_MARGIN_SECONDS: Refresh this long before expiry (default 300)
+- TOKEN_REFRESH_BACKOFF_SECONDS: First retry delay after a failed refresh,
+  doubled per failure up to TOKEN_REFRESH_BACKOFF_MAX_SECONDS (60 / 3600)
+- TOKEN_MISSING_TTL_SECONDS: How long "no credentials" is cached (default 300)
+- TOKEN_CACHE_IDLE_SECONDS / TOKEN_CACHE_MAX_ENTRIES: Cache bounds (3600 / 10000)
+- OAUTH_<PROVIDER>_CLIENT_ID / _CLIENT_SECRET / _TOKEN_URL
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+import httpx
+
+from http_pool import HTTPClientPool
+from resilience import UpstreamUnavailable, upstream
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REFRESH_MARGIN_SECONDS = float(os.getenv("TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+TOKEN_REFRESH_BACKOFF_SECONDS = float(os.getenv("TOKEN_REFRESH_BACKOFF_SECONDS", "60"))
+TOKEN_REFRESH_BACKOFF_MAX_SECONDS = float(os.getenv("TOKEN_REFRESH_BACKOFF_MAX_SECONDS", "3600"))
+TOKEN_MISSING_TTL_SECONDS = float(os.getenv("TOKEN_MISSING_TTL_SECONDS", "300"))
+TOKEN_CACHE_IDLE_SECONDS = float(os.getenv("TOKEN_CACHE_IDLE_SECONDS", "3600"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+TokenKey = Tuple[str, str]  # (user_id, provider)
+
+
+class TokenRefreshError(Exception):
+    """The provider did not issue a new access token."""
+
+    def __init__(self, message: str, rejected: bool = False):
+        super().__init__(message)
+        self.rejected = rejected  # The grant itself was refused; retrying won't help
+
+
+@dataclass
+class Credential:
+    """OAuth state for one user and provider."""
+    refresh_token: str
+    access_token: Optional[str] = None
+    expires_at: float = 0.0  # Epoch seconds
+    failures: int = 0  # Consecutive failed refreshes
+    retry_at: float = 0.0  # No refresh attempts before this epoch
+
+
+class OAuthRefresher:
+    """Refresh-token grant against the providers' token endpoints."""
+
+    TOKEN_URLS = {
+        "google_calendar": "https://oauth2.googleapis.com/token",
+        "healthkit": "https://api.healthkit.apple.com/oauth/token",  # Placeholder
+    }
+
+    def __init__(self, http_pool: HTTPClientPool):
+        """
+        Initialize refresher.
+
+        Args:
+            http_pool: Shared application client pool
+        """
+        self.http_pool = http_pool
+
+    async def refresh(self, provider: str, refresh_token: str) -> Tuple[str, float, Optional[str]]:
+        """
+        Exchange a refresh token for a new access token.
+
+        Args:
+            provider: "healthkit" or "google_calendar"
+            refresh_token: Long-lived refresh token
+
+        Returns:
+            Tuple[str, float, Optional[str]]: (access token, lifetime in seconds,
+                rotated refresh token or None if the old one stays valid)
+
+        Raises:
+            TokenRefreshError: Request failed or the response had no token
+                (rejected for a 400/401, e.g. invalid_grant)
+        """
+        prefix = f"OAUTH_{provider.upper()}_"
+        url = os.getenv(prefix + "TOKEN_URL", self.TOKEN_URLS.get(provider, ""))
+        data = {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": os.getenv(prefix + "CLIENT_ID", ""),
+            "client_secret": os.getenv(prefix + "CLIENT_SECRET", ""),
+        }
+        client = self.http_pool.client
+
+        try:
+            timeout = self.http_pool.timeout_for(url)
+            response = await upstream(f"{provider}_oauth").call(lambda: client.post(
+                url,
+                data=data,
+                timeout=timeout
+            ), timeout=timeout)
+            response.raise_for_status()
+            body = response.json()
+            return body["access_token"], float(body.get("expires_in", 3600)), body.get("refresh_token")
+
+        except httpx.HTTPStatusError as e:
+            rejected = e.response.status_code in (400, 401)
+            raise TokenRefreshError(f"{provider} token refresh failed: {e}", rejected=rejected) from e
+
+        except (httpx.HTTPError, UpstreamUnavailable, ValueError, KeyError) as e:
+            raise TokenRefreshError(f"{provider} token refresh failed: {e}") from e
+
+
+class TokenManager:
+    """Per-(user, provider) access-token cache with proactive refresh."""
+
+    def __init__(
+        self,
+        refresher,
+        load: Optional[Callable[[str, str], Awaitable[Optional[Credential]]]] = None,
+        store: Optional[Callable[[str, str, Credential], Awaitable[None]]] = None,
+        remove: Optional[Callable[[str, str, Credential], Awaitable[None]]] = None,
+        refresh_margin: float = TOKEN_REFRESH_MARGIN_SECONDS,
+        backoff: float = TOKEN_REFRESH_BACKOFF_SECONDS,
+        backoff_max: float = TOKEN_REFRESH_BACKOFF_MAX_SECONDS,
+        missing_ttl: float = TOKEN_MISSING_TTL_SECONDS,
+        idle_seconds: float = TOKEN_CACHE_IDLE_SECONDS,
+        max_entries: int = TOKEN_CACHE_MAX_ENTRIES
+    ):
+        """
+        Initialize manager.
+
+        Args:
+            refresher: Object with async refresh(provider, refresh_token)
+            load: Loads stored credentials on a cache miss (None if absent)
+            store: Persists credentials after a refresh
+            remove: Deletes stored credentials whose grant was rejected
+            refresh_margin: Seconds before expiry at which tokens are renewed
+            backoff: Retry delay after the first failed refresh (doubles per failure)
+            backoff_max: Longest retry delay
+            missing_ttl: Seconds before a user without credentials is looked up again
+            idle_seconds: Seconds since last use after which an entry is evicted
+            max_entries: Maximum number of cached (user, provider) entries
+        """
+        self.refresher = refresher
+        self.load = load
+        self.store = store
+        self.remove = remove
+        self.refresh_margin = refresh_margin
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.missing_ttl = missing_ttl
+        self.idle_seconds = idle_seconds
+        self.max_entries = max_entries
+        self._credentials: Dict[TokenKey, Optional[Credential]] = {}
+        self._missing_until: Dict[TokenKey, float] = {}  # Negative-cache expiry
+        self._last_used: "OrderedDict[TokenKey, float]" = OrderedDict()  # Least recently used first
+        self._flights = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+        self.refreshes = 0
+
+    def register(
+        self,
+        user_id: str,
+        provider: str,
+        refresh_token: str,
+        access_token: Optional[str] = None,
+        expires_at: float = 0.0
+    ) -> None:
+        """Add or replace a user's credentials for a provider."""
+        key = (user_id, provider)
+        self._credentials[key] = Credential(refresh_token, access_token, expires_at)
+        self._missing_until.pop(key, None)
+        self._touch(key)
+
+    def forget(self, user_id: str) -> None:
+        """Drop every cached credential of a user."""
+        for key in [key for key in self._credentials if key[0] == user_id]:
+            self._evict(key)
+
+    def __len__(self) -> int:
+        return len(self._credentials)
+
+    def _touch(self, key: TokenKey) -> None:
+        """Mark an entry as used now and evict idle / least recently used ones."""
+        now = time.time()
+        self._last_used.pop(key, None)
+        self._last_used[key] = now
+        self._evict_idle(now)
+        while len(self._last_used) > self.max_entries:
+            self._evict(next(iter(self._last_used)))
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop entries unused for idle_seconds (least recently used first)."""
+        while self._last_used:
+            key, last_used = next(iter(self._last_used.items()))
+            if now - last_used < self.idle_seconds:
+                break
+            self._evict(key)
+
+    def _evict(self, key: TokenKey) -> None:
+        self._credentials.pop(key, None)
+        self._missing_until.pop(key, None)
+        self._last_used.pop(key, None)
+
+    async def _credential(self, key: TokenKey) -> Optional[Credential]:
+        """Cached credential, loading it on a miss or once "no credentials" expires."""
+        if self._credentials.get(key) is None and self._missing_until.get(key, 0.0) <= time.time():
+            credential = await self.load(*key) if self.load else None
+            if self._credentials.get(key) is None:  # Unless registered meanwhile
+                self._credentials[key] = credential
+                self._last_used.setdefault(key, time.time())
+                if credential is None:
+                    # Cache "no credentials" so the store isn't queried per request
+                    self._missing_until[key] = time.time() + self.missing_ttl
+        return self._credentials.get(key)
+
+    async def get(self, user_id: str, provider: str, fallback: Optional[str] = None) -> Optional[str]:
+        """
+        Current access token for a user and provider.
+
+        Args:
+            user_id: User identifier
+            provider: "healthkit" or "google_calendar"
+            fallback: Token to use when no OAuth credentials are stored
+
+        Returns:
+            Optional[str]: Access token (`fallback` if none is valid)
+        """
+        key = (user_id, provider)
+        self._touch(key)
+        credential = await self._credential(key)
+        if credential is None:
+            return fallback
+
+        now = time.time()
+        remaining = credential.expires_at - now
+        if credential.access_token and remaining > 0:
+            if remaining <= self.refresh_margin and credential.retry_at <= now:
+                self._refresh_in_background(key)
+            return credential.access_token
+
+        if credential.retry_at > now:
+            return fallback  # Backing off after failed refreshes
+
+        # Missing or expired: nothing valid to serve, refresh inline
+        try:
+            return (await self.refresh(user_id, provider)).access_token
+        except TokenRefreshError as e:
+            logger.warning(str(e))
+            return fallback
+
+    async def refresh(self, user_id: str, provider: str) -> Credential:
+        """
+        Refresh a token now (concurrent callers share one refresh).
+
+        Raises:
+            TokenRefreshError: Refresh failed
+        """
+        key = (user_id, provider)
+        return await self._flights.do(key, lambda: self._refresh(key))
+
+    async def _refresh(self, key: TokenKey) -> Credential:
+        credential = await self._credential(key)
+        if credential is None:
+            raise TokenRefreshError(f"No OAuth credentials for {key}")
+
+        try:
+            access_token, expires_in, refresh_token = await self.refresher.refresh(key[1], credential.refresh_token)
+        except TokenRefreshError as e:
+            if e.rejected:
+                await self._drop(key, credential)
+            else:
+                credential.failures += 1
+                delay = min(self.backoff * 2 ** (credential.failures - 1), self.backoff_max)
+                credential.retry_at = time.time() + delay
+            raise
+
+        credential.access_token = access_token
+        credential.expires_at = time.time() + expires_in
+        if refresh_token:
+            credential.refresh_token = refresh_token  # Rotated by the provider
+        credential.failures = 0
+        credential.retry_at = 0.0
+        self.refreshes += 1
+
+        if self.store:
+            await self.store(key[0], key[1], credential)
+        return credential
+
+    async def _drop(self, key: TokenKey, credential: Credential) -> None:
+        """Forget credentials whose grant was rejected, in the cache and the store."""
+        logger.warning(f"OAuth grant for {key} rejected; dropping credentials")
+        if self._credentials.get(key) is credential:
+            self._credentials[key] = None
+            self._missing_until[key] = time.time() + self.missing_ttl
+        if self.remove:
+            await self.remove(key[0], key[1], credential)
+
+    def _refresh_in_background(self, key: TokenKey) -> None:
+        """Start a refresh unless one is already running."""
+        if self._flights.in_flight(key):
+            return
+        task = asyncio.ensure_future(self.refresh(*key))
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background token refresh failed: {task.exception()}")
+
+    async def refresh_due(self, now: Optional[float] = None) -> int:
+        """
+        Refresh every cached token expiring within the margin (unless backing off).
+
+        Idle entries are evicted first, so only recently used tokens are renewed.
+
+        Args:
+            now: Reference epoch (defaults to now)
+
+        Returns:
+            int: Number of tokens refreshed
+        """
+        now = now if now is not None else time.time()
+        self._evict_idle(now)
+        due = [
+            key for key, credential in self._credentials.items()
+            if credential is not None
+            and credential.expires_at - self.refresh_margin <= now
+            and credential.retry_at <= now
+        ]
+        results = await asyncio.gather(*(self.refresh(*key) for key in due), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(str(result))
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+    def source(self, user_id: str, provider: str, fallback: Optional[str] = None) -> "TokenSource":
+        """Token source an integration can await per request."""
+        return TokenSource(self, user_id, provider, fallback)
+
+
+class TokenSource:
+    """A user's token for one provider, resolved at request time."""
+
+    def __init__(self, manager: TokenManager, user_id: str, provider: str, fallback: Optional[str]):
+        self.manager = manager
+        self.user_id = user_id
+        self.provider = provider
+        self.fallback = fallback
+
+    async def get(self) -> Optional[str]:
+        """Current access token."""
+        return await self.manager.get(self.user_id, self.provider, self.fallback)